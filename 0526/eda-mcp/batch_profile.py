@@ -0,0 +1,248 @@
+"""
+여러 CSV 파일을 한 번에 프로파일링하는 모듈
+
+디렉토리나 glob 패턴에 해당하는 CSV를 프로세스 풀에서 병렬로 스트리밍 집계하고
+(파일 하나의 메모리는 청크 크기로 제한), 파일별 요약을 결과 디렉토리
+(EDA_BATCH_DIR, 기본: 임시 디렉토리/eda-mcp-batch)에 저장합니다. 다음 실행에서
+수정 시각과 크기(크기만 같으면 내용 해시)가 그대로인 파일은 저장된 요약을 재사용합니다.
+"""
+import glob
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from dataset_cache import file_hash, file_signature
+from stream_stats import NumericColumn, describe_csv
+
+BATCH_DIR = os.environ.get(
+    "EDA_BATCH_DIR", os.path.join(tempfile.gettempdir(), "eda-mcp-batch")
+)
+# 요약 형식을 바꾸면 올려서 예전 결과를 무효화
+PROFILE_VERSION = 1
+# 요약에 포함할 상관관계 상위 쌍 수
+TOP_CORRELATIONS = 5
+
+
+def expand_paths(target, pattern="*.csv", recursive=True):
+    """
+    디렉토리 또는 glob 패턴을 CSV 파일 경로 목록으로 펼치는 함수
+
+    Parameters:
+        target (str): 디렉토리 경로 또는 glob 패턴 (예: datasets/**/*.csv)
+        pattern (str): target이 디렉토리일 때 사용할 파일 패턴
+        recursive (bool): 디렉토리일 때 하위 디렉토리까지 찾을지 여부
+
+    Returns:
+        list: 정렬된 파일 경로 목록
+    """
+    if os.path.isdir(target):
+        parts = [target, "**", pattern] if recursive else [target, pattern]
+        target = os.path.join(*parts)
+    return sorted(p for p in glob.glob(target, recursive=True) if os.path.isfile(p))
+
+
+def _round(value, digits=4):
+    """유효 숫자 digits자리로 줄이고 NaN/inf는 None으로 바꿉니다"""
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return float(f"{value:.{digits}g}")
+    return value
+
+
+def profile_file(path, delimiter=",", chunksize=100000):
+    """
+    CSV 파일 하나를 스트리밍으로 집계해 간결한 요약을 반환하는 함수
+
+    Parameters:
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+        chunksize (int): 한 번에 읽을 행 수
+
+    Returns:
+        dict: rows, columns, size_bytes, column_summary, top_correlations, warnings
+    """
+    _, corr, describer = describe_csv(path, delimiter=delimiter, chunksize=chunksize)
+    rows = describer.rows
+    columns = {}
+    for col, stat in describer.stats.items():
+        summary = {key: _round(value) for key, value in stat.describe().items()}
+        summary["kind"] = "numeric" if isinstance(stat, NumericColumn) else "categorical"
+        summary["missing_pct"] = _round(100 * (rows - stat.count) / rows) if rows else 0.0
+        columns[str(col)] = summary
+
+    pairs = []
+    names = list(corr)
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            value = corr[a][b]
+            if value is not None and math.isfinite(value):
+                pairs.append((str(a), str(b), value))
+    pairs.sort(key=lambda p: abs(p[2]), reverse=True)
+
+    return {
+        "rows": rows,
+        "columns": len(columns),
+        "size_bytes": os.path.getsize(path),
+        "column_summary": columns,
+        "top_correlations": [
+            {"columns": [a, b], "r": _round(r)} for a, b, r in pairs[:TOP_CORRELATIONS]
+        ],
+        "warnings": sorted(str(c) for c in describer.coerced_columns),
+    }
+
+
+def _result_path(path, delimiter):
+    name = hashlib.sha1(
+        f"{os.path.abspath(path)}\0{delimiter}".encode("utf-8")
+    ).hexdigest()[:20]
+    return os.path.join(BATCH_DIR, name + ".json")
+
+
+def load_saved(path, delimiter):
+    """원본이 바뀌지 않았으면 저장된 요약을, 아니면 None을 반환합니다"""
+    try:
+        with open(_result_path(path, delimiter), encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if saved.get("version") != PROFILE_VERSION:
+        return None
+    mtime_ns, size = file_signature(path)
+    if saved["mtime_ns"] == mtime_ns and saved["size"] == size:
+        return saved["profile"]
+    if saved["size"] == size and saved.get("hash") == file_hash(path):
+        return saved["profile"]
+    return None
+
+
+def save_result(path, delimiter, signature, profile):
+    """요약을 원본 시그니처와 함께 저장합니다 (실패해도 결과는 그대로 반환)"""
+    result_path = _result_path(path, delimiter)
+    try:
+        os.makedirs(BATCH_DIR, exist_ok=True)
+        tmp_path = result_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": PROFILE_VERSION,
+                "path": os.path.abspath(path),
+                "mtime_ns": signature[0],
+                "size": signature[1],
+                "hash": file_hash(path),
+                "profile": profile,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, result_path)
+    except OSError:
+        pass
+
+
+def profile_files(paths, delimiter=",", chunksize=100000, workers=None,
+                  force=False, progress=None):
+    """
+    여러 CSV를 프로세스 풀에서 병렬로 프로파일링하는 함수
+
+    Parameters:
+        paths (list): CSV 파일 경로 목록
+        delimiter (str): 구분자
+        chunksize (int): 파일마다 한 번에 읽을 행 수
+        workers (int): 프로세스 수 (없으면 CPU 수)
+        force (bool): 저장된 요약을 무시하고 모두 다시 집계할지 여부
+        progress (callable): 파일 하나가 끝날 때마다 progress(완료 수, 전체 수, 메시지)로 호출
+
+    Returns:
+        tuple: (경로별 요약 dict, 재사용한 파일 목록, 경로별 오류 메시지 dict)
+    """
+    profiles = {}
+    reused = []
+    errors = {}
+    pending = []
+    for path in paths:
+        saved = None if force else load_saved(path, delimiter)
+        if saved is not None:
+            profiles[path] = saved
+            reused.append(path)
+        else:
+            pending.append(path)
+
+    done = len(reused)
+    if progress is not None:
+        progress(done, len(paths), f"저장된 결과 {done}개 재사용")
+    if not pending:
+        return profiles, reused, errors
+
+    # 서버는 여러 스레드를 쓰므로 fork 대신 spawn으로 워커 프로세스를 만듦
+    context = multiprocessing.get_context("spawn")
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        futures = {}
+        for path in pending:
+            signature = file_signature(path)
+            future = executor.submit(profile_file, path, delimiter, chunksize)
+            futures[future] = (path, signature)
+        remaining = set(futures)
+        while remaining:
+            finished, remaining = wait(remaining, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in finished:
+                path, signature = futures[future]
+                try:
+                    profiles[path] = future.result()
+                    save_result(path, delimiter, signature, profiles[path])
+                except Exception as e:
+                    errors[path] = f"{type(e).__name__}: {e}"
+                done += 1
+            if progress is not None:
+                # 취소되면 여기서 ToolCancelled가 발생하고 남은 작업은 버림
+                progress(done, len(paths), f"{done}/{len(paths)}개 파일 완료")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return profiles, reused, errors
+
+
+def consolidate(paths, profiles, reused, errors, root=None, detail=False):
+    """
+    파일별 요약을 한 번에 보기 쉬운 통합 요약으로 정리하는 함수
+
+    같은 컬럼 구성을 가진 파일끼리 묶어 schema_groups로 보여 주므로, 분할 저장된
+    데이터셋인지 서로 다른 데이터셋인지 바로 알 수 있습니다. detail이 False이면
+    컬럼별 요약은 종류와 결측 비율만 남깁니다.
+    """
+    def display(path):
+        return os.path.relpath(path, root) if root else path
+
+    files = []
+    groups = {}
+    for path in paths:
+        if path not in profiles:
+            continue
+        profile = profiles[path]
+        entry = {"path": display(path), "skipped": path in reused, **profile}
+        if not detail:
+            entry["column_summary"] = {
+                col: {"kind": summary["kind"], "missing_pct": summary["missing_pct"]}
+                for col, summary in profile["column_summary"].items()
+            }
+        files.append(entry)
+        key = tuple(profile["column_summary"])
+        groups.setdefault(key, []).append(display(path))
+
+    return {
+        "totals": {
+            "files": len(paths),
+            "profiled": len(profiles) - len(reused),
+            "skipped": len(reused),
+            "failed": len(errors),
+            "rows": sum(p["rows"] for p in profiles.values()),
+            "size_bytes": sum(p["size_bytes"] for p in profiles.values()),
+        },
+        "schema_groups": [
+            {"columns": list(columns), "files": members}
+            for columns, members in groups.items()
+        ],
+        "files": files,
+        "errors": {display(path): message for path, message in errors.items()},
+    }
@@ -0,0 +1,192 @@
+"""
+clean_data 도구의 2단계(two-pass) 클리닝 파이프라인
+
+1단계에서 결측 비율, 중앙값, 최빈값, 평균/표준편차를 구해 클리닝 계획을 만들고,
+2단계에서 계획대로 결측 보간과 이상치 제거를 적용합니다. 스트리밍 모드는 두
+단계 모두 청크 단위로 CSV를 읽고 결과를 출력 파일에 이어 쓰므로 최대 메모리가
+청크 크기로 제한됩니다 (이때 중앙값은 분위수 스케치 기반 근사값).
+"""
+import math
+
+import pandas as pd
+
+from stream_stats import FrequentItems, NumericColumn
+
+# 이상치로 판단할 z-점수 기준
+Z_THRESHOLD = 3
+
+
+def _imputed_moments(observed, fill, total):
+    """
+    결측을 fill 값으로 채운 뒤의 평균과 표준편차를 계산합니다
+
+    관측값 집계에 같은 값 (total - count)개를 Chan 방식으로 병합한 것과 같습니다.
+    """
+    filled = total - observed.count
+    if observed.count == 0:
+        return fill, float("nan")
+    mean = (observed.count * observed.mean + filled * fill) / total
+    m2 = observed.m2 + observed.count * filled / total * (observed.mean - fill) ** 2
+    std = math.sqrt(m2 / (total - 1)) if total > 1 else float("nan")
+    return mean, std
+
+
+def _finish_plan(rows, missing, numeric, categorical, missing_threshold):
+    """1단계 집계로 클리닝 계획을 만듭니다"""
+    drop = [
+        col for col, count in missing.items()
+        if rows and count / rows > missing_threshold
+    ]
+    plan = {"rows": rows, "drop": drop, "numeric": {}, "categorical": {}}
+    for col, (observed, median) in numeric.items():
+        if col in drop:
+            continue
+        mean, std = _imputed_moments(observed, median, rows)
+        plan["numeric"][col] = {"fill": median, "mean": mean, "std": std}
+    for col, mode in categorical.items():
+        if col not in drop:
+            plan["categorical"][col] = mode
+    return plan
+
+
+def plan_from_frame(df, missing_threshold):
+    """메모리에 있는 DataFrame으로 정확한 클리닝 계획을 만듭니다"""
+    missing = df.isnull().sum().to_dict()
+    numeric = {}
+    for col in df.select_dtypes(include='number').columns:
+        observed = NumericColumn()
+        observed.update(df[col])
+        median = df[col].median() if observed.count else float("nan")
+        numeric[col] = (observed, median)
+    categorical = {}
+    for col in df.select_dtypes(include=['object', 'category', 'datetime']).columns:
+        modes = df[col].mode()
+        categorical[col] = modes.iloc[0] if len(modes) else None
+    return _finish_plan(len(df), missing, numeric, categorical, missing_threshold)
+
+
+def plan_from_csv(path, delimiter, missing_threshold, chunksize, progress=None):
+    """CSV를 청크 단위로 한 번 읽어 클리닝 계획을 만듭니다 (1단계)"""
+    rows = 0
+    missing = {}
+    numeric = {}
+    categorical = {}
+    mixed = []
+    for chunk in pd.read_csv(path, delimiter=delimiter, chunksize=chunksize):
+        if not missing:
+            missing = {col: 0 for col in chunk.columns}
+            for col in chunk.select_dtypes(include='number').columns:
+                numeric[col] = NumericColumn()
+            for col in chunk.select_dtypes(include='object').columns:
+                categorical[col] = FrequentItems()
+        for col in _mixed_columns(chunk, numeric):
+            # 앞 청크에서는 수치형이었지만 문자가 나온 컬럼은 범주형으로 처리
+            del numeric[col]
+            mixed.append(col)
+        _coerce_numeric(chunk, numeric)
+        rows += len(chunk)
+        for col, count in chunk.isnull().sum().items():
+            missing[col] += int(count)
+        for col, stat in numeric.items():
+            stat.update(chunk[col])
+        for col, stat in categorical.items():
+            stat.update(chunk[col])
+        if progress is not None:
+            progress(rows, None, f"1단계: {rows}행 집계")
+
+    numeric = {
+        col: (stat, stat.sketch.quantiles([0.5])[0] if stat.count else float("nan"))
+        for col, stat in numeric.items()
+    }
+    if mixed:
+        # 문자가 처음 나온 청크 이전 값의 빈도는 없으므로 해당 컬럼만 문자열로 다시 읽음
+        frequent = {col: FrequentItems() for col in mixed}
+        for chunk in pd.read_csv(path, delimiter=delimiter, chunksize=chunksize,
+                                 usecols=mixed, dtype=str):
+            for col, stat in frequent.items():
+                stat.update(chunk[col])
+        categorical.update(frequent)
+    categorical = {
+        col: (stat.top()[0] if stat.counts else None)
+        for col, stat in categorical.items()
+    }
+    plan = _finish_plan(rows, missing, numeric, categorical, missing_threshold)
+    plan["numeric_columns"] = list(numeric)
+    plan["mixed_columns"] = mixed
+    return plan
+
+
+def _mixed_columns(chunk, numeric_columns):
+    """수치형 컬럼 중 이 청크에 숫자로 바꿀 수 없는 값이 있는 컬럼을 반환합니다"""
+    mixed = []
+    for col in numeric_columns:
+        series = chunk[col]
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            continue
+        if pd.to_numeric(series, errors="coerce").isna().sum() > series.isna().sum():
+            mixed.append(col)
+    return mixed
+
+
+def _coerce_numeric(chunk, numeric_columns):
+    """수치형으로 정한 컬럼은 모든 청크에서 수치형으로 맞춥니다 (섞인 컬럼은 plan_from_csv에서 제외)"""
+    for col in numeric_columns:
+        if not pd.api.types.is_numeric_dtype(chunk[col].dtype):
+            chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+
+
+def apply_plan(df, plan):
+    """
+    클리닝 계획을 DataFrame(또는 청크)에 적용합니다 (2단계)
+
+    표준편차가 0이거나 계산할 수 없는 컬럼은 z-점수를 정의할 수 없으므로
+    이상치 판단에서 제외합니다.
+    """
+    df = df.drop(columns=plan["drop"])
+    fills = {col: spec["fill"] for col, spec in plan["numeric"].items()}
+    fills.update({
+        col: mode for col, mode in plan["categorical"].items() if mode is not None
+    })
+    df = df.fillna(value=fills)
+
+    keep = pd.Series(True, index=df.index)
+    for col, spec in plan["numeric"].items():
+        if not spec["std"] or math.isnan(spec["std"]):
+            continue
+        z_scores = (df[col] - spec["mean"]) / spec["std"]
+        keep &= z_scores.abs() < Z_THRESHOLD
+    return df[keep]
+
+
+def clean_csv_streaming(path, output_path, delimiter, missing_threshold, chunksize,
+                        progress=None):
+    """
+    2단계 스트리밍 클리닝을 수행하고 (계획, 출력 행 수)를 반환합니다
+
+    첫 청크에서 수치형이던 컬럼에 이후 숫자가 아닌 값이 나오면 전체를 문자열 범주형
+    컬럼으로 처리하고(최빈값 보간, 이상치 판단 제외) plan["mixed_columns"]에 기록합니다.
+
+    Parameters:
+        path (str): 입력 CSV 경로
+        output_path (str): 출력 CSV 경로
+        delimiter (str): 구분자
+        missing_threshold (float): 이 비율보다 결측이 많은 컬럼은 제거
+        chunksize (int): 한 번에 읽을 행 수
+        progress (callable): 청크마다 progress(처리한 행 수, 전체 행 수, 메시지)로 호출
+    """
+    plan = plan_from_csv(path, delimiter, missing_threshold, chunksize, progress)
+    rows_done = 0
+    rows_after = 0
+    header = True
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        dtype = {col: str for col in plan["mixed_columns"]} or None
+        for chunk in pd.read_csv(path, delimiter=delimiter, chunksize=chunksize, dtype=dtype):
+            _coerce_numeric(chunk, plan["numeric_columns"])
+            cleaned = apply_plan(chunk, plan)
+            cleaned.to_csv(f, index=False, header=header)
+            header = False
+            rows_after += len(cleaned)
+            rows_done += len(chunk)
+            if progress is not None:
+                progress(rows_done, plan["rows"], f"2단계: {rows_done}행 처리")
+    return plan, rows_after
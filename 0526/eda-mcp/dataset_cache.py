@@ -0,0 +1,614 @@
+"""
+CSV EDA 서버용 프로세스 전역 데이터셋 캐시
+
+같은 세션에서 여러 도구가 같은 CSV를 반복해서 읽으므로, 파싱한 DataFrame을
+(경로, 구분자)별로 보관하고 파일의 mtime/크기가 바뀌면 다시 읽습니다.
+메모리 예산(EDA_CACHE_MAX_MB, 기본 2048MB)을 넘으면 가장 오래 사용하지 않은
+데이터셋부터 제거합니다.
+
+또한 CSV를 처음 파싱할 때 컬럼형 Arrow(Feather) 사이드카 파일을 캐시 디렉토리
+(EDA_SIDECAR_DIR, 기본: 임시 디렉토리/eda-mcp-sidecar)에 만들어 두고, 이후에는
+CSV를 다시 파싱하지 않고 사이드카를 메모리 매핑해 필요한 컬럼만 읽습니다.
+사이드카 디렉토리는 EDA_SIDECAR_MAX_MB(기본 4096MB) 안에서 가장 오래 사용하지 않은
+사이드카부터 지웁니다. 원본 내용 해시는 파싱하면서 함께 계산하므로 CSV를 다시 읽지
+않습니다. pyarrow가 없으면 사이드카 없이 동작합니다.
+
+CSV를 파싱할 때는 컬럼 타입을 메모리 효율적인 타입(작은 정수/실수, category)으로
+줄이며, 컬럼별 절감량은 memory_report로 확인할 수 있습니다.
+EDA_OPTIMIZE_DTYPES=0이면 pandas 기본 타입을 그대로 사용합니다. 날짜 문자열의
+datetime64 변환은 도구 출력(기술 통계, 저장되는 날짜 형식)을 바꾸므로
+EDA_PARSE_DATES=1로 켤 때만 적용합니다.
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dtype_optimizer import dtype_report, optimize_dtypes, read_csv_optimized
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+DEFAULT_MAX_BYTES = int(os.environ.get("EDA_CACHE_MAX_MB", "2048")) * 1024 * 1024
+SIDECAR_DIR = os.environ.get(
+    "EDA_SIDECAR_DIR", os.path.join(tempfile.gettempdir(), "eda-mcp-sidecar")
+)
+# 사이드카 디렉토리 최대 용량 (0이면 사이드카를 만들지 않음)
+SIDECAR_MAX_BYTES = int(os.environ.get("EDA_SIDECAR_MAX_MB", "4096")) * 1024 * 1024
+# 압축하지 않아야 메모리 매핑 시 복사 없이 읽을 수 있음 (용량을 줄이려면 lz4/zstd)
+SIDECAR_COMPRESSION = os.environ.get("EDA_SIDECAR_COMPRESSION", "uncompressed")
+OPTIMIZE_DTYPES = os.environ.get("EDA_OPTIMIZE_DTYPES", "1") != "0"
+PARSE_DATES = os.environ.get("EDA_PARSE_DATES", "0") == "1"
+# 타입 최적화 로드 시 한 번에 파싱할 행 수
+LOAD_CHUNK_ROWS = int(os.environ.get("EDA_LOAD_CHUNK_ROWS", "200000"))
+
+# (절대 경로, 구분자) -> (파일 시그니처, 타입 변환 리포트)
+_DTYPE_REPORTS = {}
+_REPORTS_LOCK = threading.Lock()
+_SIDECAR_LOCK = threading.Lock()
+
+
+def file_signature(path):
+    """파일 변경 감지용 (mtime_ns, size)를 반환합니다"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_hash(path, chunk_size=8 * 1024 * 1024):
+    """파일 내용의 BLAKE2b 해시를 반환합니다"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _HashingReader(io.RawIOBase):
+    """읽은 바이트로 BLAKE2b 해시를 갱신하는 파일 객체 (파싱과 해시를 한 번의 읽기로)"""
+
+    def __init__(self, handle):
+        self._handle = handle
+        self.digest = hashlib.blake2b(digest_size=20)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._handle.read(len(buffer))
+        buffer[:len(data)] = data
+        self.digest.update(data)
+        return len(data)
+
+    def hexdigest(self, chunk_size=8 * 1024 * 1024):
+        """남은 바이트까지 읽어 file_hash와 같은 해시를 반환합니다"""
+        for chunk in iter(lambda: self._handle.read(chunk_size), b""):
+            self.digest.update(chunk)
+        return self.digest.hexdigest()
+
+
+def _sidecar_paths(path, delimiter):
+    """원본 경로와 구분자로 사이드카 데이터/메타 파일 경로를 만듭니다"""
+    name = hashlib.sha1(
+        f"{os.path.abspath(path)}\0{delimiter}".encode("utf-8")
+    ).hexdigest()[:20]
+    base = os.path.join(SIDECAR_DIR, name)
+    return base + ".feather", base + ".meta.json"
+
+
+def _valid_sidecar(path, delimiter):
+    """
+    원본과 일치하는 사이드카 경로를 반환합니다 (없거나 원본이 바뀌었으면 None)
+
+    mtime과 크기가 같으면 그대로 사용하고, mtime만 바뀌고 크기가 같으면
+    내용 해시를 비교해 실제로 바뀌지 않은 파일(touch, 복사 등)은 재사용합니다.
+    """
+    if feather is None:
+        return None
+    data_path, meta_path = _sidecar_paths(path, delimiter)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(data_path):
+        return None
+    if (meta.get("optimized", False) != OPTIMIZE_DTYPES
+            or meta.get("parse_dates", True) != PARSE_DATES):
+        # 타입 최적화 설정이 다를 때 만든 사이드카는 사용하지 않음
+        return None
+
+    mtime_ns, size = file_signature(path)
+    if meta["mtime_ns"] == mtime_ns and meta["size"] == size:
+        _touch(meta_path)
+        return data_path
+    if meta["size"] == size and meta.get("hash") == file_hash(path):
+        meta["mtime_ns"] = mtime_ns
+        _write_meta(meta_path, meta)
+        return data_path
+    return None
+
+
+def _touch(meta_path):
+    """사이드카 사용 시각을 메타 파일 mtime에 기록합니다 (LRU 제거 기준)"""
+    try:
+        os.utime(meta_path)
+    except OSError:
+        pass
+
+
+def _evict_sidecars(incoming):
+    """
+    새 사이드카(incoming 바이트)가 들어갈 수 있도록 오래 사용하지 않은 사이드카를 지웁니다
+
+    Returns:
+        bool: 예산 안에 들어갈 수 있으면 True
+    """
+    if incoming > SIDECAR_MAX_BYTES:
+        return False
+    entries = []
+    total = incoming
+    try:
+        names = os.listdir(SIDECAR_DIR)
+    except OSError:
+        return True
+    for name in names:
+        if not name.endswith(".meta.json"):
+            continue
+        meta_path = os.path.join(SIDECAR_DIR, name)
+        data_path = meta_path[:-len(".meta.json")] + ".feather"
+        try:
+            used = os.path.getmtime(meta_path)
+            size = os.path.getsize(meta_path)
+            if os.path.exists(data_path):
+                size += os.path.getsize(data_path)
+        except OSError:
+            continue
+        entries.append((used, size, data_path, meta_path))
+        total += size
+    for _, size, data_path, meta_path in sorted(entries):
+        if total <= SIDECAR_MAX_BYTES:
+            break
+        for stale in (meta_path, data_path):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        total -= size
+    return True
+
+
+def sidecar_file(path, delimiter=","):
+    """원본과 일치하는 사이드카(Feather) 파일 경로를 반환합니다 (없으면 None)"""
+    return _valid_sidecar(path, delimiter)
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _write_sidecar(path, delimiter, df, signature, report=None, digest=None):
+    """DataFrame을 사이드카로 저장합니다 (Arrow로 변환할 수 없거나 예산을 넘으면 건너뜀)"""
+    if feather is None or SIDECAR_MAX_BYTES <= 0:
+        return
+    data_path, meta_path = _sidecar_paths(path, delimiter)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with _SIDECAR_LOCK:
+            if not _evict_sidecars(table.nbytes):
+                return
+            os.makedirs(SIDECAR_DIR, exist_ok=True)
+            tmp_path = data_path + ".tmp"
+            feather.write_feather(table, tmp_path, compression=SIDECAR_COMPRESSION)
+            os.replace(tmp_path, data_path)
+            _write_meta(meta_path, {
+                "path": os.path.abspath(path),
+                "delimiter": delimiter,
+                "mtime_ns": signature[0],
+                "size": signature[1],
+                "hash": digest,
+                "optimized": OPTIMIZE_DTYPES,
+                "parse_dates": PARSE_DATES,
+                "dtype_report": report,
+            })
+    except (OSError, pa.ArrowException, ValueError, TypeError):
+        # 사이드카는 최적화일 뿐이므로 실패해도 CSV 결과를 그대로 사용
+        pass
+
+
+def _read_sidecar(data_path, columns=None):
+    return feather.read_table(data_path, columns=columns, memory_map=True).to_pandas()
+
+
+def _read_source(path, delimiter, progress=None):
+    """사이드카가 유효하면 사이드카를, 아니면 CSV를 파싱하고 사이드카를 만듭니다"""
+    data_path = _valid_sidecar(path, delimiter)
+    if data_path is not None:
+        df = _read_sidecar(data_path)
+        try:
+            with open(_sidecar_paths(path, delimiter)[1], encoding="utf-8") as f:
+                report = json.load(f).get("dtype_report")
+        except (OSError, ValueError):
+            report = None
+        _store_report(path, delimiter, report)
+        return df
+    signature = file_signature(path)
+    with open(path, "rb") as handle:
+        # 사이드카 검증용 내용 해시를 파싱하면서 함께 계산
+        hashing = _HashingReader(handle)
+        source = io.BufferedReader(hashing, buffer_size=1024 * 1024)
+        if OPTIMIZE_DTYPES:
+            df, report = read_csv_optimized(
+                source, delimiter, chunksize=LOAD_CHUNK_ROWS, parse_dates=PARSE_DATES,
+                progress=progress
+            )
+        else:
+            df = pd.read_csv(source, delimiter=delimiter)
+            report = dtype_report(df.dtypes, df.memory_usage(deep=True, index=False), df)
+        digest = hashing.hexdigest()
+    _store_report(path, delimiter, report, signature)
+    _write_sidecar(path, delimiter, df, signature, report, digest)
+    return df
+
+
+def _store_report(path, delimiter, report, signature=None):
+    with _REPORTS_LOCK:
+        _DTYPE_REPORTS[(os.path.abspath(path), delimiter)] = (
+            signature or file_signature(path), report
+        )
+
+
+class DatasetCache:
+    """
+    메모리 예산 기반 LRU DataFrame 캐시
+
+    캐시된 DataFrame은 여러 도구가 공유하므로 호출자는 원본을 수정하지 말고
+    필요하면 복사본을 만들어야 합니다.
+
+    Parameters:
+        max_bytes (int): 캐시가 사용할 최대 메모리(바이트)
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, path, delimiter, loader):
+        """
+        캐시된 DataFrame을 반환하고, 없거나 파일이 바뀌었으면 loader로 읽어 저장합니다
+
+        Parameters:
+            path (str): CSV 파일 경로
+            delimiter (str): 구분자
+            loader (callable): 캐시 미스 시 DataFrame을 반환하는 함수
+
+        Returns:
+            DataFrame: 데이터셋
+        """
+        key = (os.path.abspath(path), delimiter)
+        signature = file_signature(path)
+        with self._lock:
+            df = self._lookup(key, signature)
+            if df is not None:
+                return df
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        # 같은 파일을 여러 워커가 동시에 요청하면 한 번만 읽음
+        with loading:
+            with self._lock:
+                df = self._lookup(key, signature, count_miss=False)
+                if df is not None:
+                    return df
+            df = loader()
+            nbytes = int(df.memory_usage(deep=True).sum())
+            with self._lock:
+                if nbytes <= self.max_bytes:
+                    if key in self._entries:
+                        self._remove(key)
+                    self._entries[key] = {
+                        "df": df, "signature": signature, "bytes": nbytes, "hits": 0
+                    }
+                    self._bytes += nbytes
+                    while self._bytes > self.max_bytes:
+                        self._remove(next(iter(self._entries)))
+                        self.evictions += 1
+        return df
+
+    def _lookup(self, key, signature, count_miss=True):
+        """잠금을 잡은 상태에서 유효한 캐시 항목을 찾습니다 (없으면 None)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry["signature"] == signature:
+            self._entries.move_to_end(key)
+            entry["hits"] += 1
+            self.hits += 1
+            return entry["df"]
+        if entry is not None:
+            # 파일이 바뀐 예전 버전은 즉시 제거
+            self._remove(key)
+        if count_miss:
+            self.misses += 1
+        return None
+
+    def peek(self, path, delimiter):
+        """파일이 바뀌지 않은 캐시 항목이 있으면 반환합니다 (없으면 None, 카운터 변화 없음)"""
+        key = (os.path.abspath(path), delimiter)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["signature"] == file_signature(path):
+                return entry["df"]
+            return None
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry["bytes"]
+
+    def clear(self):
+        """모든 데이터셋을 비웁니다"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """히트/미스/제거 카운터와 데이터셋별 메모리 사용량을 반환합니다"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "used_mb": round(self._bytes / 1024 / 1024, 2),
+                "max_mb": round(self.max_bytes / 1024 / 1024, 2),
+                "datasets": [
+                    {
+                        "path": path,
+                        "delimiter": delimiter,
+                        "memory_mb": round(entry["bytes"] / 1024 / 1024, 2),
+                        "hits": entry["hits"],
+                    }
+                    for (path, delimiter), entry in self._entries.items()
+                ],
+            }
+
+
+# 서버 프로세스 전체에서 공유하는 캐시
+DATASET_CACHE = DatasetCache()
+
+
+def load_dataframe(path, delimiter=",", columns=None, progress=None):
+    """
+    캐시를 거쳐 CSV 파일을 DataFrame으로 읽는 함수
+
+    메모리 캐시 → 컬럼형 사이드카 → CSV 파싱 순으로 찾습니다. columns를 주면
+    메모리에 전체 데이터가 없을 때 사이드카에서 해당 컬럼만 읽습니다.
+
+    Parameters:
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+        columns (list): 필요한 컬럼 리스트 (없으면 전체)
+        progress (callable): CSV를 파싱할 때 청크마다 호출할 진행 상황 보고 함수
+
+    Returns:
+        DataFrame: 데이터셋 (공유 객체이므로 수정 금지)
+    """
+    if columns is not None:
+        cached = DATASET_CACHE.peek(path, delimiter)
+        if cached is not None:
+            return cached[list(columns)]
+        data_path = _valid_sidecar(path, delimiter)
+        if data_path is not None:
+            return _read_sidecar(data_path, columns=list(columns))
+        return load_dataframe(path, delimiter, progress=progress)[list(columns)]
+    return DATASET_CACHE.get(path, delimiter, lambda: _read_source(path, delimiter, progress))
+
+
+def with_original_dates(df, path, delimiter=","):
+    """
+    datetime64로 파싱된 컬럼을 CSV의 원래 문자열로 되돌린 DataFrame을 반환하는 함수
+
+    EDA_PARSE_DATES=1이면 캐시된 DataFrame의 날짜는 정규화되어 있으므로, 데이터를
+    다시 파일로 쓰는 도구는 이 함수로 원래 형식(예: 03/04/2024)을 유지합니다.
+
+    Parameters:
+        df (DataFrame): load_dataframe으로 읽은 데이터 (수정하지 않음)
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+
+    Returns:
+        DataFrame: 날짜 컬럼이 없으면 df 그대로, 있으면 해당 컬럼만 바꾼 복사본
+    """
+    date_columns = list(df.select_dtypes(include="datetime").columns)
+    if not date_columns:
+        return df
+    original = pd.read_csv(path, delimiter=delimiter, usecols=date_columns, dtype=str)
+    df = df.copy(deep=False)
+    for col in date_columns:
+        df[col] = original[col].to_numpy()
+    return df
+
+
+def memory_report(path, delimiter=",", progress=None):
+    """
+    데이터셋을 로드하고 컬럼별 타입 변환과 메모리 절감량을 반환하는 함수
+
+    Parameters:
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+        progress (callable): CSV를 파싱할 때 호출할 진행 상황 보고 함수
+
+    Returns:
+        dict: 컬럼별 from/to 타입과 변환 전후 바이트, 전체 합계
+    """
+    key = (os.path.abspath(path), delimiter)
+    df = load_dataframe(path, delimiter, progress=progress)
+    with _REPORTS_LOCK:
+        entry = _DTYPE_REPORTS.get(key)
+    if entry is None or entry[0] != file_signature(path) or entry[1] is None:
+        # 리포트 없이 만들어진 캐시 항목이면 현재 타입 기준으로만 보고
+        nbytes = df.memory_usage(deep=True, index=False)
+        return dtype_report(df.dtypes, nbytes, df)
+    return entry[1]
+
+
+def _count_newlines(data, start, end):
+    """버퍼의 [start, end) 구간에 있는 개행 수를 셉니다"""
+    return int(np.count_nonzero(data[start:end] == 10))
+
+
+def count_lines(path, block_size=64 * 1024 * 1024, workers=None):
+    """
+    파일을 메모리 매핑하고 바이트 구간별로 병렬 스캔해 줄 수를 세는 함수
+
+    마지막 줄이 개행으로 끝나지 않아도 한 줄로 셉니다. 따옴표 안의 개행도
+    줄로 세므로, 여러 줄 필드가 있는 CSV에서는 실제 행 수보다 클 수 있습니다.
+
+    Parameters:
+        path (str): 파일 경로
+        block_size (int): 스레드 하나가 한 번에 스캔할 바이트 수
+        workers (int): 스캔 스레드 수 (없으면 CPU 수)
+
+    Returns:
+        int: 줄 수
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = np.frombuffer(mm, dtype=np.uint8)
+        try:
+            starts = range(0, size, block_size)
+            # numpy 비교 연산은 GIL을 놓으므로 스레드로 구간을 나눠 스캔
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+                futures = [
+                    executor.submit(_count_newlines, data, start, min(start + block_size, size))
+                    for start in starts
+                ]
+                lines = sum(future.result() for future in futures)
+            ends_with_newline = data[-1] == 10
+        finally:
+            # mmap을 닫기 전에 버퍼 참조를 해제해야 함
+            del data
+    return lines if ends_with_newline else lines + 1
+
+
+def _sample_lines(path, offsets, lines_per_offset):
+    """각 바이트 오프셋에서 잘린 줄을 건너뛰고 완전한 줄 몇 개를 읽습니다"""
+    lines = []
+    with open(path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            f.readline()
+            for _ in range(lines_per_offset):
+                line = f.readline()
+                if not line:
+                    break
+                lines.append(line)
+    return lines
+
+
+def csv_metadata(path, delimiter=",", sample_size=5, head_rows=1000,
+                 sample_dtypes=False, sample_points=64, lines_per_point=16):
+    """
+    전체 파일을 파싱하지 않고 CSV의 컬럼, 샘플, 타입, 크기를 구하는 함수
+
+    메모리 캐시나 유효한 사이드카가 있으면 정확한 값을 바로 쓰고, 없으면 앞부분
+    head_rows행만 파싱해 샘플과 타입을 추정한 뒤 줄 수 스캔으로 행 수를 셉니다.
+    타입 최적화가 켜져 있으면 앞부분에도 같은 최적화를 적용하므로, 파일 전체를 읽었을 때와
+    같은 종류의 타입을 보고합니다 (정수 폭과 category 여부는 앞부분 기준 추정).
+    sample_dtypes를 켜면 파일 전체에 고르게 분포한 오프셋에서 읽은 줄을 함께
+    파싱해, 뒤쪽에만 결측이나 문자열이 있는 컬럼의 타입도 반영합니다.
+
+    Parameters:
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+        sample_size (int): 반환할 샘플 행 수
+        head_rows (int): 타입 추정에 사용할 앞부분 행 수
+        sample_dtypes (bool): 파일 전체에서 줄을 샘플링해 타입 추정 보완 여부
+        sample_points (int): 샘플링할 오프셋 수
+        lines_per_point (int): 오프셋마다 읽을 줄 수
+
+    Returns:
+        dict: columns, shape, sample, dtypes, exact_shape(행 수가 정확한지 여부)
+    """
+    cached = DATASET_CACHE.peek(path, delimiter)
+    if cached is not None:
+        head, dtypes, rows, exact = cached.head(sample_size), cached.dtypes, len(cached), True
+    else:
+        data_path = _valid_sidecar(path, delimiter)
+        if data_path is not None:
+            table = feather.read_table(data_path, memory_map=True)
+            head = table.slice(0, sample_size).to_pandas()
+            dtypes = table.schema.empty_table().to_pandas().dtypes
+            rows, exact = table.num_rows, True
+        else:
+            limit = max(head_rows, sample_size)
+            # 한 행 더 읽어 앞부분만으로 파일 끝까지 읽었는지 판단
+            frame = pd.read_csv(path, delimiter=delimiter, nrows=limit + 1)
+            exact = len(frame) <= limit
+            frame = frame.head(limit)
+            raw = frame
+            if OPTIMIZE_DTYPES:
+                # 캐시/사이드카를 거친 경우와 같은 축소 타입(category, int8 등)을 보고
+                frame = optimize_dtypes(frame, parse_dates=PARSE_DATES)[0]
+            head, dtypes = frame.head(sample_size), frame.dtypes
+            if exact:
+                rows = len(frame)
+            else:
+                if sample_dtypes:
+                    dtypes = _sampled_dtypes(path, delimiter, raw, sample_points, lines_per_point)
+                rows = max(count_lines(path) - 1, 0)
+
+    return {
+        "columns": [str(c) for c in head.columns],
+        "shape": (rows, len(head.columns)),
+        "sample": head.to_dict(),
+        "dtypes": dtypes.astype(str).to_dict(),
+        "exact_shape": exact,
+    }
+
+
+def _sampled_dtypes(path, delimiter, head, sample_points, lines_per_point):
+    """앞부분과 파일 전체에서 샘플링한 줄을 함께 파싱해 타입을 추정합니다"""
+    size = os.path.getsize(path)
+    offsets = [int(size * i / sample_points) for i in range(1, sample_points)]
+    lines = _sample_lines(path, offsets, lines_per_point)
+    if not lines:
+        if OPTIMIZE_DTYPES:
+            return optimize_dtypes(head, parse_dates=PARSE_DATES)[0].dtypes
+        return head.dtypes
+    try:
+        sampled = pd.read_csv(
+            io.BytesIO(b"".join(lines)), delimiter=delimiter, header=None,
+            names=list(head.columns), on_bad_lines="skip"
+        )
+        combined = pd.read_csv(
+            io.StringIO(
+                pd.concat([head, sampled], ignore_index=True).to_csv(index=False)
+            ),
+            delimiter=","
+        )
+    except (ValueError, pd.errors.ParserError):
+        combined = head
+    if OPTIMIZE_DTYPES:
+        combined = optimize_dtypes(combined, parse_dates=PARSE_DATES)[0]
+    return combined.dtypes
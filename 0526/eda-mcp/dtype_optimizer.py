@@ -0,0 +1,219 @@
+"""
+CSV 로드 시 컬럼 타입을 메모리 효율적인 타입으로 바꾸는 모듈
+
+pandas 기본 타입(int64/float64/object) 대신
+- 정수는 값 범위에 맞는 가장 작은 정수 타입
+- 실수는 float32로 바꿔도 값이 바뀌지 않을 때만 float32
+- 고유값 비율이 낮은 문자열은 category
+- 날짜 형식 문자열은 datetime64 (parse_dates=True일 때만 - 날짜 문자열의 원래
+  형식이 사라지고 일/월 순서가 모호한 값은 추정되므로 기본값은 꺼짐)
+을 사용합니다. CSV는 청크 단위로 읽으며 청크마다 타입을 줄이므로, 기본 타입으로는
+메모리에 올라가지 않던 파일도 최종 크기만큼의 메모리로 읽을 수 있습니다.
+"""
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# 고유값 수가 (결측 제외) 행 수의 이 비율 이하인 문자열 컬럼을 category로 변환
+CATEGORY_RATIO = 0.5
+# 날짜 판단에 사용할 샘플 값 수
+DATE_SAMPLE_SIZE = 100
+# 2024-01-31, 2024/1/31, 31.01.2024 같은 날짜로 시작하는 값
+DATE_PATTERN = re.compile(r"^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}")
+
+
+def _downcast_numeric(series):
+    """정수는 최소 정수 타입으로, 실수는 손실이 없을 때만 float32로 바꿉니다"""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast="integer")
+    if series.dtype == np.float64:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        with np.errstate(over="ignore", invalid="ignore"):
+            if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                return pd.Series(narrowed, index=series.index, name=series.name)
+    return series
+
+
+def _parse_dates(values):
+    """
+    값이 모두 날짜 형식이면 datetime64로 변환한 배열을, 아니면 None을 반환합니다
+
+    샘플이 모두 날짜 패턴과 맞을 때만 전체를 변환하고, 변환 후 결측이 늘어나면
+    (형식이 섞여 있거나 날짜가 아닌 값이 있으면) 변환하지 않습니다.
+    """
+    present = values[pd.notna(values)]
+    if not len(present):
+        return None
+    sample = present[:DATE_SAMPLE_SIZE]
+    if not all(isinstance(v, str) and DATE_PATTERN.match(v) for v in sample):
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            parsed = pd.to_datetime(pd.Series(values), errors="coerce")
+        except (ValueError, TypeError, OverflowError):
+            return None
+    if parsed.notna().sum() != len(present):
+        return None
+    return parsed
+
+
+def _optimize_column(series, category_ratio, parse_dates):
+    """한 컬럼의 타입을 줄인 Series를 반환합니다"""
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return _downcast_numeric(series)
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if parse_dates:
+            parsed = _parse_dates(categories.to_numpy(dtype=object))
+            if parsed is not None:
+                # 고유값만 파싱한 뒤 코드로 펼침 (결측 코드 -1은 NaT)
+                codes = series.cat.codes.to_numpy()
+                dates = parsed.to_numpy()
+                values = np.where(codes >= 0, dates[np.maximum(codes, 0)], np.datetime64("NaT"))
+                return pd.Series(values, index=series.index, name=series.name)
+        present = int(series.notna().sum())
+        if len(categories) > category_ratio * present:
+            return series.astype(object)
+        return series.cat.remove_unused_categories()
+
+    if series.dtype != object:
+        return series
+    if parse_dates:
+        parsed = _parse_dates(series.to_numpy())
+        if parsed is not None:
+            parsed.index = series.index
+            parsed.name = series.name
+            return parsed
+    present = int(series.notna().sum())
+    if present and series.nunique() <= category_ratio * present:
+        return series.astype("category")
+    return series
+
+
+def optimize_dtypes(df, category_ratio=CATEGORY_RATIO, parse_dates=False):
+    """
+    DataFrame의 컬럼 타입을 메모리 효율적인 타입으로 바꾸는 함수
+
+    Parameters:
+        df (DataFrame): 원본 데이터 (수정하지 않음)
+        category_ratio (float): category로 바꿀 최대 고유값 비율
+        parse_dates (bool): 날짜 형식 문자열을 datetime64로 변환할지 여부
+
+    Returns:
+        tuple: (변환된 DataFrame, 컬럼별 변환 리포트)
+    """
+    before = df.memory_usage(deep=True, index=False)
+    optimized = pd.DataFrame({
+        col: _optimize_column(df[col], category_ratio, parse_dates) for col in df.columns
+    }, index=df.index)
+    return optimized, dtype_report(df.dtypes, before, optimized)
+
+
+def dtype_report(original_dtypes, before, optimized):
+    """
+    컬럼별 원래 타입/변환된 타입/절감한 메모리를 정리하는 함수
+
+    Parameters:
+        original_dtypes (Series): 컬럼별 원래 타입
+        before (Series): 컬럼별 원래 메모리 사용량(바이트)
+        optimized (DataFrame): 변환된 데이터
+
+    Returns:
+        dict: columns(컬럼별 리포트), before_bytes, after_bytes, saved_bytes
+    """
+    after = optimized.memory_usage(deep=True, index=False)
+    columns = {}
+    for col in optimized.columns:
+        columns[str(col)] = {
+            "from": str(original_dtypes[col]),
+            "to": str(optimized[col].dtype),
+            "before_bytes": int(before[col]),
+            "after_bytes": int(after[col]),
+            "saved_bytes": int(before[col] - after[col]),
+        }
+    return {
+        "columns": columns,
+        "before_bytes": int(before.sum()),
+        "after_bytes": int(after.sum()),
+        "saved_bytes": int(before.sum() - after.sum()),
+    }
+
+
+def _combine(pieces):
+    """청크별로 변환한 같은 컬럼 조각을 하나의 Series로 합칩니다"""
+    if all(isinstance(p.dtype, pd.CategoricalDtype) for p in pieces):
+        try:
+            return pd.Series(union_categoricals(pieces, ignore_order=True))
+        except TypeError:
+            # 청크마다 카테고리 값 타입이 다르면 object로 합침
+            pass
+    pieces = [
+        p.astype(object) if isinstance(p.dtype, pd.CategoricalDtype) else p
+        for p in pieces
+    ]
+    return pd.concat(pieces, ignore_index=True)
+
+
+def read_csv_optimized(path, delimiter=",", chunksize=200000,
+                       category_ratio=CATEGORY_RATIO, parse_dates=False, progress=None):
+    """
+    CSV를 청크 단위로 읽으며 컬럼 타입을 줄이는 함수
+
+    청크마다 숫자는 작은 타입으로, 문자열은 category로 바꿔 두고 마지막에 합친 뒤
+    전체 기준으로 한 번 더 타입을 정합니다 (고유값이 많은 컬럼은 object로 되돌리고,
+    날짜는 고유값만 파싱). 최대 메모리는 최종 결과 + 청크 하나 수준입니다.
+
+    Parameters:
+        path (str or file): CSV 파일 경로 또는 바이너리 파일 객체
+        delimiter (str): 구분자
+        chunksize (int): 한 번에 읽을 행 수
+        category_ratio (float): category로 바꿀 최대 고유값 비율
+        parse_dates (bool): 날짜 형식 문자열을 datetime64로 변환할지 여부
+        progress (callable): 청크마다 progress(읽은 행 수, None, 메시지)로 호출
+
+    Returns:
+        tuple: (DataFrame, 컬럼별 변환 리포트)
+    """
+    rows = 0
+    columns = None
+    pieces = {}
+    before = None
+    original_dtypes = {}
+    for chunk in pd.read_csv(path, delimiter=delimiter, chunksize=chunksize):
+        if columns is None:
+            columns = list(chunk.columns)
+            pieces = {col: [] for col in columns}
+            before = pd.Series(0, index=chunk.columns, dtype=np.int64)
+        before += chunk.memory_usage(deep=True, index=False)
+        for col in columns:
+            dtype = chunk[col].dtype
+            if original_dtypes.setdefault(col, dtype) != dtype:
+                original_dtypes[col] = np.dtype(object)
+            if dtype == object:
+                pieces[col].append(chunk[col].astype("category"))
+            else:
+                pieces[col].append(_optimize_column(chunk[col], category_ratio, False))
+        rows += len(chunk)
+        del chunk
+        if progress is not None:
+            progress(rows, None, f"{rows}행 읽음")
+
+    if columns is None:
+        # 헤더만 있는 파일
+        df = pd.read_csv(path, delimiter=delimiter)
+        return df, dtype_report(df.dtypes, df.memory_usage(deep=True, index=False), df)
+
+    combined = {}
+    for col in columns:
+        series = _combine(pieces.pop(col))
+        combined[col] = _optimize_column(series, category_ratio, parse_dates)
+    df = pd.DataFrame(combined)
+    return df, dtype_report(pd.Series(original_dtypes), before, df)
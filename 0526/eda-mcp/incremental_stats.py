@@ -0,0 +1,298 @@
+"""
+뒤에 행이 추가되기만 하는(append-only) CSV의 증분 기술 통계
+
+로그처럼 계속 커지는 CSV는 매번 처음부터 다시 읽을 필요가 없습니다. 이 모듈은
+StreamingDescriber의 병합 가능한 집계 상태와 지금까지 처리한 바이트 위치(offset)를
+상태 디렉토리(EDA_STATS_DIR, 기본: 임시 디렉토리/eda-mcp-stats)에 저장하고,
+다음 호출에서는 offset 이후에 추가된 완전한 줄만 파싱해 상태에 합칩니다.
+상태는 pickle 대신 배열(.npz)과 JSON 메타데이터로만 저장하므로, 상태 파일을
+다른 사용자가 바꿔 넣어도 서버에서 코드가 실행되지는 않습니다.
+
+파일이 뒤에 추가된 것인지는 offset 이전 구간의 지문(앞부분, 고르게 떨어진 블록들,
+offset 직전 블록의 해시)으로 확인합니다. 파일이 줄었거나 지문이 다르면(중간 수정,
+교체) 처음부터 다시 집계합니다. 지문은 표본 블록만 비교하므로 표본 사이의 바이트만
+바뀐 수정은 감지하지 못할 수 있으며, 이때는 rebuild=True로 다시 만들 수 있습니다.
+마지막 줄이 아직 쓰이는 중(줄바꿈으로 끝나지 않음)이면 다음 호출로 미룹니다.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from stream_stats import (
+    FrequentItems, HyperLogLog, NumericColumn, ObjectColumn, QuantileSketch,
+    StreamingCorrelation, StreamingDescriber
+)
+
+STATS_DIR = os.environ.get(
+    "EDA_STATS_DIR", os.path.join(tempfile.gettempdir(), "eda-mcp-stats")
+)
+# 저장 형식이나 집계 방식을 바꾸면 올려서 예전 상태를 무효화
+STATE_VERSION = 2
+# 지문에 사용할 블록 크기와 표본 블록 수
+FINGERPRINT_BLOCK = 64 * 1024
+FINGERPRINT_SAMPLES = 16
+
+_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+class _Window(io.RawIOBase):
+    """파일의 [start, end) 구간만 읽는 파일 객체"""
+
+    def __init__(self, handle, start, end):
+        self._handle = handle
+        self._remaining = end - start
+        handle.seek(start)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._handle.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def _state_path(path, delimiter):
+    name = hashlib.sha1(
+        f"{os.path.abspath(path)}\0{delimiter}".encode("utf-8")
+    ).hexdigest()[:20]
+    return os.path.join(STATS_DIR, name + ".npz")
+
+
+def _lock(path, delimiter):
+    key = (os.path.abspath(path), delimiter)
+    with _LOCKS_GUARD:
+        return _LOCKS.setdefault(key, threading.Lock())
+
+
+def fingerprint(path, length):
+    """파일 앞 length바이트의 표본 블록 해시를 반환합니다"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(length).encode("ascii"))
+    if length <= 0:
+        return digest.hexdigest()
+    step = max(length // FINGERPRINT_SAMPLES, 1)
+    offsets = sorted({0, *range(0, length, step), max(length - FINGERPRINT_BLOCK, 0)})
+    with open(path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            digest.update(f.read(min(FINGERPRINT_BLOCK, length - offset)))
+    return digest.hexdigest()
+
+
+def _complete_end(path, size, start):
+    """start 이후 마지막 줄바꿈 다음 위치를 반환합니다 (완전한 줄이 없으면 start)"""
+    position = size
+    block = FINGERPRINT_BLOCK
+    with open(path, "rb") as f:
+        while position > start:
+            read_from = max(position - block, start)
+            f.seek(read_from)
+            data = f.read(position - read_from)
+            newline = data.rfind(b"\n")
+            if newline >= 0:
+                return read_from + newline + 1
+            position = read_from
+    return start
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__}은(는) 상태로 저장할 수 없습니다")
+
+
+def _encode_describer(describer):
+    """StreamingDescriber를 (JSON으로 저장할 메타데이터, 배열 dict)로 나눕니다"""
+    if describer.columns is None:
+        return None, {}
+    arrays = {}
+    stats = []
+    for i, col in enumerate(describer.columns):
+        stat = describer.stats[col]
+        if isinstance(stat, NumericColumn):
+            sketch = stat.sketch
+            for h, level in enumerate(sketch.levels):
+                arrays[f"levels_{i}_{h}"] = level
+            stats.append({
+                "kind": "numeric", "count": stat.count, "mean": stat.mean, "m2": stat.m2,
+                "min": stat.min, "max": stat.max, "k": sketch.k,
+                "levels": len(sketch.levels), "rng": sketch._rng.bit_generator.state,
+            })
+        else:
+            arrays[f"registers_{i}"] = stat.distinct.registers
+            stats.append({
+                "kind": "object", "count": stat.count, "p": stat.distinct.p,
+                "capacity": stat.frequent.capacity,
+                "approximate": stat.frequent.approximate,
+                "counts": list(stat.frequent.counts.items()),
+            })
+    correlation = describer.correlation
+    for name in ("n", "sx", "sxx", "sxy"):
+        arrays[f"corr_{name}"] = getattr(correlation, name)
+    if correlation.shift is not None:
+        arrays["corr_shift"] = correlation.shift
+    meta = {
+        "columns": describer.columns,
+        "rows": describer.rows,
+        "coerced_columns": sorted(describer.coerced_columns),
+        "stats": stats,
+        "corr_columns": correlation.columns,
+    }
+    return meta, arrays
+
+
+def _decode_describer(meta, arrays):
+    """_encode_describer로 나눈 값에서 StreamingDescriber를 다시 만듭니다"""
+    describer = StreamingDescriber()
+    if meta is None:
+        return describer
+    describer.columns = list(meta["columns"])
+    describer.rows = meta["rows"]
+    describer.coerced_columns = set(meta["coerced_columns"])
+    for i, (col, entry) in enumerate(zip(describer.columns, meta["stats"])):
+        if entry["kind"] == "numeric":
+            stat = NumericColumn()
+            stat.count, stat.mean, stat.m2 = entry["count"], entry["mean"], entry["m2"]
+            stat.min, stat.max = entry["min"], entry["max"]
+            stat.sketch = QuantileSketch(k=entry["k"])
+            stat.sketch.levels = [arrays[f"levels_{i}_{h}"] for h in range(entry["levels"])]
+            stat.sketch._rng.bit_generator.state = entry["rng"]
+        else:
+            stat = ObjectColumn()
+            stat.count = entry["count"]
+            stat.distinct = HyperLogLog(p=entry["p"])
+            stat.distinct.registers = arrays[f"registers_{i}"]
+            stat.frequent = FrequentItems(capacity=entry["capacity"])
+            stat.frequent.approximate = entry["approximate"]
+            stat.frequent.counts = {value: count for value, count in entry["counts"]}
+        describer.stats[col] = stat
+    correlation = StreamingCorrelation(meta["corr_columns"])
+    for name in ("n", "sx", "sxx", "sxy"):
+        setattr(correlation, name, arrays[f"corr_{name}"])
+    correlation.shift = arrays.get("corr_shift")
+    describer.correlation = correlation
+    return describer
+
+
+def _load_state(path, delimiter):
+    try:
+        with np.load(_state_path(path, delimiter), allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        meta = json.loads(str(arrays.pop("meta")))
+        if meta.get("version") != STATE_VERSION or meta.get("path") != os.path.abspath(path):
+            return None
+        describer = _decode_describer(meta.pop("describer"), arrays)
+    except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile):
+        return None
+    return {**meta, "describer": describer}
+
+
+def _save_state(path, delimiter, state):
+    """상태를 원자적으로 저장합니다 (실패해도 결과는 그대로 반환)"""
+    state_path = _state_path(path, delimiter)
+    meta = {key: value for key, value in state.items() if key != "describer"}
+    meta["describer"], arrays = _encode_describer(state["describer"])
+    try:
+        payload = json.dumps(meta, ensure_ascii=False, default=_json_default)
+        os.makedirs(STATS_DIR, mode=0o700, exist_ok=True)
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, meta=np.array(payload), **arrays)
+        os.replace(tmp_path, state_path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _parse(path, delimiter, start, end, chunksize, describer, columns, progress):
+    """[start, end) 구간을 청크 단위로 읽어 describer에 합치고 헤더 컬럼을 반환합니다"""
+    with open(path, "rb") as handle:
+        window = io.BufferedReader(_Window(handle, start, end), buffer_size=1024 * 1024)
+        if columns is None:
+            reader = pd.read_csv(window, delimiter=delimiter, chunksize=chunksize)
+        else:
+            reader = pd.read_csv(window, delimiter=delimiter, chunksize=chunksize,
+                                 header=None, names=columns)
+        with reader:
+            for chunk in reader:
+                if columns is None:
+                    columns = list(chunk.columns)
+                describer.update(chunk)
+                if progress is not None:
+                    progress(handle.tell() - start, end - start, f"{describer.rows}행 집계")
+        if columns is None:
+            # 헤더만 있는 파일
+            columns = list(pd.read_csv(path, delimiter=delimiter, nrows=0).columns)
+    return columns
+
+
+def incremental_describe(path, delimiter=",", chunksize=100_000, rebuild=False, progress=None):
+    """
+    저장된 집계 상태에 새로 추가된 행만 합쳐 (기술 통계, 상관관계, 집계 객체, 정보)를 반환하는 함수
+
+    Parameters:
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+        chunksize (int): 한 번에 읽을 행 수
+        rebuild (bool): 저장된 상태를 무시하고 처음부터 다시 집계할지 여부
+        progress (callable): 청크마다 progress(파싱한 바이트, 파싱할 바이트, 메시지)로 호출
+
+    Returns:
+        tuple: (describe_csv와 같은 통계 dict, 상관관계 dict, StreamingDescriber,
+                {"mode": "unchanged"/"append"/"rebuild", "bytes_parsed", "offset", "file_bytes"})
+    """
+    with _lock(path, delimiter):
+        stat = os.stat(path)
+        size = stat.st_size
+        state = None if rebuild else _load_state(path, delimiter)
+
+        if state is not None and state["size"] == size and state["mtime_ns"] == stat.st_mtime_ns:
+            mode = "unchanged"
+        elif (state is not None and size >= state["offset"]
+              and fingerprint(path, state["offset"]) == state["fingerprint"]):
+            mode = "append"
+        else:
+            mode = "rebuild"
+            state = {"describer": StreamingDescriber(), "columns": None, "offset": 0}
+
+        start = state["offset"]
+        end = start
+        if mode != "unchanged":
+            end = _complete_end(path, size, start)
+            if end > start:
+                state["columns"] = _parse(
+                    path, delimiter, start, end, chunksize,
+                    state["describer"], state["columns"], progress
+                )
+            state.update({
+                "version": STATE_VERSION,
+                "path": os.path.abspath(path),
+                "offset": end,
+                "size": size,
+                "mtime_ns": stat.st_mtime_ns,
+                "fingerprint": fingerprint(path, end),
+            })
+            _save_state(path, delimiter, state)
+
+    describer = state["describer"]
+    info = {
+        "mode": mode,
+        "bytes_parsed": end - start,
+        "offset": state["offset"],
+        "file_bytes": size,
+    }
+    if describer.columns is None:
+        return {}, {}, describer, info
+    return describer.describe(), describer.correlation.correlation(), describer, info
@@ -0,0 +1,359 @@
+"""
+필요한 컬럼과 행만 읽는 CSV 조회 모듈
+
+query_data 도구가 사용합니다. 조회에 필요한 컬럼(선택/조건/그룹/집계/정렬)만
+읽고, 조건은 청크마다 평가해 일치하는 행만 남깁니다. 데이터는 다음 순서로 찾습니다.
+- memory: 데이터셋 캐시에 이미 올라온 DataFrame
+- sidecar: 유효한 컬럼형 Feather 사이드카 (필요한 컬럼의 레코드 배치만 메모리 매핑)
+- csv: usecols로 필요한 컬럼만 파싱하며 청크 단위로 읽음
+
+그룹/정렬이 없으면 limit개를 채우는 즉시 읽기를 멈추고, 정렬이 있으면 청크마다
+상위 limit개만 유지하며, 집계는 청크마다 부분 집계(count/sum/min/max/제곱합)를
+구해 합치므로 메모리는 결과 크기 정도로 일정합니다. 결과에는 실제로 읽은
+바이트 수(bytes_read)가 포함됩니다.
+"""
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from dataset_cache import DATASET_CACHE, sidecar_file
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# 지원하는 조건 연산자
+OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in", "not in",
+             "isnull", "notnull", "contains", "startswith")
+# 지원하는 집계 함수 -> 필요한 부분 집계
+AGGREGATES = {
+    "count": ("count",),
+    "sum": ("sum",),
+    "mean": ("sum", "count"),
+    "min": ("min",),
+    "max": ("max",),
+    "var": ("sum", "count", "sumsq"),
+    "std": ("sum", "count", "sumsq"),
+}
+# 부분 집계를 합치는 방법
+_MERGE = {"count": "sum", "sum": "sum", "sumsq": "sum", "size": "sum", "min": "min", "max": "max"}
+# 이 수만큼 부분 집계가 쌓이면 한 번 합쳐 메모리를 제한
+_REDUCE_EVERY = 16
+
+
+def _normalize_aggregates(aggregates):
+    """{컬럼: 함수 또는 함수 리스트}를 [(컬럼, 함수)]로 펼치고 검증합니다 ("*": "count"는 행 수)"""
+    specs = []
+    for col, funcs in (aggregates or {}).items():
+        for func in [funcs] if isinstance(funcs, str) else funcs:
+            if col == "*":
+                if func != "count":
+                    raise ValueError("'*'에는 count만 사용할 수 있습니다")
+            elif func not in AGGREGATES:
+                raise ValueError(f"지원하지 않는 집계 함수입니다: {func} (지원: {', '.join(AGGREGATES)})")
+            specs.append((col, func))
+    return specs
+
+
+def _normalize_where(where):
+    """조건 목록을 [(컬럼, 연산자, 값)]으로 검증합니다 (모든 조건은 AND로 결합)"""
+    predicates = []
+    for item in where or []:
+        if len(item) == 2 and item[1] in ("isnull", "notnull"):
+            item = [item[0], item[1], None]
+        if len(item) != 3:
+            raise ValueError(f"조건은 [컬럼, 연산자, 값] 형식이어야 합니다: {item}")
+        col, op, value = item
+        if op not in OPERATORS:
+            raise ValueError(f"지원하지 않는 연산자입니다: {op} (지원: {', '.join(OPERATORS)})")
+        if op in ("in", "not in") and not isinstance(value, (list, tuple)):
+            raise ValueError(f"'{op}' 연산자의 값은 리스트여야 합니다: {col}")
+        predicates.append((col, op, value))
+    return predicates
+
+
+def _coerce_value(series, value):
+    """JSON으로 받은 비교 값을 컬럼 타입에 맞춥니다 (예: 수치형 컬럼과 "5")"""
+    if isinstance(value, str) and pd.api.types.is_numeric_dtype(series.dtype) \
+            and not pd.api.types.is_bool_dtype(series.dtype):
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f"'{series.name}' 컬럼은 수치형이므로 '{value}'와 비교할 수 없습니다")
+    return value
+
+
+def _mask(frame, predicates):
+    """청크에서 모든 조건을 만족하는 행의 불리언 마스크를 구합니다"""
+    mask = np.ones(len(frame), dtype=bool)
+    for col, op, value in predicates:
+        series = frame[col]
+        if op == "isnull":
+            result = series.isna()
+        elif op == "notnull":
+            result = series.notna()
+        elif op in ("in", "not in"):
+            result = series.isin([_coerce_value(series, v) for v in value])
+            if op == "not in":
+                result = ~result
+        elif op in ("contains", "startswith"):
+            text = series.astype(str)
+            result = text.str.contains(str(value), regex=False) if op == "contains" \
+                else text.str.startswith(str(value))
+            result &= series.notna()
+        else:
+            if isinstance(series.dtype, pd.CategoricalDtype) and op not in ("==", "!="):
+                # 순서 없는 category는 대소 비교가 안 되므로 원래 값 타입으로 비교
+                series = series.astype(series.cat.categories.dtype)
+            value = _coerce_value(series, value)
+            try:
+                result = {
+                    "==": series.__eq__, "!=": series.__ne__,
+                    "<": series.__lt__, "<=": series.__le__,
+                    ">": series.__gt__, ">=": series.__ge__,
+                }[op](value)
+            except TypeError:
+                raise ValueError(f"'{col}' 컬럼({series.dtype})을 {value!r}와 '{op}'로 비교할 수 없습니다")
+        mask &= result.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def _partial_aggregate(frame, group_by, specs):
+    """청크 하나의 그룹별 부분 집계를 "컬럼\\0통계" 컬럼의 DataFrame으로 반환합니다"""
+    by = [frame[k] for k in group_by] if group_by else [pd.Series(0, index=frame.index)]
+    parts = {}
+    for col, func in specs:
+        if col == "*":
+            parts["*\0size"] = frame.groupby(by, observed=True, dropna=False, sort=False).size()
+            continue
+        series = frame[col]
+        for stat in AGGREGATES[func]:
+            key = f"{col}\0{stat}"
+            if key in parts:
+                continue
+            try:
+                if stat == "sumsq":
+                    values = series.astype(float) ** 2
+                    parts[key] = values.groupby(by, observed=True, dropna=False, sort=False).sum()
+                else:
+                    parts[key] = series.groupby(by, observed=True, dropna=False, sort=False).agg(stat)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{col}' 컬럼({series.dtype})에는 {func} 집계를 적용할 수 없습니다")
+    return pd.DataFrame(parts)
+
+
+def _reduce(partials):
+    """부분 집계 목록을 그룹별로 합칩니다"""
+    combined = pd.concat(partials)
+    merge = {col: _MERGE[col.split("\0")[1]] for col in combined.columns}
+    levels = list(range(combined.index.nlevels))
+    return combined.groupby(level=levels, observed=True, dropna=False, sort=False).agg(merge)
+
+
+def _finish_aggregate(combined, group_by, specs):
+    """합친 부분 집계에서 최종 집계 값을 계산합니다"""
+    result = pd.DataFrame(index=combined.index)
+    for col, func in specs:
+        if col == "*":
+            result["count"] = combined["*\0size"].astype("int64")
+            continue
+        name = f"{col}_{func}"
+        if func in ("count", "sum", "min", "max"):
+            result[name] = combined[f"{col}\0{func}"]
+            continue
+        total = combined[f"{col}\0sum"].astype(float)
+        count = combined[f"{col}\0count"].astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if func == "mean":
+                result[name] = total / count
+            else:
+                var = (combined[f"{col}\0sumsq"] - total * total / count) / (count - 1)
+                var = var.clip(lower=0).where(count > 1)
+                result[name] = np.sqrt(var) if func == "std" else var
+    if group_by:
+        result.index.names = list(group_by)
+        return result.reset_index()
+    return result.reset_index(drop=True)
+
+
+def _top_rows(frame, order_by, descending, limit):
+    if not order_by:
+        return frame
+    frame = frame.sort_values(list(order_by), ascending=not descending,
+                              na_position="last", kind="stable")
+    return frame.head(limit) if limit else frame
+
+
+def _csv_chunks(path, delimiter, needed, chunksize, state, progress):
+    """필요한 컬럼만 파싱하며 CSV를 청크 단위로 읽습니다"""
+    total = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        reader = pd.read_csv(handle, delimiter=delimiter, usecols=needed, chunksize=chunksize)
+        with reader:
+            for chunk in reader:
+                state["bytes_read"] = handle.tell()
+                if progress is not None:
+                    progress(state["bytes_read"], total, "CSV 조회 중")
+                yield chunk
+
+
+def _sidecar_chunks(data_path, needed, state, progress):
+    """사이드카의 레코드 배치에서 필요한 컬럼만 읽습니다"""
+    with pa.memory_map(data_path, "r") as source:
+        reader = pa.ipc.open_file(source)
+        batches = reader.num_record_batches
+        for i in range(batches):
+            batch = reader.get_batch(i).select(needed)
+            state["bytes_read"] += batch.nbytes
+            if progress is not None:
+                progress(i + 1, batches, "사이드카 조회 중")
+            yield batch.to_pandas()
+
+
+def _sidecar_columns(data_path):
+    with pa.memory_map(data_path, "r") as source:
+        return [str(c) for c in pa.ipc.open_file(source).schema.names]
+
+
+def _csv_columns(path, delimiter):
+    return [str(c) for c in pd.read_csv(path, delimiter=delimiter, nrows=0).columns]
+
+
+def query_csv(path, delimiter=",", columns=None, where=None, group_by=None,
+              aggregates=None, order_by=None, descending=False, limit=1000,
+              chunksize=100000, progress=None):
+    """
+    필요한 컬럼과 일치하는 행만 읽어 조회 결과를 반환하는 함수
+
+    Parameters:
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+        columns (list): 반환할 컬럼 (없으면 전체, 집계 시에는 무시)
+        where (list): [[컬럼, 연산자, 값], ...] 조건 (AND 결합)
+            연산자: ==, !=, <, <=, >, >=, in, not in, isnull, notnull, contains, startswith
+        group_by (list): 그룹 기준 컬럼
+        aggregates (dict): {컬럼: 함수 또는 [함수...]} - count/sum/mean/min/max/var/std,
+            "*": "count"는 그룹별 행 수
+        order_by (list): 정렬 기준 컬럼 (집계 시 결과 컬럼 이름, 예: price_mean)
+        descending (bool): 내림차순 정렬 여부
+        limit (int): 반환할 최대 행 수 (0이나 None이면 제한 없음)
+        chunksize (int): CSV에서 한 번에 읽을 행 수
+        progress (callable): 진행 상황 보고 함수
+
+    Returns:
+        tuple: (결과 DataFrame, 정보 dict - source, bytes_read, file_bytes,
+                matched_rows(전체를 읽었을 때), truncated)
+    """
+    predicates = _normalize_where(where)
+    specs = _normalize_aggregates(aggregates)
+    group_by = list(group_by or [])
+    order_by = list(order_by or [])
+    if group_by and not specs:
+        specs = [("*", "count")]
+    aggregate = bool(specs)
+
+    cached = DATASET_CACHE.peek(path, delimiter)
+    data_path = sidecar_file(path, delimiter) if cached is None else None
+    if cached is not None:
+        available = [str(c) for c in cached.columns]
+    elif data_path is not None and pa is not None:
+        available = _sidecar_columns(data_path)
+    else:
+        data_path = None
+        available = _csv_columns(path, delimiter)
+
+    selected = [] if aggregate else list(columns or available)
+    needed = list(dict.fromkeys(
+        selected + [p[0] for p in predicates] + group_by
+        + [col for col, _ in specs if col != "*"]
+        + ([] if aggregate else order_by)
+    ))
+    if not needed and available:
+        # "*": "count"만 있으면 읽을 컬럼이 없지만, usecols=[]로 읽은 CSV 청크는 행이 0개이므로
+        # 행 수를 셀 수 있도록 첫 컬럼 하나를 읽음
+        needed = available[:1]
+    missing = [c for c in needed if c not in available]
+    if missing:
+        raise ValueError(f"존재하지 않는 컬럼입니다: {missing}")
+    if aggregate:
+        outputs = group_by + [("count" if c == "*" else f"{c}_{f}") for c, f in specs]
+        unknown = [c for c in order_by if c not in outputs]
+        if unknown:
+            raise ValueError(f"집계 결과에 없는 정렬 컬럼입니다: {unknown} (사용 가능: {outputs})")
+
+    state = {"bytes_read": 0}
+    if cached is not None:
+        source = "memory"
+        chunks = iter([cached[needed]])
+    elif data_path is not None:
+        source = "sidecar"
+        chunks = _sidecar_chunks(data_path, needed, state, progress)
+    else:
+        source = "csv"
+        chunks = _csv_chunks(path, delimiter, needed, chunksize, state, progress)
+
+    matched = 0
+    truncated = False
+    kept = []
+    partials = []
+    try:
+        for chunk in chunks:
+            if predicates:
+                chunk = chunk[_mask(chunk, predicates)]
+            matched += len(chunk)
+            if aggregate:
+                if len(chunk):
+                    partials.append(_partial_aggregate(chunk, group_by, specs))
+                if len(partials) >= _REDUCE_EVERY:
+                    partials = [_reduce(partials)]
+                continue
+            kept.append(_top_rows(chunk[selected], order_by, descending, limit))
+            if order_by and len(kept) > 1:
+                kept = [_top_rows(pd.concat(kept), order_by, descending, limit)]
+            if not order_by and limit and sum(len(k) for k in kept) >= limit:
+                # 정렬이 없으면 limit개를 채운 뒤 나머지는 읽지 않음
+                truncated = True
+                break
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+    if aggregate:
+        if partials:
+            result = _finish_aggregate(_reduce(partials), group_by, specs)
+        elif group_by:
+            result = pd.DataFrame(columns=outputs)
+        else:
+            # 일치하는 행이 없어도 전체 집계는 한 행 (count는 0)
+            result = pd.DataFrame([{
+                ("count" if c == "*" else f"{c}_{f}"): (0 if f == "count" else math.nan)
+                for c, f in specs
+            }])
+        truncated = bool(limit) and len(result) > limit
+        result = _top_rows(result, order_by, descending, limit).head(limit or None)
+        result = result.reset_index(drop=True)
+    else:
+        result = pd.concat(kept) if kept else pd.DataFrame(columns=selected)
+        if limit and len(result) > limit:
+            truncated = True
+            result = result.head(limit)
+        result = result.reset_index(drop=True)
+
+    file_bytes = os.path.getsize(path)
+    if source == "memory":
+        state["bytes_read"] = 0
+    info = {
+        "source": source,
+        "columns_read": needed,
+        "bytes_read": state["bytes_read"],
+        "file_bytes": file_bytes,
+        "returned_rows": len(result),
+        "truncated": truncated,
+    }
+    if not (truncated and not aggregate):
+        # 끝까지 읽었을 때만 일치한 전체 행 수를 알 수 있음
+        info["matched_rows"] = matched
+    return result, info
@@ -0,0 +1,146 @@
+"""
+advanced_visualization 프로파일링 리포트 생성과 캐시
+
+리포트는 (원본 내용 해시, 구분자, 제목, minimal, 샘플 크기, 시드, 프로파일러 버전)을
+키로 리포트 디렉토리(EDA_REPORT_DIR, 기본: 임시 디렉토리/eda-mcp-reports)에 저장하고,
+같은 키로 다시 요청하면 프로파일링 없이 저장된 HTML을 사용합니다.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from dataset_cache import file_hash, file_signature, load_dataframe
+
+REPORT_DIR = os.environ.get(
+    "EDA_REPORT_DIR", os.path.join(tempfile.gettempdir(), "eda-mcp-reports")
+)
+
+# (절대 경로, 시그니처) -> 내용 해시 - 바뀌지 않은 큰 파일을 매번 해시하지 않도록 보관
+_HASHES = {}
+_HASHES_LOCK = threading.Lock()
+
+
+def _content_hash(path):
+    key = (os.path.abspath(path), file_signature(path))
+    with _HASHES_LOCK:
+        if key in _HASHES:
+            return _HASHES[key]
+    digest = file_hash(path)
+    with _HASHES_LOCK:
+        _HASHES[key] = digest
+    return digest
+
+
+def _import_profiler():
+    """(ProfileReport 클래스, 이름, 버전)을 반환합니다 (설치되어 있지 않으면 None)"""
+    try:
+        # 먼저 pandas_profiling 시도 (구 버전)
+        import pandas_profiling as module
+        name = "pandas-profiling"
+    except ImportError:
+        try:
+            # 그 다음 ydata_profiling 시도 (새 버전)
+            import ydata_profiling as module
+            name = "ydata-profiling"
+        except ImportError:
+            return None
+    except Exception:
+        return None
+    return module.ProfileReport, name, getattr(module, "__version__", "")
+
+
+def report_key(path, delimiter, title, minimal, sample_rows, seed, profiler):
+    """리포트 캐시 키를 만듭니다"""
+    options = json.dumps(
+        [_content_hash(path), delimiter, title, minimal, sample_rows, seed, profiler],
+        ensure_ascii=False
+    )
+    return hashlib.sha1(options.encode("utf-8")).hexdigest()[:24]
+
+
+def generate_report(path, delimiter=",", title="자동화 EDA 리포트", minimal=True,
+                    sample_rows=None, seed=0, output_path=None, use_cache=True,
+                    progress=None):
+    """
+    프로파일링 리포트를 만들거나 캐시에서 가져오는 함수
+
+    Parameters:
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+        title (str): 리포트 제목
+        minimal (bool): 간소화 모드 여부
+        sample_rows (int): 행이 이보다 많으면 무작위로 이만큼만 사용 (없으면 전체)
+        seed (int): 샘플링 시드
+        output_path (str): 리포트를 복사할 경로 (없으면 캐시 파일 경로를 반환)
+        use_cache (bool): False면 캐시를 무시하고 다시 생성
+        progress (callable): 진행 상황 보고 함수
+
+    Returns:
+        dict: message, success, report_path, cached, sampled, sample_size, total_rows
+    """
+    profiler = _import_profiler()
+    if profiler is None:
+        return {
+            "message": "pandas-profiling 또는 ydata-profiling이 설치되어 있지 않습니다. 'pip install ydata-profiling'를 실행하여 설치하세요.",
+            "success": False
+        }
+    ProfileReport, profiling_name, version = profiler
+
+    key = report_key(path, delimiter, title, minimal, sample_rows, seed, f"{profiling_name}-{version}")
+    cache_path = os.path.join(REPORT_DIR, key + ".html")
+    meta_path = os.path.join(REPORT_DIR, key + ".json")
+    report_path = output_path or cache_path
+
+    if use_cache and os.path.exists(cache_path) and os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if report_path != cache_path:
+            shutil.copyfile(cache_path, report_path)
+        return {
+            "message": f"캐시된 {profiling_name} EDA 리포트를 {report_path}에 저장했습니다",
+            "success": True,
+            "report_path": report_path,
+            "cached": True,
+            **meta
+        }
+
+    # CSV 파일 로드
+    df = load_dataframe(path, delimiter, progress=progress)
+    total_rows = len(df)
+    sampled = bool(sample_rows) and total_rows > sample_rows
+    if sampled:
+        df = df.sample(n=sample_rows, random_state=seed)
+        title = f"{title} (샘플 {sample_rows:,}행 / 전체 {total_rows:,}행)"
+    meta = {"sampled": sampled, "sample_size": len(df), "total_rows": total_rows}
+
+    try:
+        # 프로파일 리포트 생성
+        if progress is not None:
+            progress(1, 2, "프로파일 리포트 생성 중")
+        profile = ProfileReport(df, title=title, minimal=minimal)
+
+        # 결과를 HTML 파일로 저장 (캐시에 먼저 쓰고 원자적으로 교체)
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        tmp_path = cache_path + ".tmp.html"
+        profile.to_file(tmp_path)
+        os.replace(tmp_path, cache_path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        if report_path != cache_path:
+            shutil.copyfile(cache_path, report_path)
+
+        return {
+            "message": f"{profiling_name} EDA 리포트가 {report_path}에 성공적으로 저장되었습니다",
+            "success": True,
+            "report_path": report_path,
+            "cached": False,
+            **meta
+        }
+    except Exception as e:
+        return {
+            "message": f"리포트 생성 중 오류가 발생했습니다: {str(e)}",
+            "success": False
+        }
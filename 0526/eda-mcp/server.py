@@ -1,230 +1,574 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+import numpy as np
 import pandas as pd
 import os
+import sys
 import tempfile
 
+# 프로젝트 루트 디렉토리를 sys.path에 추가 (공용 lib 패키지)
+project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root_path not in sys.path:
+    sys.path.append(project_root_path)
+
+from lib.correlation import (
+    FULL_MATRIX_MAX_COLUMNS, compact_correlation, correlation_pairs, pairs_from_matrix
+)
+from lib.mcp_metrics import METRICS, instrument
+from lib.mcp_response import build_response, fetch_page
+
+from batch_profile import consolidate, expand_paths, profile_files
+from cleaning import apply_plan, clean_csv_streaming, plan_from_frame
+from dataset_cache import (DATASET_CACHE, csv_metadata, load_dataframe, memory_report,
+                           with_original_dates)
+from incremental_stats import incremental_describe
+from query import query_csv
+from reports import generate_report
+from stream_stats import describe_csv
+from workers import cancel_job, job_status, run_tool, submit_job
+
+# 이 크기 이상의 CSV는 describe_data/clean_data에서 기본적으로 스트리밍 모드로 처리
+STREAMING_THRESHOLD_BYTES = int(os.environ.get("EDA_STREAMING_THRESHOLD_MB", "1024")) * 1024 * 1024
+
 mcp = FastMCP(
     name="csv-eda-server",
     instructions="CSV 데이터셋 탐색적 분석을 수행하는 MCP 서버"
 )
 
 @mcp.tool('load_csv', "CSV 파일 로드 및 기본 정보 표시")
+@instrument('load_csv')
 async def load_csv(
     path: str,
     delimiter: str = ",",
-    sample_size: int = 5
+    sample_size: int = 5,
+    sample_dtypes: bool = False,
+    response_format: str = "compact",
+    ctx: Context = None
 ) -> dict:
-    """CSV 파일을 읽고 기본 정보를 반환합니다"""
-    df = pd.read_csv(path, delimiter=delimiter)
-
-    return {
-        "file_info": {
-            "columns": df.columns.tolist(),
-            "shape": df.shape,
-            "sample": df.head(sample_size).to_dict(),
-            "dtypes": df.dtypes.astype(str).to_dict()
-        }
-    }
+    """CSV 파일의 기본 정보를 반환합니다
+
+    전체 파일을 파싱하지 않고 앞부분으로 샘플과 타입을, 줄 수 스캔으로 행 수를 구합니다.
+    sample_dtypes가 True이면 파일 전체에서 고르게 줄을 샘플링해 타입 추정을 보완합니다.
+    response_format이 "dict"이면 샘플을 기존 df.to_dict() 형식으로 반환합니다.
+    """
+    def work(progress):
+        info = csv_metadata(path, delimiter, sample_size, sample_dtypes=sample_dtypes)
+        sample = pd.DataFrame(info.pop("sample"), columns=info["columns"])
+        info = build_response(info, {"sample": sample}, response_format)
+        return {"file_info": info}
+    return await run_tool('load_csv', work, ctx)
 
 @mcp.tool('describe_data', "데이터 기술 통계 생성")
+@instrument('describe_data')
 async def describe_data(
     path: str,
-    delimiter: str = ","
+    delimiter: str = ",",
+    streaming: bool = None,
+    chunksize: int = 100000,
+    incremental: bool = True,
+    rebuild: bool = False,
+    response_format: str = "compact",
+    ctx: Context = None
 ) -> dict:
-    """CSV 파일을 읽고 기술 통계를 생성합니다"""
-    df = pd.read_csv(path, delimiter=delimiter)
-    stats = df.describe(include='all').to_dict()
-    corr = df.corr(numeric_only=True).to_dict()
-    return {"statistics": stats, "correlation": corr}
+    """CSV 파일을 읽고 기술 통계를 생성합니다
 
-@mcp.tool('visualize_data', "자동화된 EDA 시각화 생성")
-async def visualize_data(
+    streaming이 True이면 파일을 chunksize행씩 읽으며 병합 가능한 통계만 유지하므로
+    파일 크기와 무관하게 메모리가 일정합니다 (분위수/고유값 수는 근사값일 수 있음).
+    지정하지 않으면 메모리에 캐시되지 않은 큰 파일(EDA_STREAMING_THRESHOLD_MB 이상)에서 자동으로 사용합니다.
+    스트리밍 모드에서 incremental이 True이면 집계 상태를 저장해 두고, 다음 호출에서는 뒤에
+    추가된 줄만 파싱해 합칩니다 (뒤에 추가된 것이 아닌 변경은 자동으로 다시 집계, rebuild로 강제).
+    수치형 컬럼이 CORR_FULL_MAX_COLUMNS(기본 100)개를 넘으면 상관관계는 가장 강한 쌍만 반환합니다.
+
+    기본 응답은 컬럼 하나가 한 행인 split 인코딩이며, 행이 많으면 next_cursor로 나머지를
+    fetch_page에서 이어 받습니다. response_format이 "dict"이면 기존 to_dict() 형식입니다.
+    """
+    if streaming is None:
+        streaming = (
+            DATASET_CACHE.peek(path, delimiter) is None
+            and os.path.getsize(path) >= STREAMING_THRESHOLD_BYTES
+        )
+
+    def work(progress):
+        if streaming:
+            result = {}
+            if incremental:
+                stats, corr, describer, result["incremental"] = incremental_describe(
+                    path, delimiter=delimiter, chunksize=chunksize, rebuild=rebuild,
+                    progress=progress
+                )
+            else:
+                stats, corr, describer = describe_csv(
+                    path, delimiter=delimiter, chunksize=chunksize, progress=progress
+                )
+            stats = pd.DataFrame.from_dict(stats, orient="index")
+            corr = pd.DataFrame(corr)
+            if describer.coerced_columns:
+                result["warnings"] = [
+                    f"'{col}' 컬럼의 숫자가 아닌 값은 결측으로 처리했습니다"
+                    for col in sorted(describer.coerced_columns)
+                ]
+        else:
+            df = load_dataframe(path, delimiter, progress=progress)
+            stats = df.describe(include='all').T
+            # 컬럼이 많으면 전체 행렬 대신 블록 단위로 강한 쌍만 계산
+            corr = compact_correlation(df)
+            result = {}
+
+        frames = {"statistics": stats}
+        if not isinstance(corr, pd.DataFrame):
+            result["correlation"] = corr
+        elif len(corr.columns) > FULL_MATRIX_MAX_COLUMNS:
+            result["correlation"] = {"columns": len(corr.columns), "pairs": pairs_from_matrix(corr)}
+        else:
+            frames["correlation"] = corr
+        return build_response(result, frames, response_format, row_keyed=("statistics",))
+    return await run_tool('describe_data', work, ctx)
+
+@mcp.tool('query_data', "필요한 컬럼/행만 읽는 조회 (선택, 조건, 그룹 집계, 정렬, 제한)")
+@instrument('query_data')
+async def query_data(
     path: str,
+    columns: list = None,
+    where: list = None,
+    group_by: list = None,
+    aggregates: dict = None,
+    order_by: list = None,
+    descending: bool = False,
+    limit: int = 1000,
     delimiter: str = ",",
-    plot_type: str = "auto",
-    output_path: str = None
+    chunksize: int = 100000,
+    response_format: str = "compact",
+    ctx: Context = None
 ) -> dict:
-    """CSV 파일을 읽고 시각화를 생성합니다"""
-    df = pd.read_csv(path, delimiter=delimiter)
-    import plotly.express as px
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-    import numpy as np
-
-    # 모든 서브플롯을 xy 타입으로 명시적으로 지정
-    fig = make_subplots(
-        rows=2, 
-        cols=2,
-        specs=[[{"type": "xy"}, {"type": "xy"}],
-               [{"type": "xy"}, {"type": "xy"}]],
-        subplot_titles=["스캐터 플롯", "히스토그램", "박스 플롯", "상관관계 히트맵"]
-    )
-    
-    # 수치형 컬럼만 선택 (최대 3개)
-    numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns[:3]
-    
-    # 스캐터 플롯 - 첫 번째 서브플롯 (1,1)
-    if len(numeric_cols) >= 2:
-        fig.add_trace(
-            go.Scatter(x=df[numeric_cols[0]], y=df[numeric_cols[1]], 
-                      mode='markers', name=f'{numeric_cols[0]} vs {numeric_cols[1]}'),
-            row=1, col=1
-        )
+    """CSV에서 필요한 컬럼과 조건에 맞는 행만 읽어 결과만 반환합니다
 
-    # 히스토그램 - 두 번째 서브플롯 (1,2)
-    for i, col in enumerate(numeric_cols):
-        fig.add_trace(
-            go.Histogram(x=df[col], name=col, opacity=0.7),
-            row=1, col=2
+    where는 [["price", ">", 100], ["city", "in", ["Seoul", "Busan"]]]처럼 [컬럼, 연산자, 값]
+    목록이며 모두 AND로 결합합니다 (==, !=, <, <=, >, >=, in, not in, isnull, notnull,
+    contains, startswith). aggregates는 {"price": ["mean", "max"], "*": "count"}처럼
+    지정하고 group_by가 있으면 그룹별로 계산합니다 (count/sum/mean/min/max/var/std).
+    메모리 캐시나 컬럼형 사이드카가 있으면 그것을, 없으면 CSV를 청크 단위로 읽으며,
+    정렬/집계가 없으면 limit개를 채우는 즉시 읽기를 멈춥니다.
+    """
+    def work(progress):
+        frame, info = query_csv(
+            path, delimiter=delimiter, columns=columns, where=where, group_by=group_by,
+            aggregates=aggregates, order_by=order_by, descending=descending,
+            limit=limit, chunksize=chunksize, progress=progress
         )
+        return build_response(info, {"rows": frame}, response_format)
+    return await run_tool('query_data', work, ctx)
 
-    # 박스 플롯 - 세 번째 서브플롯 (2,1)
-    for i, col in enumerate(numeric_cols):
-        fig.add_trace(
-            go.Box(y=df[col], name=col),
-            row=2, col=1
-        )
+@mcp.tool('correlation_analysis', "대규모 상관관계 분석 (강한 쌍 / 전체 행렬 파일)")
+@instrument('correlation_analysis')
+async def correlation_analysis(
+    path: str,
+    delimiter: str = ",",
+    top_k: int = 20,
+    threshold: float = None,
+    sample_rows: int = None,
+    columns: list[str] = None,
+    matrix_path: str = None,
+    block_size: int = 1024,
+    ctx: Context = None
+) -> dict:
+    """수치형 컬럼 간 피어슨 상관계수를 블록 단위로 계산하고 강한 쌍만 반환합니다
+
+    표준화한 float32 데이터를 block_size개 컬럼씩 행렬곱하므로 컬럼이 수천 개여도
+    빠르고 메모리가 일정합니다. threshold를 주면 |r|이 그 이상인 쌍만, top_k를 주면
+    |r|이 큰 순서로 최대 top_k개를 반환합니다 (top_k=0이면 개수 제한 없음, 이때는
+    쌍이 컬럼 수의 제곱만큼 늘어나지 않도록 threshold를 함께 지정해야 함).
+    sample_rows를 주면 행을 무작위로 샘플링해 계산하고, matrix_path를 주면 전체
+    상관행렬을 float32 .npy 파일(컬럼 순서는 .columns.json)로 저장합니다.
+    """
+    if not top_k and threshold is None:
+        raise ValueError("top_k=0(개수 제한 없음)은 threshold와 함께 지정하세요")
 
-    # 상관관계 히트맵 - 네 번째 서브플롯 (2,2) (parcoords 대신 사용)
-    if len(numeric_cols) >= 2:
-        corr_matrix = df[numeric_cols].corr()
-        fig.add_trace(
-            go.Heatmap(
-                z=corr_matrix.values,
-                x=corr_matrix.columns,
-                y=corr_matrix.index,
-                colorscale='Viridis',
-                showscale=True
-            ),
-            row=2, col=2
+    def work(progress):
+        df = load_dataframe(path, delimiter, columns=columns, progress=progress)
+        return correlation_pairs(
+            df, top_k=top_k or None, threshold=threshold, sample_rows=sample_rows,
+            block_size=block_size, matrix_path=matrix_path
         )
+    return await run_tool('correlation_analysis', work, ctx)
 
-    # 레이아웃 업데이트
-    fig.update_layout(height=800, width=1000, title_text="EDA 시각화")
-    
-    # 결과 저장
+def _density_sample(x, y, max_points, grid_size=200, seed=0):
+    """
+    밀도를 보존하는 산점도 다운샘플링
+
+    2차원 격자의 칸마다 같은 개수까지만 뽑아, 점이 드문 영역과 이상치는 남기고
+    밀집 영역만 줄입니다. 반환값은 선택된 행의 위치 인덱스입니다.
+    """
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(valid) <= max_points:
+        return valid
+    rng = np.random.default_rng(seed)
+    valid = rng.permutation(valid)
+    xs, ys = x[valid], y[valid]
+
+    def bucket(values):
+        low, high = values.min(), values.max()
+        if high == low:
+            return np.zeros(len(values), dtype=np.int64)
+        return np.minimum(((values - low) / (high - low) * grid_size).astype(np.int64), grid_size - 1)
+
+    cells = bucket(xs) * grid_size + bucket(ys)
+    # 무작위 순서 기준으로 칸 안에서의 순번을 매겨 칸마다 quota개까지 선택
+    rank = pd.Series(cells).groupby(cells).cumcount().to_numpy()
+    counts = np.sort(np.bincount(cells))[::-1]
+    counts = counts[counts > 0]
+    # 전체가 max_points 이하가 되는 가장 큰 칸당 quota를 이분 탐색
+    low, high = 1, int(counts[0])
+    while low < high:
+        mid = (low + high + 1) // 2
+        if np.minimum(counts, mid).sum() <= max_points:
+            low = mid
+        else:
+            high = mid - 1
+    chosen = valid[rank < low]
+    # 칸 수 자체가 max_points보다 많으면 (무작위 순서이므로) 앞에서부터 자름
+    return np.sort(chosen[:max_points])
+
+
+def _histogram_trace(go, values, name, bins=50):
+    """히스토그램 구간을 서버에서 계산해 막대 그래프 트레이스로 반환합니다"""
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=bins)
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+        name=str(name), opacity=0.7
+    )
+
+
+def _box_trace(go, values, name):
+    """사분위수를 서버에서 계산해 집계값만 담은 박스 플롯 트레이스로 반환합니다"""
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return go.Box(name=str(name))
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    # 수염은 1.5 IQR 안의 실제 최소/최대값 (plotly 기본 규칙과 동일)
+    lower = values[values >= q1 - 1.5 * iqr].min()
+    upper = values[values <= q3 + 1.5 * iqr].max()
+    return go.Box(
+        x=[str(name)], q1=[q1], median=[median], q3=[q3],
+        lowerfence=[lower], upperfence=[upper], mean=[values.mean()],
+        name=str(name)
+    )
+
+
+@mcp.tool('visualize_data', "자동화된 EDA 시각화 생성")
+@instrument('visualize_data')
+async def visualize_data(
+    path: str,
+    delimiter: str = ",",
+    plot_type: str = "auto",
+    output_path: str = None,
+    large_mode: bool = None,
+    max_points: int = 50000,
+    ctx: Context = None
+) -> dict:
+    """CSV 파일을 읽고 시각화를 생성합니다
+
+    행 수가 max_points를 넘으면(또는 large_mode가 True이면) 대용량 모드로 그립니다.
+    산점도는 WebGL 트레이스와 밀도 보존 샘플링을, 히스토그램과 박스 플롯은 서버에서
+    계산한 집계값만 사용하므로 HTML 크기와 렌더링 시간이 행 수와 무관하게 일정합니다.
+    """
+    # 결과 저장 경로
     if output_path is None:
         # 임시 디렉토리에 저장
         temp_dir = tempfile.gettempdir()
         output_filename = "eda_plots.html"
         output_path = os.path.join(temp_dir, output_filename)
+
+    def work(progress):
+        nonlocal large_mode
+        df = load_dataframe(path, delimiter, progress=progress)
+        import plotly.express as px
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
+        if large_mode is None:
+            large_mode = len(df) > max_points
+
+        # 모든 서브플롯을 xy 타입으로 명시적으로 지정
+        fig = make_subplots(
+            rows=2, 
+            cols=2,
+            specs=[[{"type": "xy"}, {"type": "xy"}],
+                   [{"type": "xy"}, {"type": "xy"}]],
+            subplot_titles=["스캐터 플롯", "히스토그램", "박스 플롯", "상관관계 히트맵"]
+        )
+    
+        # 수치형 컬럼만 선택 (최대 3개)
+        numeric_cols = df.select_dtypes(include='number').columns[:3]
+    
+        # 스캐터 플롯 - 첫 번째 서브플롯 (1,1)
+        if len(numeric_cols) >= 2 and large_mode:
+            x = df[numeric_cols[0]].to_numpy(dtype=float)
+            y = df[numeric_cols[1]].to_numpy(dtype=float)
+            rows = _density_sample(x, y, max_points)
+            fig.add_trace(
+                go.Scattergl(x=x[rows], y=y[rows], mode='markers', marker=dict(size=3),
+                            name=f'{numeric_cols[0]} vs {numeric_cols[1]} (샘플 {len(rows):,}개)'),
+                row=1, col=1
+            )
+        elif len(numeric_cols) >= 2:
+            fig.add_trace(
+                go.Scatter(x=df[numeric_cols[0]], y=df[numeric_cols[1]], 
+                          mode='markers', name=f'{numeric_cols[0]} vs {numeric_cols[1]}'),
+                row=1, col=1
+            )
+
+        # 히스토그램 - 두 번째 서브플롯 (1,2)
+        for i, col in enumerate(numeric_cols):
+            if large_mode:
+                trace = _histogram_trace(go, df[col].to_numpy(dtype=float), col)
+            else:
+                trace = go.Histogram(x=df[col], name=col, opacity=0.7)
+            fig.add_trace(trace, row=1, col=2)
+        if large_mode:
+            fig.update_layout(barmode='overlay')
+
+        # 박스 플롯 - 세 번째 서브플롯 (2,1)
+        for i, col in enumerate(numeric_cols):
+            if large_mode:
+                trace = _box_trace(go, df[col].to_numpy(dtype=float), col)
+            else:
+                trace = go.Box(y=df[col], name=col)
+            fig.add_trace(trace, row=2, col=1)
+
+        # 상관관계 히트맵 - 네 번째 서브플롯 (2,2) (parcoords 대신 사용)
+        if len(numeric_cols) >= 2:
+            corr_matrix = df[numeric_cols].corr()
+            fig.add_trace(
+                go.Heatmap(
+                    z=corr_matrix.values,
+                    x=corr_matrix.columns,
+                    y=corr_matrix.index,
+                    colorscale='Viridis',
+                    showscale=True
+                ),
+                row=2, col=2
+            )
+
+        # 레이아웃 업데이트
+        fig.update_layout(height=800, width=1000, title_text="EDA 시각화")
     
-    try:
-        fig.write_html(output_path)
-        success = True
-        message = f"EDA 플롯이 {output_path} 파일로 저장되었습니다"
-    except Exception as e:
-        success = False
-        message = f"파일 저장 오류: {str(e)}"
+        # 결과 저장
+        progress(1, 2, "HTML 저장 중")
+        try:
+            fig.write_html(output_path)
+            success = True
+            message = f"EDA 플롯이 {output_path} 파일로 저장되었습니다"
+        except Exception as e:
+            success = False
+            message = f"파일 저장 오류: {str(e)}"
         
-    return {
-        "message": message,
-        "success": success,
-        "plots": output_path if success else None
-    }
+        return {
+            "message": message,
+            "success": success,
+            "plots": output_path if success else None,
+            "large_mode": large_mode
+        }
+    return await run_tool('visualize_data', work, ctx)
 
-@mcp.tool('advanced_visualization', "자동화 EDA 프로파일링 리포트 생성")
+@mcp.tool('advanced_visualization', "자동화 EDA 프로파일링 리포트 생성 (캐시/샘플링/백그라운드 작업)")
+@instrument('advanced_visualization')
 async def advanced_visualization(
     path: str,
     output_path: str = None,
     delimiter: str = ",",
     title: str = "자동화 EDA 리포트",
-    minimal: bool = True
+    minimal: bool = True,
+    sample_rows: int = None,
+    seed: int = 0,
+    use_cache: bool = True,
+    background: bool = False,
+    ctx: Context = None
 ) -> dict:
-    """pandas-profiling/ydata-profiling을 사용하여 CSV 파일의 고급 EDA 리포트를 생성합니다"""
-    # 프로파일링 라이브러리 임포트 시도
-    profiling_available = False
-    profiling_name = None
-    
-    try:
-        # 먼저 pandas_profiling 시도 (구 버전)
-        try:
-            from pandas_profiling import ProfileReport
-            profiling_name = "pandas-profiling"
-            profiling_available = True
-        except ImportError:
-            # 그 다음 ydata_profiling 시도 (새 버전)
-            try:
-                from ydata_profiling import ProfileReport
-                profiling_name = "ydata-profiling"
-                profiling_available = True
-            except ImportError:
-                profiling_available = False
-    except Exception:
-        profiling_available = False
-    
-    if not profiling_available:
-        return {
-            "message": "pandas-profiling 또는 ydata-profiling이 설치되어 있지 않습니다. 'pip install ydata-profiling'를 실행하여 설치하세요.",
-            "success": False
-        }
-    
-    # CSV 파일 로드
-    df = pd.read_csv(path, delimiter=delimiter)
-    
-    # 출력 경로 설정
-    if output_path is None:
-        temp_dir = tempfile.gettempdir()
-        output_filename = "profile_report.html"
-        output_path = os.path.join(temp_dir, output_filename)
-    else:
+    """
+    pandas-profiling/ydata-profiling을 사용하여 CSV 파일의 고급 EDA 리포트를 생성합니다
+
+    같은 내용의 파일과 옵션으로 만든 리포트는 캐시에서 바로 반환합니다.
+    sample_rows를 지정하면 행이 그보다 많을 때 무작위 표본으로 리포트를 만들고,
+    background가 True이면 작업 id를 바로 반환하므로 report_status로 결과를 조회합니다.
+    """
+    # 출력 경로 설정 (없으면 리포트 캐시 파일 경로를 그대로 반환)
+    if output_path is not None and not output_path.lower().endswith('.html'):
         # 확장자가 .html이 아니면 추가
-        if not output_path.lower().endswith('.html'):
-            output_path += '.html'
-    
-    try:
-        # 프로파일 리포트 생성
-        profile = ProfileReport(df, title=title, minimal=minimal)
-        
-        # 결과를 HTML 파일로 저장
-        profile.to_file(output_path)
-        
+        output_path += '.html'
+
+    def work(progress):
+        return generate_report(
+            path, delimiter=delimiter, title=title, minimal=minimal,
+            sample_rows=sample_rows, seed=seed, output_path=output_path,
+            use_cache=use_cache, progress=progress
+        )
+
+    if background:
+        job_id = submit_job('advanced_visualization', work)
         return {
-            "message": f"{profiling_name} EDA 리포트가 {output_path}에 성공적으로 저장되었습니다",
+            "message": "리포트 생성 작업을 시작했습니다. report_status 도구로 상태와 결과를 조회하세요",
             "success": True,
-            "report_path": output_path
-        }
-    except Exception as e:
-        return {
-            "message": f"리포트 생성 중 오류가 발생했습니다: {str(e)}",
-            "success": False
+            "job_id": job_id,
+            "status": "queued"
         }
+    return await run_tool('advanced_visualization', work, ctx)
+
+@mcp.tool('report_status', "백그라운드 리포트 작업 상태 조회/취소")
+@instrument('report_status')
+async def report_status(job_id: str = None, cancel: bool = False) -> dict:
+    """
+    advanced_visualization(background=True) 작업의 상태를 조회합니다
+
+    status는 queued/running/done/failed/cancelled 중 하나이며, done이면 result에
+    리포트 경로가 들어 있습니다. job_id가 없으면 전체 작업 목록을 반환합니다.
+    cancel이 True이면 작업을 취소합니다.
+    """
+    if cancel:
+        if job_id is None:
+            raise ValueError("취소할 job_id를 지정하세요")
+        cancel_job(job_id)
+    if job_id is None:
+        return job_status()
+    status = job_status(job_id)
+    if status is None:
+        return {"job_id": job_id, "status": "unknown", "message": "작업을 찾을 수 없습니다"}
+    return status
 
 @mcp.tool('clean_data', "자동화된 데이터 클리닝 수행")
+@instrument('clean_data')
 async def clean_data(
     path: str,
     output_path: str,
     delimiter: str = ",",
-    missing_threshold: float = 0.3
+    missing_threshold: float = 0.3,
+    streaming: bool = None,
+    chunksize: int = 100000,
+    ctx: Context = None
 ) -> dict:
-    """CSV 파일을 읽고 데이터 클리닝을 수행한 후 결과를 저장합니다"""
-    df = pd.read_csv(path, delimiter=delimiter)
-    
-    # 결측치 처리
-    missing_percent = df.isnull().mean()
-    cols_to_drop = missing_percent[missing_percent > missing_threshold].index
-    df = df.drop(columns=cols_to_drop)
-
-    # 수치형 데이터 보간
-    num_cols = df.select_dtypes(include='number').columns
-    df[num_cols] = df[num_cols].fillna(df[num_cols].median())
-
-    # 범주형 데이터 처리
-    cat_cols = df.select_dtypes(include='object').columns
-    df[cat_cols] = df[cat_cols].fillna(df[cat_cols].mode().iloc[0])
-
-    # 이상치 제거
-    z_scores = (df[num_cols] - df[num_cols].mean())/df[num_cols].std()
-    df = df[(z_scores.abs() < 3).all(axis=1)]
-
-    # 결과를 CSV 파일로 저장
-    df.to_csv(output_path, index=False)
-
-    return {
-        "message": f"클리닝된 데이터가 {output_path}에 저장되었습니다",
-        "rows_before": len(df),
-        "columns_dropped": cols_to_drop.tolist()
-    }
+    """CSV 파일을 읽고 데이터 클리닝을 수행한 후 결과를 저장합니다
+
+    1단계에서 결측 비율/중앙값/최빈값/평균/표준편차로 클리닝 계획을 만들고, 2단계에서
+    결측 컬럼 제거, 보간, 이상치(|z| >= 3) 제거를 적용합니다.
+    streaming이 True이면 두 단계 모두 chunksize행씩 읽고 결과를 바로 파일에 이어 쓰므로
+    메모리가 청크 크기로 제한됩니다 (보간용 중앙값은 근사값).
+    지정하지 않으면 describe_data와 같은 기준으로 자동 선택합니다.
+    """
+    if streaming is None:
+        streaming = (
+            DATASET_CACHE.peek(path, delimiter) is None
+            and os.path.getsize(path) >= STREAMING_THRESHOLD_BYTES
+        )
+
+    def work(progress):
+        if streaming:
+            plan, rows_after = clean_csv_streaming(
+                path, output_path, delimiter, missing_threshold, chunksize, progress
+            )
+        else:
+            df = with_original_dates(load_dataframe(path, delimiter, progress=progress),
+                                     path, delimiter)
+            plan = plan_from_frame(df, missing_threshold)
+            df = apply_plan(df, plan)
+            df.to_csv(output_path, index=False)
+            rows_after = len(df)
+
+        result = {
+            "message": f"클리닝된 데이터가 {output_path}에 저장되었습니다",
+            "rows_before": plan["rows"],
+            "rows_after": rows_after,
+            "columns_dropped": plan["drop"],
+            "streaming": streaming
+        }
+        if plan.get("mixed_columns"):
+            result["warnings"] = [
+                f"'{col}' 컬럼은 숫자와 문자가 섞여 있어 범주형(최빈값 보간)으로 처리했습니다"
+                for col in plan["mixed_columns"]
+            ]
+        return result
+    return await run_tool('clean_data', work, ctx)
+
+@mcp.tool('batch_profile', "디렉토리/glob 단위 CSV 일괄 프로파일링")
+@instrument('batch_profile')
+async def batch_profile(
+    target: str,
+    delimiter: str = ",",
+    pattern: str = "*.csv",
+    recursive: bool = True,
+    max_files: int = 500,
+    workers: int = None,
+    force: bool = False,
+    detail: bool = False,
+    ctx: Context = None
+) -> dict:
+    """디렉토리나 glob 패턴에 해당하는 CSV를 병렬로 프로파일링하고 통합 요약을 반환합니다
+
+    파일마다 스트리밍 집계를 별도 프로세스에서 실행하고 결과를 저장해 두므로,
+    다음 실행에서는 바뀌지 않은 파일을 다시 읽지 않습니다 (force=True면 모두 다시 집계).
+    detail이 True이면 파일마다 컬럼별 기술 통계 전체를 포함합니다.
+    """
+    paths = expand_paths(target, pattern, recursive)
+    if not paths:
+        return {"message": f"{target}에서 {pattern}에 해당하는 파일을 찾지 못했습니다", "totals": {"files": 0}}
+    truncated = len(paths) > max_files
+    paths = paths[:max_files]
+
+    def work(progress):
+        profiles, reused, errors = profile_files(
+            paths, delimiter, workers=workers, force=force, progress=progress
+        )
+        root = target if os.path.isdir(target) else None
+        result = consolidate(paths, profiles, reused, errors, root=root, detail=detail)
+        if truncated:
+            result["message"] = f"파일이 많아 앞의 {max_files}개만 프로파일링했습니다"
+        return result
+    return await run_tool('batch_profile', work, ctx)
+
+@mcp.tool('memory_report', "컬럼별 타입 최적화와 메모리 절감량 조회")
+@instrument('memory_report')
+async def memory_report_tool(
+    path: str,
+    delimiter: str = ",",
+    ctx: Context = None
+) -> dict:
+    """데이터셋을 로드하고 컬럼별 원래 타입, 변환된 타입, 절감한 메모리를 반환합니다"""
+    def work(progress):
+        return {"memory": memory_report(path, delimiter, progress)}
+    return await run_tool('memory_report', work, ctx)
+
+@mcp.tool('fetch_page', "페이지로 나뉜 결과의 다음 페이지 조회")
+@instrument('fetch_page')
+async def fetch_page_tool(
+    cursor: str
+) -> dict:
+    """describe_data 등이 반환한 next_cursor로 같은 섹션의 다음 페이지를 반환합니다"""
+    return fetch_page(cursor)
+
+@mcp.tool('cache_stats', "데이터셋 캐시 상태 조회")
+@instrument('cache_stats')
+async def cache_stats(
+    clear: bool = False
+) -> dict:
+    """로드된 데이터셋 캐시의 히트/미스, 메모리 사용량을 반환합니다"""
+    stats = DATASET_CACHE.stats()
+    if clear:
+        DATASET_CACHE.clear()
+        stats["cleared"] = True
+    return {"cache": stats}
+
+@mcp.tool('server_metrics', "도구별 지연 시간/메모리 계측 요약 조회")
+async def server_metrics(
+    tool: str = None,
+    reset: bool = False,
+    trace_path: str = None
+) -> dict:
+    """
+    도구 호출별 wall/CPU 시간, 메모리, 입출력 크기의 p50/p95/p99를 반환합니다
+
+    trace_path를 지정하면 이후 호출을 해당 파일에 JSONL로 기록합니다
+    (빈 문자열이면 기록을 끔). reset이 True이면 요약을 반환한 뒤 기록을 지웁니다.
+    """
+    return METRICS.report(tool, reset, trace_path)
 
 if __name__ == "__main__":
     print("CSV EDA MCP 서버 시작...")
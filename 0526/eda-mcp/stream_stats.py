@@ -0,0 +1,383 @@
+"""
+메모리를 파일 크기와 무관하게 유지하는 스트리밍(청크) 기술 통계
+
+CSV를 청크 단위로 읽으면서 병합 가능한(mergeable) 집계만 유지합니다.
+
+- 수치형: 개수, 평균/분산(Welford + Chan 병합), 최소/최대, 분위수 스케치(KLL)
+- 범주형: 개수, 고유값 수(HyperLogLog), 최빈값/빈도(Misra-Gries top-k)
+- 상관관계: 쌍별 결측을 제외한 합계 행렬로 계산하는 스트리밍 공분산
+
+청크별 집계끼리 merge할 수 있으므로 병렬 처리나 증분 갱신에도 사용할 수 있습니다.
+분위수, 고유값 수, 최빈값 빈도는 데이터가 스케치 용량을 넘으면 근사값입니다.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+DESCRIBE_NUMERIC_KEYS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+DESCRIBE_OBJECT_KEYS = ["count", "unique", "top", "freq"]
+
+
+class QuantileSketch:
+    """
+    병합 가능한 분위수 스케치 (KLL 방식의 단순화 버전)
+
+    레벨 h의 항목은 원본 2^h개를 대표하며, 레벨이 k개를 넘으면 정렬 후 절반만
+    다음 레벨로 올립니다. 전체 데이터가 k개 이하이면 정확한 분위수를 반환합니다.
+
+    Parameters:
+        k (int): 레벨별 버퍼 크기 (클수록 정확하고 메모리 사용 증가)
+    """
+
+    def __init__(self, k=2048, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values):
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+
+    def merge(self, other):
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                # 홀수 개면 마지막 하나는 현재 레벨에 남김
+                even = len(level) - len(level) % 2
+                offset = int(self._rng.integers(2))
+                promoted = level[offset:even:2]
+                self.levels[h] = level[even:]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantiles(self, qs):
+        if len(self.levels) == 1:
+            if not len(self.levels[0]):
+                return [float("nan")] * len(qs)
+            return [float(v) for v in np.quantile(self.levels[0], qs)]
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)
+        ])
+        order = np.argsort(values)
+        values, weights = values[order], weights[order]
+        cumulative = np.cumsum(weights) - weights / 2
+        return [float(v) for v in np.interp(np.asarray(qs) * weights.sum(), cumulative, values)]
+
+
+class HyperLogLog:
+    """
+    병합 가능한 고유값 수 추정기
+
+    Parameters:
+        p (int): 레지스터 비트 수 (2^p개 레지스터, 표준오차 약 1.04/sqrt(2^p))
+    """
+
+    def __init__(self, p=14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, series):
+        series = series.dropna()
+        if not len(series):
+            return
+        hashes = pd.util.hash_pandas_object(series, index=False).to_numpy(np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # 남은 비트에서 첫 1비트의 위치(선행 0 개수 + 1)
+        bit_length = np.frexp(rest.astype(float))[1]
+        rank = (64 - self.p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        m = len(self.registers)
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / np.sum(2.0 ** -self.registers.astype(float))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # 작은 범위 보정 (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class FrequentItems:
+    """
+    병합 가능한 빈발 항목 카운터 (Misra-Gries)
+
+    고유값이 capacity 이하이면 정확한 빈도를, 넘으면 하한값을 유지합니다.
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.counts = {}
+        self.approximate = False
+
+    def update(self, series):
+        self._add(series.dropna().value_counts(sort=False).items())
+
+    def merge(self, other):
+        self._add(other.counts.items())
+        self.approximate = self.approximate or other.approximate
+
+    def _add(self, items):
+        counts = self.counts
+        for value, count in items:
+            counts[value] = counts.get(value, 0) + int(count)
+        if len(counts) > self.capacity:
+            threshold = sorted(counts.values(), reverse=True)[self.capacity]
+            self.counts = {v: c - threshold for v, c in counts.items() if c > threshold}
+            self.approximate = True
+
+    def top(self):
+        if not self.counts:
+            return float("nan"), float("nan")
+        value = max(self.counts, key=self.counts.get)
+        return value, self.counts[value]
+
+
+class NumericColumn:
+    """수치형 컬럼의 개수/평균/분산/최소/최대/분위수 집계"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+
+    def update(self, series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        other = NumericColumn()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.sketch.update(values)
+        self._merge_moments(other)
+
+    def merge(self, other):
+        self._merge_moments(other)
+        self.sketch.merge(other.sketch)
+
+    def _merge_moments(self, other):
+        if not other.count:
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def describe(self):
+        if not self.count:
+            return {key: (0 if key == "count" else float("nan")) for key in DESCRIBE_NUMERIC_KEYS}
+        q25, q50, q75 = self.sketch.quantiles([0.25, 0.5, 0.75])
+        return {
+            "count": float(self.count),
+            "mean": self.mean,
+            "std": math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float("nan"),
+            "min": self.min,
+            "25%": q25,
+            "50%": q50,
+            "75%": q75,
+            "max": self.max,
+        }
+
+
+class ObjectColumn:
+    """범주형(문자열/불리언) 컬럼의 개수/고유값 수/최빈값 집계"""
+
+    def __init__(self):
+        self.count = 0
+        self.distinct = HyperLogLog()
+        self.frequent = FrequentItems()
+
+    def update(self, series):
+        self.count += int(series.notna().sum())
+        self.distinct.update(series)
+        self.frequent.update(series)
+
+    def merge(self, other):
+        self.count += other.count
+        self.distinct.merge(other.distinct)
+        self.frequent.merge(other.frequent)
+
+    def describe(self):
+        top, freq = self.frequent.top()
+        unique = self.distinct.count()
+        if not self.frequent.approximate:
+            # 정확한 카운터가 있으면 고유값 수도 정확하게
+            unique = len(self.frequent.counts)
+        return {"count": float(self.count), "unique": unique, "top": top, "freq": freq}
+
+
+class StreamingCorrelation:
+    """
+    쌍별 결측 제외(pairwise complete) 상관계수를 위한 스트리밍 합계 행렬
+
+    df.corr()와 같이 두 컬럼이 모두 값이 있는 행만 사용합니다. 수치 안정성을
+    위해 첫 청크의 평균만큼 이동(shift)한 값으로 합계를 누적합니다.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.shift = None
+        self.n = np.zeros((size, size))
+        self.sx = np.zeros((size, size))
+        self.sxx = np.zeros((size, size))
+        self.sxy = np.zeros((size, size))
+
+    def update(self, frame):
+        values = frame[self.columns].to_numpy(dtype=float, na_value=np.nan)
+        if self.shift is None:
+            self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(self.columns))
+        values = values - self.shift
+        mask = ~np.isnan(values)
+        x = np.where(mask, values, 0.0)
+        m = mask.astype(float)
+        # sx[i, j] = 열 i와 j가 모두 있는 행에서 열 i 값의 합
+        self.n += m.T @ m
+        self.sx += x.T @ m
+        self.sxx += (x * x).T @ m
+        self.sxy += x.T @ x
+
+    def merge(self, other):
+        self.n += other.n
+        self.sx += other.sx
+        self.sxx += other.sxx
+        self.sxy += other.sxy
+
+    def correlation(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = self.n * self.sxy - self.sx * self.sx.T
+            var_x = self.n * self.sxx - self.sx ** 2
+            var_y = var_x.T
+            corr = cov / np.sqrt(var_x * var_y)
+        corr[self.n < 2] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        diagonal = np.diag(corr).copy()
+        np.fill_diagonal(corr, np.where(np.isnan(diagonal), np.nan, 1.0))
+        return {
+            col: {other: float(corr[i, j]) for j, other in enumerate(self.columns)}
+            for i, col in enumerate(self.columns)
+        }
+
+
+class StreamingDescriber:
+    """
+    청크 단위로 describe(include='all')와 corr(numeric_only=True)를 계산합니다
+
+    컬럼 타입은 첫 청크 기준으로 정하며, 이후 청크에서 수치형 컬럼에 숫자가
+    아닌 값이 나오면 결측으로 처리하고 coerced_columns에 기록합니다.
+    """
+
+    def __init__(self):
+        self.columns = None
+        self.stats = {}
+        self.correlation = None
+        self.rows = 0
+        self.coerced_columns = set()
+
+    def _init_columns(self, chunk):
+        self.columns = list(chunk.columns)
+        numeric = []
+        for col in self.columns:
+            dtype = chunk[col].dtype
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+                self.stats[col] = NumericColumn()
+                numeric.append(col)
+            else:
+                self.stats[col] = ObjectColumn()
+        corr_columns = [
+            col for col in self.columns
+            if col in numeric or pd.api.types.is_bool_dtype(chunk[col].dtype)
+        ]
+        self.correlation = StreamingCorrelation(corr_columns)
+
+    def update(self, chunk):
+        if self.columns is None:
+            self._init_columns(chunk)
+        for col in self.correlation.columns:
+            if not (pd.api.types.is_numeric_dtype(chunk[col].dtype)
+                    or pd.api.types.is_bool_dtype(chunk[col].dtype)):
+                chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+                self.coerced_columns.add(col)
+        for col, stat in self.stats.items():
+            stat.update(chunk[col])
+        self.correlation.update(chunk)
+        self.rows += len(chunk)
+
+    def merge(self, other):
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return
+        for col, stat in self.stats.items():
+            stat.merge(other.stats[col])
+        self.correlation.merge(other.correlation)
+        self.rows += other.rows
+        self.coerced_columns |= other.coerced_columns
+
+    def describe(self):
+        """
+        df.describe(include='all').to_dict()와 같은 모양의 통계를 반환합니다
+
+        수치형과 범주형이 섞여 있으면 pandas처럼 모든 컬럼에 모든 키를 채우고
+        해당하지 않는 값은 NaN으로 둡니다.
+        """
+        has_numeric = any(isinstance(s, NumericColumn) for s in self.stats.values())
+        has_object = any(isinstance(s, ObjectColumn) for s in self.stats.values())
+        keys = []
+        if has_object:
+            keys += DESCRIBE_OBJECT_KEYS
+        if has_numeric:
+            keys += [k for k in DESCRIBE_NUMERIC_KEYS if k not in keys]
+        result = {}
+        for col, stat in self.stats.items():
+            values = stat.describe()
+            result[col] = {key: values.get(key, float("nan")) for key in keys}
+        return result
+
+
+def describe_csv(path, delimiter=",", chunksize=100_000, progress=None):
+    """
+    CSV를 청크 단위로 읽어 (기술 통계, 상관관계, 집계 객체)를 반환합니다
+
+    Parameters:
+        path (str): CSV 파일 경로
+        delimiter (str): 구분자
+        chunksize (int): 한 번에 읽을 행 수 (최대 메모리 사용량을 결정)
+        progress (callable): 청크마다 progress(처리한 행 수, None, 메시지)로 호출
+    """
+    describer = StreamingDescriber()
+    for chunk in pd.read_csv(path, delimiter=delimiter, chunksize=chunksize):
+        describer.update(chunk)
+        if progress is not None:
+            progress(describer.rows, None, f"{describer.rows}행 집계")
+    if describer.columns is None:
+        return {}, {}, describer
+    return describer.describe(), describer.correlation.correlation(), describer
@@ -0,0 +1,254 @@
+"""
+EDA 서버 도구의 블로킹 작업을 워커 스레드 풀에서 실행하는 모듈
+
+도구 함수는 async def지만 CSV 파싱, 통계, 시각화, 프로파일링은 동기 코드이므로
+이벤트 루프에서 그대로 실행하면 다른 요청이 모두 멈춥니다. run_tool은 작업을
+스레드 풀로 넘기고, 도구별 동시 실행 수 제한, 제한 시간, 취소, MCP 진행 상황
+알림을 처리합니다.
+
+프로세스 풀 대신 스레드 풀을 사용하는 이유는 데이터셋 캐시(DATASET_CACHE)를
+프로세스 안에서 공유해야 하기 때문입니다 (pandas/numpy 연산과 CSV 파싱은 대부분
+GIL을 놓습니다). 실행 중인 스레드는 강제로 멈출 수 없으므로, 취소나 시간 초과 시
+작업이 다음 진행 상황 보고 지점에서 ToolCancelled로 중단됩니다. 보고 지점이 없는
+작업(프로파일링, 차트 생성)은 끝까지 실행되므로, 도구별 동시 실행 슬롯은 호출이
+아니라 워커 스레드의 작업이 실제로 끝날 때 반납합니다.
+"""
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 무거운 도구를 실행하는 스레드 수
+WORKERS = int(os.environ.get("EDA_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 가벼운 도구(load_csv 등) 전용 스레드 수 - 무거운 작업이 풀을 채워도 응답하도록 분리
+LIGHT_WORKERS = int(os.environ.get("EDA_LIGHT_WORKERS", "2"))
+LIGHT_TOOLS = {"load_csv"}
+
+# 도구별 최대 동시 실행 수 (초과한 호출은 대기)
+TOOL_CONCURRENCY = {
+    "advanced_visualization": 1,
+    "batch_profile": 1,
+    "visualize_data": 2,
+    "describe_data": 2,
+    "clean_data": 2,
+    "memory_report": 2,
+    "query_data": 4,
+    "load_csv": 4,
+}
+DEFAULT_CONCURRENCY = 2
+
+# 도구별 제한 시간(초) - EDA_TIMEOUT_<도구 이름 대문자> 환경 변수로 변경 (0이면 제한 없음)
+TOOL_TIMEOUTS = {
+    "advanced_visualization": 1800,
+    "batch_profile": 3600,
+    "load_csv": 120,
+}
+DEFAULT_TIMEOUT = float(os.environ.get("EDA_TOOL_TIMEOUT", "600"))
+
+# 진행 상황 알림 최소 간격(초)
+PROGRESS_INTERVAL = 0.5
+# 끝난 백그라운드 작업 상태를 보관할 최대 수
+MAX_FINISHED_JOBS = 100
+
+_POOL = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="eda-worker")
+_LIGHT_POOL = ThreadPoolExecutor(max_workers=LIGHT_WORKERS, thread_name_prefix="eda-light")
+_SEMAPHORES = {}
+_JOBS = OrderedDict()
+
+
+class ToolCancelled(Exception):
+    """취소되거나 제한 시간을 넘긴 작업을 워커 스레드 안에서 중단할 때 발생"""
+
+
+class Progress:
+    """
+    워커 스레드에서 호출하는 진행 상황 보고 함수
+
+    progress(done, total=None, message=None) 형태로 호출하며, 작업이 취소되었으면
+    ToolCancelled를 발생시킵니다. 알림은 PROGRESS_INTERVAL마다 한 번만 보냅니다.
+    """
+
+    def __init__(self, loop, ctx, listener=None):
+        self._loop = loop
+        self._ctx = ctx
+        self._listener = listener
+        self._last = 0.0
+        self.cancelled = threading.Event()
+
+    def __call__(self, done, total=None, message=None):
+        if self.cancelled.is_set():
+            raise ToolCancelled("작업이 취소되었습니다")
+        if self._listener is not None:
+            self._listener(done, total, message)
+        if self._ctx is None:
+            return
+        now = time.monotonic()
+        if now - self._last < PROGRESS_INTERVAL and (total is None or done < total):
+            return
+        self._last = now
+        asyncio.run_coroutine_threadsafe(self._send(done, total, message), self._loop)
+
+    async def _send(self, done, total, message):
+        try:
+            await self._ctx.report_progress(done, total, message)
+        except Exception:
+            # 요청 컨텍스트가 없거나 세션이 닫혔으면 알림만 건너뜀
+            pass
+
+
+def _timeout_for(name):
+    value = os.environ.get(f"EDA_TIMEOUT_{name.upper()}")
+    timeout = float(value) if value is not None else TOOL_TIMEOUTS.get(name, DEFAULT_TIMEOUT)
+    return timeout or None
+
+
+def _semaphore(name):
+    # 세마포어는 처음 사용하는 이벤트 루프에 묶이므로 루프별로 만듦
+    key = (id(asyncio.get_running_loop()), name)
+    if key not in _SEMAPHORES:
+        _SEMAPHORES[key] = asyncio.Semaphore(TOOL_CONCURRENCY.get(name, DEFAULT_CONCURRENCY))
+    return _SEMAPHORES[key]
+
+
+async def run_tool(name, func, ctx=None, timeout=None, listener=None):
+    """
+    func(progress)를 워커 스레드에서 실행하고 결과를 반환하는 함수
+
+    Parameters:
+        name (str): 도구 이름 (동시 실행 수/제한 시간/풀 선택 기준)
+        func (callable): Progress 하나를 인자로 받는 동기 함수
+        ctx (Context): 진행 상황 알림을 보낼 MCP 요청 컨텍스트 (없으면 알림 없음)
+        timeout (float): 제한 시간(초), 없으면 도구별 기본값
+        listener (callable): 진행 상황 보고마다 listener(done, total, message)로 호출
+
+    Returns:
+        func의 반환값
+    """
+    loop = asyncio.get_running_loop()
+    progress = Progress(loop, ctx, listener)
+    timeout = timeout if timeout is not None else _timeout_for(name)
+    pool = _LIGHT_POOL if name in LIGHT_TOOLS else _POOL
+
+    semaphore = _semaphore(name)
+    await semaphore.acquire()
+
+    def release(_):
+        # 취소/시간 초과 후에도 스레드가 끝날 때까지 슬롯을 잡고 있도록 스레드 쪽에서 반납
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫혔으면 반납할 대상도 없음
+            pass
+
+    try:
+        work = pool.submit(func, progress)
+    except BaseException:
+        semaphore.release()
+        raise
+    work.add_done_callback(release)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(work), timeout)
+    except asyncio.TimeoutError:
+        progress.cancelled.set()
+        raise TimeoutError(f"{name} 도구가 제한 시간({timeout:g}초)을 넘겨 취소되었습니다")
+    except asyncio.CancelledError:
+        # 클라이언트가 요청을 취소하면 워커도 다음 보고 지점에서 멈추게 함
+        progress.cancelled.set()
+        raise
+
+
+def submit_job(name, func, timeout=None):
+    """
+    func(progress)를 백그라운드 작업으로 등록하고 바로 작업 id를 반환하는 함수
+
+    작업은 run_tool과 같은 풀/동시 실행 수/제한 시간으로 실행되며, 상태는
+    job_status(job_id)로 조회합니다. 실행 중인 이벤트 루프 안에서 호출해야 합니다.
+
+    Parameters:
+        name (str): 도구 이름
+        func (callable): Progress 하나를 인자로 받는 동기 함수
+        timeout (float): 제한 시간(초), 없으면 도구별 기본값
+
+    Returns:
+        str: 작업 id
+    """
+    job_id = uuid.uuid4().hex[:12]
+    job = {
+        "job_id": job_id,
+        "tool": name,
+        "status": "queued",
+        "progress": None,
+        "submitted_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "result": None,
+        "error": None,
+    }
+
+    def listener(done, total, message):
+        job["progress"] = {"done": done, "total": total, "message": message}
+
+    def run(progress):
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        return func(progress)
+
+    async def runner():
+        try:
+            job["result"] = await run_tool(name, run, timeout=timeout, listener=listener)
+            job["status"] = "done"
+        except asyncio.CancelledError:
+            job["status"] = "cancelled"
+        except Exception as e:
+            job["status"] = "failed"
+            job["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            job["finished_at"] = time.time()
+            _prune_jobs()
+
+    job["_task"] = asyncio.get_running_loop().create_task(runner())
+    _JOBS[job_id] = job
+    return job_id
+
+
+def _prune_jobs():
+    finished = [job_id for job_id, job in _JOBS.items() if job["finished_at"] is not None]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _JOBS[job_id]
+
+
+def job_status(job_id=None):
+    """
+    백그라운드 작업 상태를 조회하는 함수
+
+    Parameters:
+        job_id (str): 작업 id (없으면 전체 작업 목록)
+
+    Returns:
+        dict: 작업 상태 (status: queued/running/done/failed/cancelled, 없으면 None)
+            job_id가 없으면 {"jobs": [결과를 뺀 상태 목록]}
+    """
+    def public(job, with_result=True):
+        state = {k: v for k, v in job.items() if not k.startswith("_")}
+        if not with_result:
+            state.pop("result")
+        end = job["finished_at"] or time.time()
+        state["elapsed"] = round(end - job["started_at"], 3) if job["started_at"] else None
+        return state
+
+    if job_id is None:
+        return {"jobs": [public(job, with_result=False) for job in _JOBS.values()]}
+    job = _JOBS.get(job_id)
+    return public(job) if job is not None else None
+
+
+def cancel_job(job_id):
+    """대기 중이거나 실행 중인 백그라운드 작업을 취소합니다 (취소 요청 여부 반환)"""
+    job = _JOBS.get(job_id)
+    if job is None or job["finished_at"] is not None:
+        return False
+    job["_task"].cancel()
+    return True
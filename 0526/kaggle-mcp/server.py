@@ -1,6 +1,7 @@
 from mcp.server.fastmcp import FastMCP
 import pandas as pd
 import os
+import sys
 import tempfile
 import json
 from typing import List, Optional, Dict, Any
@@ -8,12 +9,22 @@ import kaggle
 from kaggle.api.kaggle_api_extended import KaggleApi
 import argparse
 
+# 프로젝트 루트 디렉토리를 sys.path에 추가 (공용 lib 패키지)
+project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root_path not in sys.path:
+    sys.path.append(project_root_path)
+
+from lib.correlation import compact_correlation
+from lib.mcp_metrics import METRICS, instrument
+from lib.mcp_response import build_response, fetch_page
+
 mcp = FastMCP(
     name="kaggle-mcp-server",
     instructions="Kaggle API를 활용한 데이터셋 조회, 다운로드 및 분석을 수행하는 MCP 서버"
 )
 
 @mcp.tool('authenticate', "Kaggle API 인증")
+@instrument('authenticate')
 async def authenticate(
     kaggle_username: str,
     kaggle_key: str
@@ -38,6 +49,7 @@ async def authenticate(
         }
 
 @mcp.tool('list_datasets', "Kaggle 데이터셋 목록 조회")
+@instrument('list_datasets')
 async def list_datasets(
     search_query: str = "",
     max_results: int = 10,
@@ -89,6 +101,7 @@ async def list_datasets(
             "message": f"데이터셋 목록 조회 실패: {str(e)}"
         }
 @mcp.tool('dataset_info', "Kaggle 데이터셋 상세 정보 조회")
+@instrument('dataset_info')
 async def dataset_info(
     dataset_ref: str  # owner/dataset-name 형식
 ) -> dict:
@@ -152,6 +165,7 @@ async def dataset_info(
         }
 
 @mcp.tool('download_dataset', "Kaggle 데이터셋 다운로드")
+@instrument('download_dataset')
 async def download_dataset(
     dataset_ref: str,  # owner/dataset-name 형식
     output_path: str = None,
@@ -194,12 +208,17 @@ async def download_dataset(
         }
 
 @mcp.tool('preview_dataset', "Kaggle 데이터셋 미리보기")
+@instrument('preview_dataset')
 async def preview_dataset(
     dataset_ref: str,  # owner/dataset-name 형식
     file_name: str,
-    rows: int = 10
+    rows: int = 10,
+    response_format: str = "compact"
 ) -> dict:
-    """데이터셋의 특정 파일을 미리봅니다 (CSV 또는 다른 표 형식 파일을 지원)"""
+    """데이터셋의 특정 파일을 미리봅니다 (CSV 또는 다른 표 형식 파일을 지원)
+
+    표 형식 파일의 미리보기는 split 인코딩으로 반환합니다 ("dict"이면 기존 to_dict() 형식).
+    """
     try:
         api = KaggleApi()
         api.authenticate()
@@ -226,13 +245,13 @@ async def preview_dataset(
         # 파일 타입에 따른 처리
         if file_name.endswith('.csv'):
             df = pd.read_csv(file_path)
-            preview_data = df.head(rows).to_dict()
+            preview_data = df.head(rows)
             columns = df.columns.tolist()
             dtypes = df.dtypes.astype(str).to_dict()
             shape = df.shape
         elif file_name.endswith(('.xls', '.xlsx')):
             df = pd.read_excel(file_path)
-            preview_data = df.head(rows).to_dict()
+            preview_data = df.head(rows)
             columns = df.columns.tolist()
             dtypes = df.dtypes.astype(str).to_dict()
             shape = df.shape
@@ -241,18 +260,22 @@ async def preview_dataset(
             with open(file_path, 'r', encoding='utf-8') as f:
                 lines = [line.strip() for line in f.readlines()[:rows]]
             preview_data = {"lines": lines}
-            columns = []
-            dtypes = {}
-            shape = (len(lines), 0)
+            return {
+                "success": True,
+                "file_name": file_name,
+                "preview": preview_data,
+                "columns": [],
+                "dtypes": {},
+                "shape": (len(lines), 0)
+            }
         
-        return {
+        return build_response({
             "success": True,
             "file_name": file_name,
-            "preview": preview_data,
-            "columns": columns if hasattr(locals(), 'columns') else [],
-            "dtypes": dtypes if hasattr(locals(), 'dtypes') else {},
-            "shape": shape if hasattr(locals(), 'shape') else (0, 0)
-        }
+            "columns": columns,
+            "dtypes": dtypes,
+            "shape": shape
+        }, {"preview": preview_data}, response_format)
     except Exception as e:
         return {
             "success": False,
@@ -260,6 +283,7 @@ async def preview_dataset(
         }
 
 @mcp.tool('list_competitions', "Kaggle 대회 목록 조회")
+@instrument('list_competitions')
 async def list_competitions(
     search_query: str = "",
     category: str = "all",
@@ -297,18 +321,24 @@ async def list_competitions(
         }
 
 @mcp.tool('analyze_dataset', "다운로드된 CSV 데이터셋 분석")
+@instrument('analyze_dataset')
 async def analyze_dataset(
     file_path: str,
     delimiter: str = ",",
-    sample_size: int = 5
+    sample_size: int = 5,
+    response_format: str = "compact"
 ) -> dict:
-    """다운로드된 CSV 파일을 분석합니다"""
+    """다운로드된 CSV 파일을 분석합니다
+
+    샘플, 기술 통계, 상관행렬은 split 인코딩으로 반환하고, 행이 많은 섹션은
+    next_cursor로 fetch_page에서 이어 받습니다 ("dict"이면 기존 to_dict() 형식).
+    """
     try:
         # CSV 파일 로드
         df = pd.read_csv(file_path, delimiter=delimiter)
         
-        # 기본 통계
-        stats = df.describe(include='all').to_dict()
+        # 기본 통계 (컬럼 하나가 한 행)
+        stats = df.describe(include='all').T
         
         # 결측값 정보
         missing_values = df.isnull().sum().to_dict()
@@ -317,32 +347,60 @@ async def analyze_dataset(
         # 데이터 타입 정보
         dtypes = df.dtypes.astype(str).to_dict()
         
-        # 상관관계 (수치형 변수만)
+        # 상관관계 (수치형 변수만, 컬럼이 많으면 가장 강한 쌍만)
+        frames = {"statistics": stats}
+        result = {}
         try:
-            corr = df.corr(numeric_only=True).to_dict()
+            corr = compact_correlation(df)
+            if isinstance(corr, pd.DataFrame):
+                frames["correlation"] = corr
+            else:
+                result["correlation"] = corr
         except:
-            corr = {"message": "상관관계를 계산할 수 없습니다."}
+            result["correlation"] = {"message": "상관관계를 계산할 수 없습니다."}
         
-        return {
+        sample = build_response({}, {"sample": df.head(sample_size)}, response_format)["sample"]
+        result.update({
             "success": True,
             "file_info": {
                 "path": file_path,
                 "columns": df.columns.tolist(),
                 "shape": df.shape,
-                "sample": df.head(sample_size).to_dict(),
+                "sample": sample,
                 "dtypes": dtypes
             },
-            "statistics": stats,
             "missing_values": missing_values,
-            "missing_percent": missing_percent,
-            "correlation": corr
-        }
+            "missing_percent": missing_percent
+        })
+        return build_response(result, frames, response_format, row_keyed=("statistics",))
     except Exception as e:
         return {
             "success": False,
             "message": f"데이터셋 분석 실패: {str(e)}"
         }
 
+@mcp.tool('fetch_page', "페이지로 나뉜 결과의 다음 페이지 조회")
+@instrument('fetch_page')
+async def fetch_page_tool(
+    cursor: str
+) -> dict:
+    """analyze_dataset 등이 반환한 next_cursor로 같은 섹션의 다음 페이지를 반환합니다"""
+    return fetch_page(cursor)
+
+@mcp.tool('server_metrics', "도구별 지연 시간/메모리 계측 요약 조회")
+async def server_metrics(
+    tool: str = None,
+    reset: bool = False,
+    trace_path: str = None
+) -> dict:
+    """
+    도구 호출별 wall/CPU 시간, 메모리, 입출력 크기의 p50/p95/p99를 반환합니다
+
+    trace_path를 지정하면 이후 호출을 해당 파일에 JSONL로 기록합니다
+    (빈 문자열이면 기록을 끔). reset이 True이면 요약을 반환한 뒤 기록을 지웁니다.
+    """
+    return METRICS.report(tool, reset, trace_path)
+
 if __name__ == "__main__":
     # 명령줄 인수 파싱 추가
     parser = argparse.ArgumentParser(description="Kaggle MCP 서버")
@@ -1,7 +1,25 @@
-from typing import Any
+import os
+import sys
+from typing import Any, Callable, TypeVar
 import requests
 from fastmcp import FastMCP
 
+# 프로젝트 루트 디렉토리를 sys.path에 추가 (공용 lib 패키지)
+project_root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root_path not in sys.path:
+    sys.path.append(project_root_path)
+
+try:
+    from lib.mcp_metrics import METRICS, instrument
+except ImportError:
+    # Docker 이미지나 pip 설치처럼 저장소 밖에서 단독 실행하면 공용 lib이 없으므로 계측 없이 동작
+    METRICS = None
+
+    F = TypeVar("F", bound=Callable[..., Any])
+
+    def instrument(name: str | None = None, store: object = None) -> Callable[[F], F]:
+        return lambda func: func
+
 # FastMCP 서버 초기화
 mcp = FastMCP("weather")
 
@@ -38,6 +56,7 @@ def format_alert(feature: dict) -> str:
 
 
 @mcp.tool()
+@instrument()
 async def get_weather_alerts(state: str) -> str:
     """미국 주의 날씨 경보를 가져옵니다.
     
@@ -58,6 +77,7 @@ async def get_weather_alerts(state: str) -> str:
 
 
 @mcp.tool()
+@instrument()
 async def get_weather_forecast(latitude: float, longitude: float) -> str:
     """위치의 날씨 예보를 가져옵니다.
     
@@ -94,6 +114,22 @@ async def get_weather_forecast(latitude: float, longitude: float) -> str:
     return "\n---\n".join(forecasts)
 
 
+@mcp.tool()
+async def server_metrics(
+    tool: str | None = None, reset: bool = False, trace_path: str | None = None
+) -> dict:
+    """도구별 지연 시간/메모리 계측 요약(p50/p95/p99)을 가져옵니다.
+    
+    Args:
+        tool: 이 도구만 요약 (생략하면 전체)
+        reset: 요약을 반환한 뒤 기록을 지울지 여부
+        trace_path: 이후 호출을 JSONL로 기록할 파일 경로 (빈 문자열이면 기록을 끔)
+    """
+    if METRICS is None:
+        return {"message": "저장소의 lib/mcp_metrics.py를 찾을 수 없어 계측이 꺼져 있습니다.", "tools": {}}
+    return METRICS.report(tool, reset, trace_path)
+
+
 if __name__ == "__main__":
     # 서버 초기화 및 실행
     mcp.run(transport='stdio') 
\ No newline at end of file
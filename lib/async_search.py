@@ -0,0 +1,444 @@
+import asyncio
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+
+from elasticsearch import AsyncElasticsearch
+
+from lib.search import (
+    BULK_LOAD_SETTINGS,
+    DEFAULT_CONNECTIONS_PER_NODE,
+    AnalyzeResult,
+    _analyze_key,
+    _batch_options,
+    _build_analyze_body,
+    _bulk_actions,
+    _client_key,
+    _fill_chunk,
+    _finish_bulk,
+    _is_rejected,
+    _iter_bulk_chunks,
+    _lookup_chunk,
+    _lookup_search,
+    _next_chunk,
+    _original_settings,
+    _pit_body,
+    _record_bulk,
+    _search_body,
+    _split_bulk_items,
+    _with_aliases,
+    invalidate_index,
+)
+
+# lib.search의 asyncio 버전입니다. 같은 이름의 함수를 await로 호출하며,
+# 이벤트 루프를 막지 않으므로 MCP 서버처럼 여러 요청을 동시에 처리하는
+# 곳에서 클러스터 왕복 시간을 서로 겹칠 수 있습니다. 요청 본문 구성, 캐시 키,
+# 응답 처리는 lib.search의 함수를 그대로 사용하고 여기에는 await만 둡니다.
+
+# 이벤트 루프 -> {(hosts, 옵션): 비동기 클라이언트} 레지스트리
+# AsyncElasticsearch의 HTTP 세션은 생성된 이벤트 루프에 묶이므로 루프별로 분리하고,
+# 닫힌 루프의 클라이언트가 재사용되지 않도록 루프 객체를 약한 참조 키로 사용
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def get_async_client(
+    hosts="http://localhost:9200",
+    connections_per_node=DEFAULT_CONNECTIONS_PER_NODE,
+    **options
+):
+    """
+    공유(풀링) AsyncElasticsearch 클라이언트 반환 함수 (실행 중인 이벤트 루프 안에서 호출)
+
+    Parameters:
+        hosts (str or list): Elasticsearch 호스트
+        connections_per_node (int): 노드당 커넥션 풀 크기
+        **options: AsyncElasticsearch 생성자에 그대로 전달할 옵션
+
+    Returns:
+        AsyncElasticsearch: 현재 이벤트 루프의 공유 클라이언트
+    """
+    options["connections_per_node"] = connections_per_node
+    clients = _ASYNC_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    key = _client_key(hosts, options)
+    es = clients.get(key)
+    if es is None:
+        es = AsyncElasticsearch(hosts, **options)
+        clients[key] = es
+    return es
+
+
+async def close_async_clients():
+    """
+    레지스트리에 등록된 현재 이벤트 루프의 비동기 클라이언트를 닫는 함수
+
+    Returns:
+        int: 닫은 클라이언트 수
+    """
+    clients = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), {})
+    for es in clients.values():
+        await es.close()
+    return len(clients)
+
+
+def _resolve_client(client, hosts):
+    """명시적으로 전달된 클라이언트가 없으면 공유 비동기 클라이언트를 사용합니다"""
+    return client if client is not None else get_async_client(hosts)
+
+
+async def _call_cache(cache, func, *args):
+    """
+    AnalyzeCache를 사용하는 func를 호출합니다
+
+    디스크(SQLite) 계층이 있는 캐시는 조회/저장/커밋이 이벤트 루프를 막지 않도록
+    스레드에서 실행하고, 메모리 계층만 있으면 바로 실행합니다.
+    """
+    if cache is not None and cache.path:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+async def _write_targets(es, index_name):
+    """쓰기 시 무효화할 이름(index_name과 연결된 alias)을 반환합니다"""
+    try:
+        response = await es.indices.get_alias(index=index_name)
+    except Exception:
+        return index_name
+    return _with_aliases(index_name, dict(getattr(response, "body", response)))
+
+
+async def analyze_morph(
+    text,
+    analyzer=None,
+    tokenizer=None,
+    filters=None,
+    explain=False,
+    decompound_mode=None,
+    user_dictionary_rules=None,
+    index=None,
+    hosts="http://localhost:9200",
+    client=None,
+    cache=None
+):
+    """
+    Elasticsearch Nori 형태소 분석 함수 (비동기)
+
+    Parameters:
+        lib.search.analyze_morph와 같습니다.
+        client (AsyncElasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
+
+    Returns:
+        dict: 분석 결과(JSON)
+    """
+    key = None
+    if cache is not None:
+        key = _analyze_key(
+            text, analyzer, tokenizer, filters, explain,
+            decompound_mode, user_dictionary_rules, index
+        )
+        cached = await _call_cache(cache, cache.get, key)
+        if cached is not None:
+            return AnalyzeResult(cached)
+
+    es = _resolve_client(client, hosts)
+    body = _build_analyze_body(
+        text, analyzer, tokenizer, filters, explain,
+        decompound_mode, user_dictionary_rules
+    )
+
+    if index:
+        result = await es.indices.analyze(index=index, body=body)
+    else:
+        result = await es.indices.analyze(body=body)
+    if cache is not None:
+        await _call_cache(cache, cache.put, key, dict(getattr(result, "body", result)))
+    return result
+
+
+async def _analyze_chunk(es, texts, index, body_options, cache=None):
+    """문장 묶음을 한 번의 _analyze 요청으로 분석합니다 (캐시 히트 문장은 제외)"""
+    results, keys, missing = await _call_cache(
+        cache, _lookup_chunk, texts, index, body_options, cache
+    )
+    if missing:
+        batch = [texts[i] for i in missing]
+        body = _build_analyze_body(batch, **body_options)
+        if index:
+            result = await es.indices.analyze(index=index, body=body)
+        else:
+            result = await es.indices.analyze(body=body)
+        await _call_cache(
+            cache, _fill_chunk, results, keys, missing, batch, result["tokens"], cache
+        )
+    return results
+
+
+async def analyze_morph_batch(
+    texts,
+    analyzer=None,
+    tokenizer=None,
+    filters=None,
+    decompound_mode=None,
+    user_dictionary_rules=None,
+    index=None,
+    chunk_size=100,
+    max_concurrency=4,
+    hosts="http://localhost:9200",
+    client=None,
+    cache=None
+):
+    """
+    대량 문장 형태소 분석 비동기 제너레이터
+
+    Parameters:
+        lib.search.analyze_morph_batch와 같습니다 (max_workers 대신 max_concurrency).
+
+    Yields:
+        list: 입력 순서대로 문장별 토큰 리스트 (오프셋은 문장 기준, position은 첫 토큰 기준)
+    """
+    es = _resolve_client(client, hosts)
+    body_options = _batch_options(
+        analyzer, tokenizer, filters, decompound_mode, user_dictionary_rules
+    )
+    iterator = iter(texts)
+    pending = deque()
+
+    try:
+        while True:
+            chunk = _next_chunk(iterator, chunk_size)
+            if chunk:
+                pending.append(asyncio.ensure_future(
+                    _analyze_chunk(es, chunk, index, body_options, cache)
+                ))
+            while pending and (len(pending) >= max_concurrency or not chunk):
+                for tokens in await pending.popleft():
+                    yield tokens
+            if not chunk:
+                break
+    finally:
+        # 소비자가 중간에 멈추면 남은 요청을 취소
+        for task in pending:
+            task.cancel()
+
+
+async def create_index(
+    index_name,
+    settings=None,
+    mappings=None,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    Elasticsearch 인덱스 생성 함수 (비동기)
+
+    Parameters:
+        lib.search.create_index와 같습니다.
+
+    Returns:
+        dict: 생성 결과(JSON)
+    """
+    es = _resolve_client(client, hosts)
+    # 이미 인덱스가 있으면 삭제(옵션)
+    if await es.indices.exists(index=index_name):
+        await es.indices.delete(index=index_name)
+    body = {}
+    if settings:
+        body["settings"] = settings
+    if mappings:
+        body["mappings"] = mappings
+    result = await es.indices.create(index=index_name, body=body)
+    invalidate_index(index_name)
+    return result
+
+
+async def _send_bulk_chunk(es, lines, max_retries, initial_backoff, max_backoff):
+    """bulk 요청 하나를 보내고 429(거절) 문서만 지수 백오프로 재시도합니다"""
+    indexed, errors = 0, []
+    backoff = initial_backoff
+    for attempt in range(max_retries + 1):
+        try:
+            response = await es.bulk(body=lines)
+        except Exception as e:
+            if not _is_rejected(e) or attempt == max_retries:
+                raise
+            await asyncio.sleep(min(backoff, max_backoff))
+            backoff *= 2
+            continue
+
+        done, lines, failed = _split_bulk_items(response, lines, attempt < max_retries)
+        indexed += done
+        errors.extend(failed)
+        if not lines:
+            break
+        await asyncio.sleep(min(backoff, max_backoff))
+        backoff *= 2
+    return indexed, len(errors), errors
+
+
+@asynccontextmanager
+async def bulk_load_mode(
+    index_name,
+    force_merge=False,
+    max_num_segments=1,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    대량 적재 모드 비동기 컨텍스트 매니저
+
+    Parameters:
+        lib.search.bulk_load_mode와 같습니다.
+    """
+    es = _resolve_client(client, hosts)
+    original = _original_settings(
+        await es.indices.get_settings(index=index_name, flat_settings=True)
+    )
+    targets = await _write_targets(es, index_name)
+    await es.indices.put_settings(index=index_name, body=BULK_LOAD_SETTINGS)
+    try:
+        yield es
+    finally:
+        for name, settings in original.items():
+            await es.indices.put_settings(index=name, body=settings)
+        await es.indices.refresh(index=index_name)
+        invalidate_index(targets)
+        if force_merge:
+            await es.indices.forcemerge(index=index_name, max_num_segments=max_num_segments)
+            invalidate_index(targets)
+
+
+async def bulk_ingest(
+    index_name,
+    source,
+    title_field="title",
+    content_field="content",
+    id_field=None,
+    delimiter=",",
+    max_chunk_bytes=5 * 1024 * 1024,
+    max_chunk_docs=5000,
+    max_concurrency=4,
+    max_retries=5,
+    initial_backoff=1.0,
+    max_backoff=60.0,
+    bulk_load=False,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    대량 문서 색인 함수 (비동기 병렬 bulk 요청)
+
+    Parameters:
+        lib.search.bulk_ingest와 같습니다 (max_workers 대신 max_concurrency).
+
+    Returns:
+        dict: 색인/실패 문서 수, 소요 시간, 초당 문서 수, 전송 바이트, 실패 사유 일부
+    """
+    es = _resolve_client(client, hosts)
+    if bulk_load:
+        async with bulk_load_mode(index_name, client=es):
+            return await bulk_ingest(
+                index_name, source, title_field=title_field,
+                content_field=content_field, id_field=id_field,
+                delimiter=delimiter, max_chunk_bytes=max_chunk_bytes,
+                max_chunk_docs=max_chunk_docs, max_concurrency=max_concurrency,
+                max_retries=max_retries, initial_backoff=initial_backoff,
+                max_backoff=max_backoff, client=es
+            )
+
+    actions = _bulk_actions(source, index_name, title_field, content_field, id_field, delimiter)
+    targets = await _write_targets(es, index_name)
+    stats = {"indexed": 0, "failed": 0, "bytes": 0, "errors": []}
+    started = time.perf_counter()
+
+    pending = deque()
+    try:
+        for lines in _iter_bulk_chunks(actions, max_chunk_bytes, max_chunk_docs):
+            stats["bytes"] += sum(len(line) + 1 for line in lines)
+            pending.append(asyncio.ensure_future(_send_bulk_chunk(
+                es, lines, max_retries, initial_backoff, max_backoff
+            )))
+            if len(pending) >= max_concurrency:
+                _record_bulk(stats, await pending.popleft(), targets)
+        while pending:
+            _record_bulk(stats, await pending.popleft(), targets)
+    finally:
+        for task in pending:
+            task.cancel()
+    return _finish_bulk(stats, started)
+
+
+async def search(
+    index,
+    query=None,
+    size=10,
+    from_=0,
+    source=None,
+    sort=None,
+    aggs=None,
+    cache=None,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    검색 함수 (비동기, 한 페이지, 선택적 결과 캐시)
+
+    Parameters:
+        lib.search.search와 같습니다.
+
+    Returns:
+        dict: 검색 결과(JSON)
+    """
+    body = _search_body(query, size, from_, source, sort, aggs)
+    cached, key, seq = _lookup_search(cache, index, body)
+    if cached is not None:
+        return cached
+
+    es = _resolve_client(client, hosts)
+    response = await es.search(index=index, body=body)
+    result = dict(getattr(response, "body", response))
+    if cache is not None:
+        cache.put(key, result, seq)
+    return result
+
+
+async def iter_search(
+    index,
+    query=None,
+    page_size=1000,
+    source=None,
+    sort=None,
+    keep_alive="1m",
+    max_hits=None,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    검색 결과 스트리밍 비동기 제너레이터 (point-in-time + search_after)
+
+    Parameters:
+        lib.search.iter_search와 같습니다.
+
+    Yields:
+        dict: 검색 hit (_id, _source, sort 등)
+    """
+    es = _resolve_client(client, hosts)
+    pit_id = (await es.open_point_in_time(index=index, keep_alive=keep_alive))["id"]
+    body = _pit_body(query, page_size, source, sort, max_hits)
+
+    returned = 0
+    try:
+        while True:
+            body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+            response = await es.search(body=body)
+            pit_id = response.get("pit_id", pit_id)
+            hits = response["hits"]["hits"]
+            for hit in hits:
+                yield hit
+                returned += 1
+                if max_hits is not None and returned >= max_hits:
+                    return
+            if len(hits) < body["size"]:
+                return
+            body["search_after"] = hits[-1]["sort"]
+    finally:
+        await es.close_point_in_time(body={"id": pit_id})
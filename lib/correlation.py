@@ -0,0 +1,215 @@
+"""
+넓은 테이블(수치형 컬럼 수백~수천 개)을 위한 상관관계 계산 모듈
+
+df.corr()의 전체 행렬을 dict로 돌려주면 컬럼 수의 제곱만큼 응답이 커지므로,
+표준화한 float32 데이터를 컬럼 블록 단위로 행렬곱해 상관계수를 구하고 가장 강한
+쌍(top-k) 또는 임계값 이상인 쌍만 반환합니다. 전체 행렬이 필요하면 .npy 파일로
+저장합니다 (np.load(path, mmap_mode="r")로 필요한 부분만 읽을 수 있음).
+
+결측이 없으면 Z^T Z / n 한 번의 행렬곱으로, 결측이 있으면 pandas와 같은
+쌍별 결측 제외(pairwise complete) 방식으로 블록마다 행렬곱 여섯 번으로 계산합니다.
+float32로 계산하므로 결과는 소수점 넷째 자리 정도까지 pandas와 일치합니다.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 이 수 이하의 수치형 컬럼이면 기존처럼 전체 상관행렬 dict를 반환
+FULL_MATRIX_MAX_COLUMNS = int(os.environ.get("CORR_FULL_MAX_COLUMNS", "100"))
+DEFAULT_BLOCK_SIZE = 1024
+
+
+def _numeric_values(frame, sample_rows=None, seed=0):
+    """수치형/불리언 컬럼만 float32 배열로 만들고 필요하면 행을 샘플링합니다"""
+    numeric = frame.select_dtypes(include=["number", "bool"])
+    total_rows = len(numeric)
+    if sample_rows and total_rows > sample_rows:
+        rng = np.random.default_rng(seed)
+        rows = np.sort(rng.choice(total_rows, size=sample_rows, replace=False))
+        numeric = numeric.iloc[rows]
+    # 컬럼 블록을 잘라 쓰므로 열 우선(Fortran) 배열로 만듦
+    values = np.asfortranarray(numeric.to_numpy(dtype=np.float32, na_value=np.nan))
+    return values, [str(c) for c in numeric.columns], total_rows
+
+
+def _standardize(values):
+    """
+    컬럼별로 평균 0, 표준편차 1로 맞춥니다 (결측은 0으로 채우고 마스크 반환)
+
+    표준편차가 0이거나 값이 2개 미만인 컬럼은 상관계수가 정의되지 않으므로 제외합니다.
+    """
+    mask = ~np.isnan(values)
+    has_missing = not mask.all()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nanmean(values, axis=0, dtype=np.float64) if len(values) else np.zeros(values.shape[1])
+        std = np.nanstd(values, axis=0, dtype=np.float64) if len(values) else np.zeros(values.shape[1])
+    counts = mask.sum(axis=0)
+    keep = (counts >= 2) & np.isfinite(std) & (std > 0)
+    values = values[:, keep]
+    mask = mask[:, keep]
+    z = (values - mean[keep].astype(np.float32)) / std[keep].astype(np.float32)
+    if has_missing:
+        z[~mask] = 0.0
+        return np.asfortranarray(z), np.asfortranarray(mask.astype(np.float32)), keep
+    return np.asfortranarray(z), None, keep
+
+
+def _tile(z, mask, a, b):
+    """컬럼 블록 a, b 사이의 상관계수 타일을 계산합니다"""
+    za, zb = z[:, a], z[:, b]
+    if mask is None:
+        tile = (za.T @ zb) / np.float32(len(z))
+    else:
+        ma, mb = mask[:, a], mask[:, b]
+        n = ma.T @ mb
+        sx = za.T @ mb
+        sy = ma.T @ zb
+        sxx = (za * za).T @ mb
+        syy = ma.T @ (zb * zb)
+        sxy = za.T @ zb
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = sxy - sx * sy / n
+            var = (sxx - sx * sx / n) * (syy - sy * sy / n)
+            tile = cov / np.sqrt(var)
+        tile[n < 2] = np.nan
+    return np.clip(tile, -1.0, 1.0)
+
+
+def _top(candidates, top_k):
+    """(|r|, i, j, r) 후보 배열에서 |r|이 큰 top_k개만 남깁니다"""
+    if top_k is None or len(candidates[0]) <= top_k:
+        return candidates
+    keep = np.argpartition(-candidates[0], top_k - 1)[:top_k]
+    return tuple(c[keep] for c in candidates)
+
+
+def correlation_pairs(frame, top_k=20, threshold=None, sample_rows=None,
+                      block_size=DEFAULT_BLOCK_SIZE, matrix_path=None, seed=0):
+    """
+    블록 단위로 피어슨 상관계수를 계산하고 강한 쌍만 반환하는 함수
+
+    Parameters:
+        frame (DataFrame): 데이터 (수치형/불리언 컬럼만 사용)
+        top_k (int): 반환할 최대 쌍 수 (None이면 threshold를 넘는 모든 쌍)
+        threshold (float): 이 값 이상의 |r|인 쌍만 반환 (None이면 제한 없음)
+        sample_rows (int): 행이 이보다 많으면 무작위로 이만큼만 사용
+        block_size (int): 한 번에 계산할 컬럼 블록 크기 (타일 메모리 = block_size^2 * 4바이트)
+        matrix_path (str): 지정하면 전체 상관행렬을 float32 .npy로 저장
+        seed (int): 행 샘플링 시드
+
+    Returns:
+        dict: columns, rows, total_rows, sampled, pairs, constant_columns, (matrix_path)
+    """
+    if top_k is None and threshold is None:
+        raise ValueError("top_k와 threshold 중 하나는 지정해야 합니다")
+    values, names, total_rows = _numeric_values(frame, sample_rows, seed)
+    rows = len(values)
+    z, mask, keep = _standardize(values)
+    del values
+    columns = [name for name, k in zip(names, keep) if k]
+    size = len(columns)
+
+    matrix = None
+    if matrix_path is not None:
+        matrix = np.lib.format.open_memmap(
+            matrix_path, mode="w+", dtype=np.float32, shape=(size, size)
+        )
+
+    candidates = (
+        np.empty(0, np.float32), np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    )
+    for i0 in range(0, size, block_size):
+        a = slice(i0, min(i0 + block_size, size))
+        for j0 in range(i0, size, block_size):
+            b = slice(j0, min(j0 + block_size, size))
+            tile = _tile(z, mask, a, b)
+            if matrix is not None:
+                matrix[a, b] = tile
+                matrix[b, a] = tile.T
+            strength = np.abs(tile)
+            if i0 == j0:
+                # 대각 블록은 위 삼각형만 (자기 자신과 중복 쌍 제외)
+                strength = np.triu(strength, k=1)
+            strength = np.nan_to_num(strength, nan=0.0)
+            selected = strength > 0
+            if threshold is not None:
+                selected &= strength >= threshold
+            ii, jj = np.nonzero(selected)
+            found = (strength[ii, jj], ii + i0, jj + j0, tile[ii, jj])
+            candidates = _top(tuple(np.concatenate([c, f]) for c, f in zip(candidates, found)), top_k)
+
+    if matrix is not None:
+        np.fill_diagonal(matrix, 1.0)
+        matrix.flush()
+        del matrix
+        with open(_columns_path(matrix_path), "w", encoding="utf-8") as f:
+            json.dump(columns, f, ensure_ascii=False)
+
+    order = np.argsort(-candidates[0], kind="stable")
+    result = {
+        "method": "pearson",
+        "columns": size,
+        "rows": rows,
+        "total_rows": total_rows,
+        "sampled": rows < total_rows,
+        "pairs": [
+            {"columns": [columns[candidates[1][k]], columns[candidates[2][k]]],
+             "r": round(float(candidates[3][k]), 4)}
+            for k in order
+        ],
+        "constant_columns": [name for name, k in zip(names, keep) if not k],
+    }
+    if matrix_path is not None:
+        result["matrix_path"] = matrix_path
+        result["matrix_columns_path"] = _columns_path(matrix_path)
+    return result
+
+
+def _columns_path(matrix_path):
+    return os.path.splitext(matrix_path)[0] + ".columns.json"
+
+
+def pairs_from_matrix(matrix, top_k=20, threshold=None):
+    """
+    이미 계산된 상관행렬(DataFrame 또는 dict)에서 강한 쌍만 골라내는 함수
+
+    Parameters:
+        matrix (DataFrame | dict): df.corr() 결과 또는 그 to_dict()
+        top_k (int): 반환할 최대 쌍 수
+        threshold (float): 이 값 이상의 |r|인 쌍만 반환
+
+    Returns:
+        list: [{"columns": [a, b], "r": r}, ...] (|r| 내림차순)
+    """
+    if not isinstance(matrix, pd.DataFrame):
+        matrix = pd.DataFrame(matrix)
+    values = matrix.to_numpy(dtype=float)
+    strength = np.nan_to_num(np.abs(np.triu(values, k=1)), nan=0.0)
+    selected = strength > 0
+    if threshold is not None:
+        selected &= strength >= threshold
+    ii, jj = np.nonzero(selected)
+    order = np.argsort(-strength[ii, jj], kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+    names = [str(c) for c in matrix.columns]
+    return [
+        {"columns": [names[ii[k]], names[jj[k]]], "r": round(float(values[ii[k], jj[k]]), 4)}
+        for k in order
+    ]
+
+
+def compact_correlation(frame, max_full_columns=FULL_MATRIX_MAX_COLUMNS, top_k=20):
+    """
+    컬럼 수에 따라 전체 상관행렬 또는 강한 쌍 요약을 반환하는 함수
+
+    수치형 컬럼이 max_full_columns 이하이면 df.corr(numeric_only=True) DataFrame을
+    반환하고, 넘으면 float64 전체 행렬을 만들지 않고 correlation_pairs의 top_k 요약
+    dict를 반환합니다.
+    """
+    numeric_columns = frame.select_dtypes(include=["number", "bool"]).shape[1]
+    if numeric_columns <= max_full_columns:
+        return frame.corr(numeric_only=True)
+    return correlation_pairs(frame, top_k=top_k)
@@ -0,0 +1,285 @@
+"""
+MCP 도구 호출별 지연 시간과 메모리 계측
+
+0527/python/decorator.py의 my_decorator처럼 도구 함수를 감싸는 데코레이터로,
+@mcp.tool 호출마다 다음 값을 기록합니다.
+- wall_ms: 경과 시간
+- cpu_ms: 프로세스 CPU 시간 증가분 (워커 스레드에서 실행한 시간 포함)
+- rss_delta_kb: 호출 전후 현재 RSS 차이 (/proc/self/statm이 없는 OS에서는 None)
+- peak_rss_delta_kb: 프로세스 최대 RSS(high-water mark) 증가분 - 이전 최대를 넘긴
+  호출에서만 0보다 크므로 "새 최대 메모리를 만든 호출"을 찾는 신호로만 사용
+- traced_peak_kb: tracemalloc 최대 할당량 (MCP_METRICS_TRACEMALLOC=1일 때만)
+- input_bytes: 인자의 JSON 크기, input_file_bytes: 인자로 받은 파일 크기 합계
+- output_bytes: 반환값의 JSON 크기
+
+CPU/RSS/tracemalloc 값은 프로세스 전체 기준이므로 동시에 실행된 호출의 몫이 섞일 수
+있습니다. 도구별로 최근 호출을 보관해 p50/p95/p99를 계산하며, MCP_METRICS_TRACE에
+파일 경로를 지정하면 호출마다 한 줄씩 JSONL로 기록합니다.
+
+사용 예:
+    @mcp.tool('load_csv', "CSV 파일 로드")
+    @instrument('load_csv')
+    async def load_csv(path: str) -> dict: ...
+"""
+import functools
+import inspect
+import json
+import math
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 도구별로 보관할 최근 호출 수 (백분위수 계산 대상)
+WINDOW = int(os.environ.get("MCP_METRICS_WINDOW", "1000"))
+TRACE_PATH = os.environ.get("MCP_METRICS_TRACE") or None
+# tracemalloc은 모든 할당을 추적해 느려지므로 명시적으로 켤 때만 사용
+TRACEMALLOC = os.environ.get("MCP_METRICS_TRACEMALLOC", "0") == "1"
+
+PERCENTILES = (50, 95, 99)
+try:
+    _PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024
+except (AttributeError, ValueError, OSError):
+    _PAGE_KB = 4
+
+FIELDS = ("wall_ms", "cpu_ms", "rss_delta_kb", "peak_rss_delta_kb", "traced_peak_kb",
+          "input_bytes", "input_file_bytes", "output_bytes")
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _current_rss_kb():
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * _PAGE_KB
+
+
+def _json_size(value):
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(str(value).encode("utf-8"))
+
+
+def _file_bytes(arguments):
+    """인자 중 존재하는 파일 경로인 문자열의 크기를 더합니다"""
+    total = 0
+    for value in arguments.values():
+        if isinstance(value, str) and len(value) < 4096 and os.path.isfile(value):
+            total += os.path.getsize(value)
+    return total
+
+
+def percentile(values, q):
+    """정렬된 리스트에서 최근접 순위 방식의 q 백분위수를 반환합니다"""
+    if not values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+class MetricsStore:
+    """
+    도구별 호출 기록을 보관하고 요약하는 저장소
+
+    Parameters:
+        window (int): 도구별로 보관할 최근 호출 수
+        trace_path (str): 호출마다 JSONL로 기록할 파일 경로 (없으면 기록하지 않음)
+    """
+
+    def __init__(self, window=WINDOW, trace_path=TRACE_PATH):
+        self.window = window
+        self.trace_path = trace_path
+        self._samples = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def record(self, sample):
+        """호출 하나의 측정값(dict)을 저장합니다"""
+        name = sample["tool"]
+        with self._lock:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+            samples.append(sample)
+            totals = self._totals.setdefault(name, {"calls": 0, "errors": 0, "wall_ms": 0.0})
+            totals["calls"] += 1
+            totals["errors"] += sample["error"] is not None
+            totals["wall_ms"] += sample["wall_ms"]
+            if self.trace_path:
+                try:
+                    with open(self.trace_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(sample, ensure_ascii=False, default=str) + "\n")
+                except OSError:
+                    pass
+
+    def summary(self, tool=None):
+        """
+        도구별 호출 수, 오류 수, 측정값의 p50/p95/p99/최댓값을 반환하는 함수
+
+        Parameters:
+            tool (str): 이 도구만 요약 (없으면 전체)
+
+        Returns:
+            dict: since, window, trace_path, tools({도구: 요약})
+        """
+        with self._lock:
+            names = [tool] if tool is not None else sorted(self._samples)
+            snapshot = {n: list(self._samples.get(n, ())) for n in names}
+            totals = {n: dict(self._totals.get(n, {"calls": 0, "errors": 0, "wall_ms": 0.0}))
+                      for n in names}
+
+        tools = {}
+        for name, samples in snapshot.items():
+            entry = {
+                "calls": totals[name]["calls"],
+                "errors": totals[name]["errors"],
+                "total_wall_ms": round(totals[name]["wall_ms"], 3),
+                "window_calls": len(samples),
+            }
+            for field in FIELDS:
+                values = sorted(s[field] for s in samples if s.get(field) is not None)
+                if not values:
+                    continue
+                entry[field] = {f"p{q}": percentile(values, q) for q in PERCENTILES}
+                entry[field]["max"] = values[-1]
+            tools[name] = entry
+        return {
+            "since": self._started,
+            "window": self.window,
+            "trace_path": self.trace_path,
+            "tools": tools,
+        }
+
+    def report(self, tool=None, reset=False, trace_path=None):
+        """
+        server_metrics 도구가 반환할 요약을 만드는 함수
+
+        Parameters:
+            tool (str): 이 도구만 요약 (없으면 전체)
+            reset (bool): 요약을 만든 뒤 기록을 지울지 여부
+            trace_path (str): 이후 호출을 JSONL로 기록할 파일 경로 (빈 문자열이면 기록을 끔)
+
+        Returns:
+            dict: summary()의 결과 (reset이면 "reset": True 추가)
+        """
+        if trace_path is not None:
+            self.trace_path = trace_path or None
+        summary = self.summary(tool)
+        if reset:
+            self.reset()
+            summary["reset"] = True
+        return summary
+
+    def reset(self):
+        """보관한 기록을 모두 지웁니다"""
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._started = time.time()
+
+
+# 서버 프로세스 전체에서 공유하는 저장소
+METRICS = MetricsStore()
+
+
+def _start():
+    if TRACEMALLOC:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    return time.perf_counter(), time.process_time(), _current_rss_kb(), _peak_rss_kb()
+
+
+def _finish(name, arguments, start, result, error, store):
+    wall0, cpu0, rss0, peak0 = start
+    wall_ms = (time.perf_counter() - wall0) * 1000
+    cpu_ms = (time.process_time() - cpu0) * 1000
+    rss1 = _current_rss_kb()
+    peak1 = _peak_rss_kb()
+    store.record({
+        "tool": name,
+        "time": time.time(),
+        "wall_ms": round(wall_ms, 3),
+        "cpu_ms": round(cpu_ms, 3),
+        "rss_delta_kb": rss1 - rss0 if rss0 is not None and rss1 is not None else None,
+        "peak_rss_delta_kb": peak1 - peak0 if peak0 is not None else None,
+        "traced_peak_kb": tracemalloc.get_traced_memory()[1] // 1024 if TRACEMALLOC else None,
+        "input_bytes": _json_size(arguments),
+        "input_file_bytes": _file_bytes(arguments),
+        "output_bytes": _json_size(result) if error is None else None,
+        "error": error,
+    })
+
+
+def instrument(name=None, store=None):
+    """
+    도구 함수의 호출마다 시간/메모리/입출력 크기를 기록하는 데코레이터
+
+    async 함수와 일반 함수 모두 감쌀 수 있으며, 원래 함수의 시그니처를 유지하므로
+    @mcp.tool 바로 아래에 붙이면 됩니다. 예외는 기록한 뒤 그대로 다시 발생시킵니다.
+
+    Parameters:
+        name (str): 기록할 도구 이름 (없으면 함수 이름)
+        store (MetricsStore): 기록할 저장소 (없으면 METRICS)
+
+    Returns:
+        callable: 데코레이터
+    """
+    def decorator(func):
+        tool_name = name or func.__name__
+        signature = inspect.signature(func)
+
+        def arguments_of(args, kwargs):
+            try:
+                bound = signature.bind_partial(*args, **kwargs)
+            except TypeError:
+                return {"args": args, **kwargs}
+            # MCP 요청 컨텍스트는 입력 크기에서 제외
+            return {k: v for k, v in bound.arguments.items() if k != "ctx"}
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = _start()
+                result, error = None, None
+                try:
+                    result = await func(*args, **kwargs)
+                    return result
+                except BaseException as e:
+                    error = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    _finish(tool_name, arguments_of(args, kwargs), start, result, error,
+                            store or METRICS)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = _start()
+                result, error = None, None
+                try:
+                    result = func(*args, **kwargs)
+                    return result
+                except BaseException as e:
+                    error = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    _finish(tool_name, arguments_of(args, kwargs), start, result, error,
+                            store or METRICS)
+        return wrapper
+    return decorator
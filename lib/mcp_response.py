@@ -0,0 +1,274 @@
+"""
+MCP 도구 응답을 작게 만드는 공용 인코딩 계층
+
+df.to_dict()는 컬럼마다 {인덱스: 값} dict를 만들어 컬럼 이름과 인덱스가 셀마다
+반복되므로, 넓은 표에서는 계산보다 직렬화와 전송이 더 오래 걸립니다. 이 모듈은
+- columns/index/data 배열로 나눈 "split" 인코딩
+- 유효 숫자 기준 실수 반올림 (NaN/inf는 null)
+- 행이 많은 섹션의 커서 기반 페이지 나누기 (남은 페이지는 서버 메모리에 보관)
+- 큰 섹션 전체를 JSON 파일로 내보내고 경로(handle)만 반환
+을 제공합니다. eda-mcp와 kaggle-mcp 서버가 함께 사용합니다.
+
+응답 예:
+    {"statistics": {"encoding": "split", "columns": [...], "index": [...],
+                    "data": [[...], ...], "total_rows": 1200,
+                    "next_cursor": "...", "file": "/tmp/.../statistics.json"}}
+"""
+import base64
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DIGITS = 6
+# 한 페이지에 담을 행 수
+DEFAULT_PAGE_SIZE = int(os.environ.get("MCP_RESPONSE_PAGE_SIZE", "200"))
+# 섹션 전체의 JSON이 이 크기를 넘으면 파일로 내보냄
+SPILL_BYTES = int(os.environ.get("MCP_RESPONSE_SPILL_KB", "512")) * 1024
+SPILL_DIR = os.environ.get(
+    "MCP_RESPONSE_SPILL_DIR", os.path.join(tempfile.gettempdir(), "mcp-responses")
+)
+# 남은 페이지를 보관할 결과 수와 보관 시간(초)
+STORE_MAX_RESULTS = 64
+STORE_TTL = 1800
+
+
+def round_significant(values, digits=DEFAULT_DIGITS):
+    """실수 배열을 유효 숫자 digits자리로 반올림합니다"""
+    values = np.asarray(values, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    magnitude = np.where(np.isfinite(magnitude), magnitude, 0)
+    scale = 10.0 ** (digits - 1 - magnitude)
+    with np.errstate(over="ignore", invalid="ignore"):
+        rounded = np.round(values * scale) / scale
+    # 아주 큰/작은 값은 스케일링이 넘치므로 원래 값 사용
+    return np.where(np.isfinite(rounded), rounded, values)
+
+
+def _column_values(series, digits):
+    """한 컬럼을 JSON으로 바로 쓸 수 있는 파이썬 값 리스트로 바꿉니다"""
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) and not series.hasnans:
+        return series.to_numpy(dtype=bool).tolist()
+    if pd.api.types.is_integer_dtype(dtype) and not series.hasnans:
+        return series.to_numpy(dtype=np.int64).tolist()
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        if digits is not None:
+            values = round_significant(values, digits)
+        return [v if math.isfinite(v) else None for v in values.tolist()]
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return [None if pd.isna(v) else v.isoformat() for v in series]
+    return [to_jsonable(v, digits) for v in series.tolist()]
+
+
+def to_jsonable(value, digits=DEFAULT_DIGITS):
+    """numpy/pandas 스칼라와 NaN을 JSON에 맞는 파이썬 값으로 바꿉니다"""
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v, digits) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v, digits) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        return float(f"{value:.{digits}g}") if digits is not None else value
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return None if pd.isna(value) else value.isoformat()
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return str(value)
+
+
+def encode_frame(frame, digits=DEFAULT_DIGITS):
+    """
+    DataFrame을 split 형식(columns/index/data)으로 인코딩하는 함수
+
+    Parameters:
+        frame (DataFrame): 인코딩할 데이터
+        digits (int): 실수 유효 숫자 (None이면 반올림하지 않음)
+
+    Returns:
+        dict: encoding, columns, index, data(행 우선 2차원 리스트)
+    """
+    columns = [_column_values(frame.iloc[:, i], digits) for i in range(frame.shape[1])]
+    return {
+        "encoding": "split",
+        "columns": [str(c) for c in frame.columns],
+        "index": [to_jsonable(i, digits) for i in frame.index.tolist()],
+        "data": [list(row) for row in zip(*columns)] if columns else [[] for _ in frame.index],
+    }
+
+
+class ResultStore:
+    """
+    커서로 이어 받을 섹션을 보관하는 LRU 저장소
+
+    Parameters:
+        max_results (int): 보관할 최대 결과 수
+        ttl (float): 결과를 보관할 시간(초)
+    """
+
+    def __init__(self, max_results=STORE_MAX_RESULTS, ttl=STORE_TTL):
+        self.max_results = max_results
+        self.ttl = ttl
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, sections):
+        """{섹션 이름: 인코딩된 섹션}을 저장하고 결과 id를 반환합니다"""
+        result_id = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._results[result_id] = (time.monotonic(), sections)
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return result_id
+
+    def get(self, result_id, section):
+        """저장된 섹션을 반환합니다 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._results.get(result_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._results[result_id]
+                return None
+            self._results.move_to_end(result_id)
+            return entry[1].get(section)
+
+
+# 서버 프로세스 전체에서 공유하는 저장소
+RESULT_STORE = ResultStore()
+
+
+def _make_cursor(result_id, section, offset, page_size):
+    token = json.dumps([result_id, section, offset, page_size], separators=(",", ":"))
+    return base64.urlsafe_b64encode(token.encode("utf-8")).decode("ascii")
+
+
+def _page(encoded, section, result_id, offset, page_size):
+    """인코딩된 섹션에서 offset부터 page_size행을 잘라 커서와 함께 반환합니다"""
+    total = len(encoded["data"])
+    end = min(offset + page_size, total)
+    page = dict(encoded)
+    page["data"] = encoded["data"][offset:end]
+    page["index"] = encoded["index"][offset:end]
+    page["offset"] = offset
+    page["total_rows"] = total
+    page["next_cursor"] = (
+        _make_cursor(result_id, section, end, page_size) if end < total else None
+    )
+    return page
+
+
+def spill(name, obj, directory=None):
+    """
+    객체를 JSON 파일로 저장하고 경로를 반환하는 함수
+
+    Parameters:
+        name (str): 파일 이름에 붙일 섹션 이름
+        obj: JSON으로 저장할 객체
+        directory (str): 저장 디렉토리 (없으면 SPILL_DIR)
+
+    Returns:
+        str: 저장된 파일 경로
+    """
+    directory = directory or SPILL_DIR
+    os.makedirs(directory, exist_ok=True)
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    path = os.path.join(directory, f"{safe}-{uuid.uuid4().hex[:12]}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    return path
+
+
+def compact_response(result, frames, digits=DEFAULT_DIGITS, page_size=DEFAULT_PAGE_SIZE,
+                     spill_bytes=SPILL_BYTES):
+    """
+    큰 표 섹션을 split 인코딩/반올림/페이지 나누기/파일 내보내기로 줄이는 함수
+
+    Parameters:
+        result (dict): 그대로 응답에 넣을 작은 값들 (실수는 반올림)
+        frames (dict): {섹션 이름: DataFrame} - 행 단위로 페이지를 나눌 큰 섹션
+        digits (int): 실수 유효 숫자
+        page_size (int): 한 페이지에 담을 행 수 (0이나 None이면 나누지 않음)
+        spill_bytes (int): 섹션 JSON이 이 크기를 넘으면 전체를 파일로 저장하고 경로 포함
+
+    Returns:
+        dict: result와 인코딩된 섹션을 합친 응답. 다음 페이지는 fetch_page(next_cursor)로 조회
+    """
+    response = to_jsonable(result, digits)
+    encoded = {name: encode_frame(frame, digits) for name, frame in frames.items()}
+    paged = {
+        name: section for name, section in encoded.items()
+        if page_size and len(section["data"]) > page_size
+    }
+    result_id = RESULT_STORE.put(paged) if paged else None
+
+    for name, section in encoded.items():
+        if name in paged:
+            response[name] = _page(section, name, result_id, 0, page_size)
+        else:
+            response[name] = section
+        if spill_bytes and len(section["data"]) * max(len(section["columns"]), 1) * 8 > spill_bytes:
+            # 셀당 8바이트로 대략 추정해 큰 섹션만 실제 직렬화해 크기를 확인
+            text = json.dumps(section, ensure_ascii=False, separators=(",", ":"))
+            if len(text.encode("utf-8")) > spill_bytes:
+                response[name]["file"] = spill(name, section)
+    return response
+
+
+def fetch_page(cursor):
+    """
+    compact_response가 반환한 next_cursor로 다음 페이지를 조회하는 함수
+
+    Returns:
+        dict: 해당 섹션의 다음 페이지 (만료되었으면 message와 함께 None 섹션)
+    """
+    try:
+        result_id, section, offset, page_size = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii"))
+        )
+    except (ValueError, TypeError):
+        raise ValueError("잘못된 커서입니다")
+    encoded = RESULT_STORE.get(result_id, section)
+    if encoded is None:
+        return {"section": section, "page": None,
+                "message": "결과가 만료되었습니다. 도구를 다시 호출하세요"}
+    return {"section": section, "page": _page(encoded, section, result_id, offset, page_size)}
+
+
+def build_response(result, frames, response_format="compact", row_keyed=(), **options):
+    """
+    response_format에 따라 compact 응답 또는 기존 to_dict() 형식 응답을 만드는 함수
+
+    Parameters:
+        result (dict): 작은 값들
+        frames (dict): {섹션 이름: DataFrame} - 행이 페이지 단위가 되도록 정렬된 표
+        response_format (str): "compact"(기본) 또는 "dict"(기존 중첩 dict 형식)
+        row_keyed (iterable): "dict" 형식에서 {행: {컬럼: 값}}으로 내보낼 섹션 이름
+            (예: describe().T처럼 행이 데이터셋 컬럼인 표)
+        **options: compact_response에 넘길 digits, page_size, spill_bytes
+
+    Returns:
+        dict: 응답
+    """
+    if response_format == "dict":
+        response = dict(result)
+        for name, frame in frames.items():
+            response[name] = frame.to_dict(orient="index" if name in row_keyed else "dict")
+        return response
+    if response_format != "compact":
+        raise ValueError(f"지원하지 않는 response_format입니다: {response_format}")
+    return compact_response(result, frames, **options)
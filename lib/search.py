@@ -1,5 +1,488 @@
+import bisect
+import csv
+import fnmatch
+import hashlib
+import itertools
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 from elasticsearch import Elasticsearch
-from elasticsearch import Elasticsearch
+
+# 호스트당 유지할 keep-alive 커넥션 수 (elasticsearch-py 기본값: 10)
+DEFAULT_CONNECTIONS_PER_NODE = 10
+
+# (hosts, 옵션) 조합별로 공유되는 클라이언트 레지스트리
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _client_key(hosts, options):
+    """hosts와 클라이언트 옵션으로 레지스트리 키를 만듭니다"""
+    if isinstance(hosts, (list, tuple)):
+        hosts_key = tuple(json.dumps(h, sort_keys=True, default=repr) for h in hosts)
+    else:
+        hosts_key = (json.dumps(hosts, sort_keys=True, default=repr),)
+    return hosts_key, json.dumps(options, sort_keys=True, default=repr)
+
+
+def get_client(
+    hosts="http://localhost:9200",
+    connections_per_node=DEFAULT_CONNECTIONS_PER_NODE,
+    **options
+):
+    """
+    공유(풀링) Elasticsearch 클라이언트 반환 함수
+
+    같은 hosts와 옵션으로 호출하면 같은 클라이언트를 재사용하므로
+    커넥션 풀과 keep-alive 연결이 호출 간에 유지됩니다.
+
+    Parameters:
+        hosts (str or list): Elasticsearch 호스트
+        connections_per_node (int): 노드당 커넥션 풀 크기
+        **options: Elasticsearch 생성자에 그대로 전달할 옵션
+                   (예: request_timeout, basic_auth, retry_on_timeout)
+
+    Returns:
+        Elasticsearch: 공유 클라이언트
+    """
+    options["connections_per_node"] = connections_per_node
+    key = _client_key(hosts, options)
+    with _CLIENTS_LOCK:
+        es = _CLIENTS.get(key)
+        if es is None:
+            es = Elasticsearch(hosts, **options)
+            _CLIENTS[key] = es
+    return es
+
+
+def close_clients():
+    """
+    레지스트리에 등록된 모든 공유 클라이언트를 닫고 초기화하는 함수
+
+    Returns:
+        int: 닫은 클라이언트 수
+    """
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for es in clients:
+        es.close()
+    return len(clients)
+
+
+def _resolve_client(client, hosts):
+    """명시적으로 전달된 클라이언트가 없으면 공유 클라이언트를 사용합니다"""
+    return client if client is not None else get_client(hosts)
+
+
+class AnalyzeResult(dict):
+    """캐시에서 꺼낸 분석 결과 (ObjectApiResponse처럼 .body로도 접근 가능)"""
+
+    @property
+    def body(self):
+        return self
+
+
+class AnalyzeCache:
+    """
+    형태소 분석 결과 캐시 (메모리 LRU + 선택적 SQLite 디스크 계층)
+
+    키는 분석 대상 문장과 analyzer/tokenizer/filter/decompound_mode/
+    user_dictionary_rules 등 분석 설정 전체를 정규화한 JSON의 SHA-256
+    해시입니다. 메모리 계층은 max_entries 개수 기준 LRU로, 디스크 계층은
+    max_disk_bytes 용량 기준으로 가장 오래 사용되지 않은 항목부터 제거합니다.
+
+    Parameters:
+        max_entries (int): 메모리 계층에 보관할 최대 항목 수
+        path (str): SQLite 파일 경로 (없으면 메모리 계층만 사용)
+        max_disk_bytes (int): 디스크 계층 최대 용량(바이트)
+    """
+
+    def __init__(self, max_entries=10000, path=None, max_disk_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analyze_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS analyze_cache_accessed "
+                "ON analyze_cache (accessed)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text, **options):
+        """분석 문장과 설정으로 내용 기반 캐시 키를 만듭니다"""
+        payload = json.dumps(
+            {"text": text, "options": options},
+            sort_keys=True, ensure_ascii=False, default=repr
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """캐시된 결과를 반환합니다 (없으면 None)"""
+        with self._lock:
+            raw = self._memory.get(key)
+            if raw is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return json.loads(raw)
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM analyze_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE analyze_cache SET accessed = ? WHERE key = ?",
+                        (time.time(), key)
+                    )
+                    self._db.commit()
+                    self._remember(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """결과를 메모리와 디스크 계층에 저장합니다"""
+        raw = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._remember(key, raw)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO analyze_cache VALUES (?, ?, ?, ?)",
+                    (key, raw, len(raw), time.time())
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def _remember(self, key, raw):
+        self._memory[key] = raw
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM analyze_cache"
+        ).fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        # 용량의 90%까지 오래 사용되지 않은 항목부터 제거
+        target = total - int(self.max_disk_bytes * 0.9)
+        freed = 0
+        rows = self._db.execute(
+            "SELECT key, size FROM analyze_cache ORDER BY accessed"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if freed >= target:
+                break
+            stale.append((key,))
+            freed += size
+        self._db.executemany("DELETE FROM analyze_cache WHERE key = ?", stale)
+
+    def stats(self):
+        """히트/미스 카운터와 계층별 크기를 반환합니다"""
+        with self._lock:
+            disk_entries, disk_bytes = 0, 0
+            if self._db is not None:
+                disk_entries, disk_bytes = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyze_cache"
+                ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes,
+            }
+
+    def clear(self):
+        """모든 계층을 비우고 카운터를 초기화합니다"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM analyze_cache")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def close(self):
+        """디스크 계층 연결을 닫습니다"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# 인덱스별 마지막 쓰기 순번 (SearchCache 무효화에 사용)
+_INDEX_WRITES = {}
+_WRITE_SEQ = itertools.count(1)
+_WRITES_LOCK = threading.Lock()
+
+
+def invalidate_index(index):
+    """
+    인덱스에 쓰기가 일어났음을 기록해 해당 인덱스의 SearchCache 항목을 무효화하는 함수
+
+    create_index, bulk_ingest, bulk_load_mode, reindex_with_alias는 자동으로
+    호출합니다(bulk_ingest와 bulk_load_mode는 인덱스에 연결된 alias까지).
+    클라이언트를 직접 사용해 문서를 쓴 경우에만 호출하면 되며, 이때 alias는
+    해석하지 않으므로 검색에 alias를 사용했다면 alias 이름도 함께 지정하세요.
+
+    Parameters:
+        index (str): 쓰기가 일어난 인덱스명 또는 alias (쉼표로 여러 개 지정 가능)
+    """
+    with _WRITES_LOCK:
+        seq = next(_WRITE_SEQ)
+        for name in index.split(","):
+            _INDEX_WRITES[name.strip()] = seq
+
+
+def _with_aliases(index_name, aliases):
+    """get_alias 응답에서 index_name과 연결된 인덱스/alias를 모아 쉼표로 잇습니다"""
+    names = [index_name]
+    for name, value in aliases.items():
+        for target in [name, *value.get("aliases", {})]:
+            if target not in names:
+                names.append(target)
+    return ",".join(names)
+
+
+def _write_targets(es, index_name):
+    """
+    쓰기 시 무효화할 이름을 반환합니다
+
+    캐시 항목은 검색에 사용한 이름으로만 비교하므로, alias_vN에 쓰면
+    alias 이름으로 캐시된 검색도 무효화되도록 연결된 alias를 함께 반환합니다.
+    """
+    try:
+        response = es.indices.get_alias(index=index_name)
+    except Exception:
+        return index_name
+    return _with_aliases(index_name, dict(getattr(response, "body", response)))
+
+
+def _current_write_seq():
+    with _WRITES_LOCK:
+        return next(_WRITE_SEQ)
+
+
+def _written_since(index, seq):
+    """index(와일드카드 허용)에 seq 이후 쓰기가 있었는지 확인합니다"""
+    patterns = [name.strip() for name in index.split(",")]
+    with _WRITES_LOCK:
+        return any(
+            written > seq and any(fnmatch.fnmatchcase(name, p) for p in patterns)
+            for name, written in _INDEX_WRITES.items()
+        )
+
+
+class SearchCache:
+    """
+    검색 결과 캐시 (메모리 LRU + TTL + 인덱스 쓰기 시 무효화)
+
+    키는 인덱스명과 검색 본문(쿼리, from/size, 정렬, _source 등)입니다.
+    이 모듈의 쓰기 경로가 인덱스에 쓰면 그 인덱스의 항목은 다음 조회 때
+    버려지고, 모듈 밖에서 일어난 쓰기는 ttl이 지나면 반영됩니다.
+    캐시된 결과는 공유되므로 반환값을 수정하지 마세요.
+
+    Parameters:
+        max_entries (int): 보관할 최대 항목 수
+        ttl (float): 항목 유효 시간(초), None이면 무효화될 때까지 유지
+    """
+
+    def __init__(self, max_entries=1000, ttl=60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(index, body):
+        """인덱스명과 검색 본문으로 캐시 키를 만듭니다"""
+        return index, json.dumps(body, sort_keys=True, ensure_ascii=False, default=repr)
+
+    def get(self, key):
+        """유효한 캐시 결과를 반환합니다 (없거나 만료/무효화되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, seq, expires = entry
+                if expires is not None and time.monotonic() > expires:
+                    del self._entries[key]
+                elif _written_since(key[0], seq):
+                    del self._entries[key]
+                    self.invalidations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+            self.misses += 1
+            return None
+
+    def put(self, key, result, seq):
+        """seq(요청 직전 쓰기 순번) 시점의 결과로 저장합니다"""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (result, seq, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """히트/미스/무효화 카운터와 항목 수를 반환합니다"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def clear(self):
+        """모든 항목을 비우고 카운터를 초기화합니다"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+
+def _search_body(query, size, from_, source, sort, aggs):
+    """search 요청 본문을 구성합니다"""
+    body = {"size": size, "from": from_}
+    if query:
+        body["query"] = query
+    if source is not None:
+        body["_source"] = source
+    if sort:
+        body["sort"] = sort
+    if aggs:
+        body["aggs"] = aggs
+    return body
+
+
+def _lookup_search(cache, index, body):
+    """(캐시된 결과, 캐시 키, 요청 전 쓰기 순번)을 반환합니다 (캐시가 없으면 모두 None)"""
+    if cache is None:
+        return None, None, None
+    key = SearchCache.make_key(index, body)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, key, None
+    # 요청 중에 일어난 쓰기도 무효화되도록 요청 전에 순번을 잡음
+    return None, key, _current_write_seq()
+
+
+def search(
+    index,
+    query=None,
+    size=10,
+    from_=0,
+    source=None,
+    sort=None,
+    aggs=None,
+    cache=None,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    검색 함수 (한 페이지, 선택적 결과 캐시)
+
+    Parameters:
+        index (str): 검색할 인덱스명 또는 alias
+        query (dict): 검색 쿼리 (없으면 전체 문서)
+        size (int): 반환할 문서 수
+        from_ (int): 시작 위치 (from + size는 10,000 이하, 그 이상은 iter_search 사용)
+        source (bool, list or dict): _source 필터
+        sort (list): 정렬 조건
+        aggs (dict): 집계
+        cache (SearchCache): 결과 캐시 (히트 시 클러스터를 호출하지 않음)
+        hosts (str or list): Elasticsearch 호스트
+        client (Elasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
+
+    Returns:
+        dict: 검색 결과(JSON)
+    """
+    body = _search_body(query, size, from_, source, sort, aggs)
+    cached, key, seq = _lookup_search(cache, index, body)
+    if cached is not None:
+        return cached
+
+    es = _resolve_client(client, hosts)
+    response = es.search(index=index, body=body)
+    result = dict(getattr(response, "body", response))
+    if cache is not None:
+        cache.put(key, result, seq)
+    return result
+
+
+def _build_analyze_body(
+    text,
+    analyzer=None,
+    tokenizer=None,
+    filters=None,
+    explain=False,
+    decompound_mode=None,
+    user_dictionary_rules=None
+):
+    """_analyze 요청 본문을 구성합니다"""
+    body = {"text": text}
+
+    if analyzer:
+        body["analyzer"] = analyzer
+    if tokenizer:
+        body["tokenizer"] = tokenizer
+    if filters:
+        body["filter"] = filters
+    if explain:
+        body["explain"] = True
+    if decompound_mode or user_dictionary_rules:
+        # tokenizer를 dict로 세부 옵션 지정
+        body["tokenizer"] = {"type": "nori_tokenizer"}
+        if decompound_mode:
+            body["tokenizer"]["decompound_mode"] = decompound_mode
+        if user_dictionary_rules:
+            body["tokenizer"]["user_dictionary_rules"] = user_dictionary_rules
+    return body
+
+
+def _analyze_key(text, analyzer, tokenizer, filters, explain,
+                 decompound_mode, user_dictionary_rules, index):
+    """analyze_morph 결과의 캐시 키를 만듭니다"""
+    return AnalyzeCache.make_key(
+        text, analyzer=analyzer, tokenizer=tokenizer, filters=filters,
+        explain=explain, decompound_mode=decompound_mode,
+        user_dictionary_rules=user_dictionary_rules, index=index
+    )
+
 
 def analyze_morph(
     text,
@@ -10,7 +493,9 @@ def analyze_morph(
     decompound_mode=None,
     user_dictionary_rules=None,
     index=None,
-    hosts="http://localhost:9200"
+    hosts="http://localhost:9200",
+    client=None,
+    cache=None
 ):
     """
     Elasticsearch Nori 형태소 분석 함수
@@ -25,41 +510,198 @@ def analyze_morph(
         user_dictionary_rules (list): 사용자 정의 단어 리스트
         index (str): 인덱스명 (없으면 _analyze 엔드포인트 사용)
         hosts (str or list): Elasticsearch 호스트
+        client (Elasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
+        cache (AnalyzeCache): 결과 캐시 (캐시 히트 시 클러스터를 호출하지 않음)
 
     Returns:
         dict: 분석 결과(JSON)
     """
-    es = Elasticsearch(hosts)
-    body = {"text": text}
+    key = None
+    if cache is not None:
+        key = _analyze_key(
+            text, analyzer, tokenizer, filters, explain,
+            decompound_mode, user_dictionary_rules, index
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return AnalyzeResult(cached)
 
-    if analyzer:
-        body["analyzer"] = analyzer
-    if tokenizer:
-        body["tokenizer"] = tokenizer
-    if filters:
-        body["filter"] = filters
-    if explain:
-        body["explain"] = True
-    if decompound_mode or user_dictionary_rules:
-        # tokenizer를 dict로 세부 옵션 지정
-        body["tokenizer"] = {"type": "nori_tokenizer"}
-        if decompound_mode:
-            body["tokenizer"]["decompound_mode"] = decompound_mode
-        if user_dictionary_rules:
-            body["tokenizer"]["user_dictionary_rules"] = user_dictionary_rules
+    es = _resolve_client(client, hosts)
+    body = _build_analyze_body(
+        text, analyzer, tokenizer, filters, explain,
+        decompound_mode, user_dictionary_rules
+    )
 
     if index:
         result = es.indices.analyze(index=index, body=body)
     else:
         result = es.indices.analyze(body=body)
+    if cache is not None:
+        cache.put(key, dict(getattr(result, "body", result)))
     return result
 
 
+def _java_len(text):
+    """Elasticsearch(Java) 기준 문자열 길이 (UTF-16 코드 유닛 수)"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _split_tokens(texts, tokens):
+    """
+    여러 문장을 한 번에 분석한 토큰 목록을 문장별로 나눕니다
+
+    _analyze는 배열로 받은 문장들의 오프셋을 (문장 길이 + offset_gap 1)씩
+    이어 붙이므로, 각 문장의 시작 오프셋 구간으로 토큰을 배정하고
+    오프셋을 문장 기준으로 되돌립니다. position은 문장 사이의 간격
+    (position_increment_gap, 문장 끝에서 빠진 토큰 수)을 응답만으로 알 수
+    없으므로 문장의 첫 토큰을 0으로 하는 상대 위치로 바꿉니다. 어느 묶음에
+    들어갔든 같은 문장은 같은 결과가 되지만, stop 필터 등으로 문장 앞의
+    토큰이 빠지면 analyze_morph의 position(빠진 토큰만큼 1 이상에서 시작)과는
+    다릅니다.
+    """
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += _java_len(text) + 1
+
+    per_text = [[] for _ in texts]
+    for token in tokens:
+        i = bisect.bisect_right(starts, token["start_offset"]) - 1
+        base = starts[i]
+        token = dict(token)
+        token["start_offset"] -= base
+        token["end_offset"] -= base
+        per_text[i].append(token)
+    for sentence in per_text:
+        if sentence and "position" in sentence[0]:
+            first = sentence[0]["position"]
+            for token in sentence:
+                token["position"] -= first
+    return per_text
+
+
+def _lookup_chunk(texts, index, body_options, cache):
+    """캐시에서 문장별 토큰을 찾아 (결과, 캐시 키, 캐시에 없는 위치)를 반환합니다"""
+    results = [None] * len(texts)
+    keys = [None] * len(texts)
+    if cache is not None:
+        for i, text in enumerate(texts):
+            # 배치 결과의 position은 문장의 첫 토큰 기준이라 앞 토큰이 필터로 빠지면
+            # analyze_morph와 달라지므로 캐시 키를 분리
+            keys[i] = AnalyzeCache.make_key(text, batch=True, index=index, **body_options)
+            cached = cache.get(keys[i])
+            if cached is not None:
+                results[i] = cached["tokens"]
+    missing = [i for i, tokens in enumerate(results) if tokens is None]
+    return results, keys, missing
+
+
+def _fill_chunk(results, keys, missing, batch, tokens, cache):
+    """묶음 분석 토큰을 문장별로 나눠 results의 빈 자리에 채우고 캐시에 저장합니다"""
+    for i, sentence in zip(missing, _split_tokens(batch, tokens)):
+        results[i] = sentence
+        if cache is not None:
+            cache.put(keys[i], {"tokens": sentence})
+    return results
+
+
+def _analyze_chunk(es, texts, index, body_options, cache=None):
+    """문장 묶음을 한 번의 _analyze 요청으로 분석합니다 (캐시 히트 문장은 제외)"""
+    results, keys, missing = _lookup_chunk(texts, index, body_options, cache)
+    if missing:
+        batch = [texts[i] for i in missing]
+        body = _build_analyze_body(batch, **body_options)
+        if index:
+            result = es.indices.analyze(index=index, body=body)
+        else:
+            result = es.indices.analyze(body=body)
+        _fill_chunk(results, keys, missing, batch, result["tokens"], cache)
+    return results
+
+
+def _batch_options(analyzer, tokenizer, filters, decompound_mode, user_dictionary_rules):
+    """analyze_morph_batch가 묶음 요청마다 사용할 분석 설정"""
+    return {
+        "analyzer": analyzer,
+        "tokenizer": tokenizer,
+        "filters": filters,
+        "decompound_mode": decompound_mode,
+        "user_dictionary_rules": user_dictionary_rules,
+    }
+
+
+def _next_chunk(iterator, chunk_size):
+    """입력에서 다음 묶음을 꺼냅니다 (문자열이 아닌 값은 빈 문장)"""
+    return [t if isinstance(t, str) else "" for t in islice(iterator, chunk_size)]
+
+
+def analyze_morph_batch(
+    texts,
+    analyzer=None,
+    tokenizer=None,
+    filters=None,
+    decompound_mode=None,
+    user_dictionary_rules=None,
+    index=None,
+    chunk_size=100,
+    max_workers=4,
+    hosts="http://localhost:9200",
+    client=None,
+    cache=None
+):
+    """
+    대량 문장 형태소 분석 제너레이터
+
+    문장들을 chunk_size개씩 묶어 다중 text _analyze 요청으로 보내고,
+    최대 max_workers개의 요청을 동시에 처리합니다. 입력은 끝까지
+    읽지 않고 필요한 만큼만 소비하므로 큰 코퍼스도 스트리밍할 수 있습니다.
+
+    Parameters:
+        texts (iterable): 분석할 문장들 (None, NaN 등 문자열이 아닌 값은 빈 문장으로 처리)
+        analyzer (str): 사용할 analyzer 이름
+        tokenizer (str): 사용할 tokenizer 이름
+        filters (list): 사용할 filter 리스트
+        decompound_mode (str): 'none', 'discard', 'mixed' 중 선택
+        user_dictionary_rules (list): 사용자 정의 단어 리스트
+        index (str): 인덱스명 (없으면 _analyze 엔드포인트 사용)
+        chunk_size (int): 요청 하나에 담을 문장 수
+        max_workers (int): 동시에 보낼 최대 요청 수
+        hosts (str or list): Elasticsearch 호스트
+        client (Elasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
+        cache (AnalyzeCache): 결과 캐시 (모든 문장이 히트하면 요청을 보내지 않음)
+
+    Yields:
+        list: 입력 순서대로 문장별 토큰 리스트 (오프셋은 문장 기준, position은 첫 토큰 기준)
+    """
+    es = _resolve_client(client, hosts)
+    body_options = _batch_options(
+        analyzer, tokenizer, filters, decompound_mode, user_dictionary_rules
+    )
+    iterator = iter(texts)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            chunk = _next_chunk(iterator, chunk_size)
+            if chunk:
+                pending.append(
+                    executor.submit(_analyze_chunk, es, chunk, index, body_options, cache)
+                )
+            # 동시 요청 수를 max_workers로 제한하며 입력 순서대로 결과 반환
+            while pending and (len(pending) >= max_workers or not chunk):
+                for tokens in pending.popleft().result():
+                    yield tokens
+            if not chunk:
+                break
+
+
 def create_index(
     index_name,
     settings=None,
     mappings=None,
-    hosts="http://localhost:9200"
+    hosts="http://localhost:9200",
+    client=None
 ):
     """
     Elasticsearch 인덱스 생성 함수 (elasticsearch-py 기반)
@@ -69,11 +711,12 @@ def create_index(
         settings (dict): 인덱스 설정 (예: 샤드, 레플리카, 분석기 등)
         mappings (dict): 인덱스 매핑 (필드 타입 등)
         hosts (str or list): Elasticsearch 호스트
+        client (Elasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
 
     Returns:
         dict: 생성 결과(JSON)
     """
-    es = Elasticsearch(hosts)
+    es = _resolve_client(client, hosts)
     # 이미 인덱스가 있으면 삭제(옵션)
     if es.indices.exists(index=index_name):
         es.indices.delete(index=index_name)
@@ -82,7 +725,445 @@ def create_index(
         body["settings"] = settings
     if mappings:
         body["mappings"] = mappings
-    return es.indices.create(index=index_name, body=body)
+    result = es.indices.create(index=index_name, body=body)
+    invalidate_index(index_name)
+    return result
+
+
+def _clean_value(value):
+    """JSON으로 보낼 수 없는 NaN 값을 None으로 바꿉니다"""
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _iter_rows(source, delimiter=","):
+    """CSV/JSONL 파일 경로, DataFrame 또는 dict 이터러블에서 행을 하나씩 읽습니다"""
+    if isinstance(source, str):
+        if source.lower().endswith((".jsonl", ".ndjson", ".json")):
+            with open(source, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        else:
+            with open(source, encoding="utf-8", newline="") as f:
+                yield from csv.DictReader(f, delimiter=delimiter)
+    elif hasattr(source, "itertuples") and hasattr(source, "columns"):
+        # pandas DataFrame
+        columns = [str(c) for c in source.columns]
+        for values in source.itertuples(index=False, name=None):
+            yield dict(zip(columns, values))
+    else:
+        yield from source
+
+
+def _iter_bulk_chunks(lines, max_chunk_bytes, max_chunk_docs):
+    """(문서 수, 액션 라인) 스트림을 바이트 크기 기준 묶음으로 나눕니다"""
+    chunk, size, docs = [], 0, 0
+    for action, source in lines:
+        line_bytes = len(action) + len(source) + 2
+        if chunk and (size + line_bytes > max_chunk_bytes or docs >= max_chunk_docs):
+            yield chunk
+            chunk, size, docs = [], 0, 0
+        chunk.extend((action, source))
+        size += line_bytes
+        docs += 1
+    if chunk:
+        yield chunk
+
+
+def _is_rejected(error):
+    """클러스터가 429(too many requests)로 거절한 요청인지 확인합니다"""
+    return getattr(error, "status_code", None) == 429
+
+
+def _split_bulk_items(response, lines, retry_rejected):
+    """
+    bulk 응답의 문서별 결과를 나눕니다
+
+    Parameters:
+        response (dict): bulk 응답
+        lines (list): 요청한 액션/문서 라인
+        retry_rejected (bool): 429로 거절된 문서를 재시도 대상으로 둘지 여부
+
+    Returns:
+        tuple: (성공 문서 수, 재시도할 액션/문서 라인, 실패 사유 리스트)
+    """
+    indexed, retry, errors = 0, [], []
+    for i, item in enumerate(response["items"]):
+        result = next(iter(item.values()))
+        status = result.get("status", 500)
+        if status < 300:
+            indexed += 1
+        elif status == 429 and retry_rejected:
+            retry.extend(lines[2 * i:2 * i + 2])
+        else:
+            errors.append(result.get("error", status))
+    return indexed, retry, errors
+
+
+def _send_bulk_chunk(es, lines, max_retries, initial_backoff, max_backoff):
+    """
+    bulk 요청 하나를 보내고 429(거절) 문서만 지수 백오프로 재시도합니다
+
+    Returns:
+        tuple: (성공 문서 수, 실패 문서 수, 실패 사유 리스트)
+    """
+    indexed, errors = 0, []
+    backoff = initial_backoff
+    for attempt in range(max_retries + 1):
+        try:
+            response = es.bulk(body=lines)
+        except Exception as e:
+            if not _is_rejected(e) or attempt == max_retries:
+                raise
+            time.sleep(min(backoff, max_backoff))
+            backoff *= 2
+            continue
+
+        done, lines, failed = _split_bulk_items(response, lines, attempt < max_retries)
+        indexed += done
+        errors.extend(failed)
+        if not lines:
+            break
+        time.sleep(min(backoff, max_backoff))
+        backoff *= 2
+    return indexed, len(errors), errors
+
+
+def _bulk_actions(source, index_name, title_field, content_field, id_field, delimiter):
+    """행을 title/content 문서로 바꿔 (액션 라인, 문서 라인) 바이트 쌍으로 생성합니다"""
+    for row in _iter_rows(source, delimiter=delimiter):
+        doc = {}
+        if title_field and title_field in row:
+            doc["title"] = _clean_value(row[title_field])
+        doc["content"] = _clean_value(row.get(content_field))
+        meta = {"_index": index_name}
+        if id_field:
+            meta["_id"] = str(row[id_field])
+        yield (
+            json.dumps({"index": meta}, ensure_ascii=False).encode("utf-8"),
+            json.dumps(doc, ensure_ascii=False).encode("utf-8"),
+        )
+
+
+def _record_bulk(stats, result, targets):
+    """bulk 요청 하나의 결과를 통계에 합치고 캐시를 무효화합니다"""
+    indexed, failed, errors = result
+    stats["indexed"] += indexed
+    stats["failed"] += failed
+    invalidate_index(targets)
+    # 응답 크기를 줄이기 위해 실패 사유는 일부만 보관
+    stats["errors"].extend(errors[:10 - len(stats["errors"])])
+
+
+def _finish_bulk(stats, started):
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = elapsed
+    stats["docs_per_sec"] = stats["indexed"] / elapsed if elapsed > 0 else 0.0
+    return stats
+
+
+def bulk_ingest(
+    index_name,
+    source,
+    title_field="title",
+    content_field="content",
+    id_field=None,
+    delimiter=",",
+    max_chunk_bytes=5 * 1024 * 1024,
+    max_chunk_docs=5000,
+    max_workers=4,
+    max_retries=5,
+    initial_backoff=1.0,
+    max_backoff=60.0,
+    bulk_load=False,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    대량 문서 색인 함수 (병렬 bulk 요청)
+
+    CSV/JSONL 파일이나 DataFrame의 행을 title/content 문서로 변환해
+    바이트 크기 기준으로 묶은 뒤, 최대 max_workers개의 bulk 요청을 동시에
+    보냅니다. 클러스터가 429로 거절한 문서는 지수 백오프로 재시도합니다.
+
+    Parameters:
+        index_name (str): 색인할 인덱스명
+        source (str, DataFrame or iterable): CSV/JSONL 파일 경로, DataFrame 또는 dict 이터러블
+        title_field (str): title로 사용할 컬럼명 (없으면 title 생략)
+        content_field (str): content로 사용할 컬럼명
+        id_field (str): 문서 _id로 사용할 컬럼명 (없으면 자동 생성)
+        delimiter (str): CSV 구분자
+        max_chunk_bytes (int): bulk 요청 하나의 최대 바이트 크기
+        max_chunk_docs (int): bulk 요청 하나의 최대 문서 수
+        max_workers (int): 동시에 보낼 최대 bulk 요청 수
+        max_retries (int): 429 거절 시 최대 재시도 횟수
+        initial_backoff (float): 첫 재시도 대기 시간(초), 재시도마다 2배
+        max_backoff (float): 최대 재시도 대기 시간(초)
+        bulk_load (bool): 적재 동안 bulk_load_mode 적용 여부
+        hosts (str or list): Elasticsearch 호스트
+        client (Elasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
+
+    Returns:
+        dict: 색인/실패 문서 수, 소요 시간, 초당 문서 수, 전송 바이트, 실패 사유 일부
+    """
+    es = _resolve_client(client, hosts)
+    if bulk_load:
+        with bulk_load_mode(index_name, client=es):
+            return bulk_ingest(
+                index_name, source, title_field=title_field,
+                content_field=content_field, id_field=id_field,
+                delimiter=delimiter, max_chunk_bytes=max_chunk_bytes,
+                max_chunk_docs=max_chunk_docs, max_workers=max_workers,
+                max_retries=max_retries, initial_backoff=initial_backoff,
+                max_backoff=max_backoff, client=es
+            )
+
+    actions = _bulk_actions(source, index_name, title_field, content_field, id_field, delimiter)
+    targets = _write_targets(es, index_name)
+    stats = {"indexed": 0, "failed": 0, "bytes": 0, "errors": []}
+    started = time.perf_counter()
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for lines in _iter_bulk_chunks(actions, max_chunk_bytes, max_chunk_docs):
+            stats["bytes"] += sum(len(line) + 1 for line in lines)
+            pending.append(executor.submit(
+                _send_bulk_chunk, es, lines, max_retries, initial_backoff, max_backoff
+            ))
+            if len(pending) >= max_workers:
+                _record_bulk(stats, pending.popleft().result(), targets)
+        while pending:
+            _record_bulk(stats, pending.popleft().result(), targets)
+    return _finish_bulk(stats, started)
+
+
+# bulk 적재 동안 임시로 바꿀 인덱스 설정
+BULK_LOAD_SETTINGS = {
+    "index.refresh_interval": "-1",
+    "index.number_of_replicas": 0,
+}
+
+
+def _original_settings(current):
+    """get_settings 응답에서 bulk 적재 후 복원할 인덱스별 설정을 뽑습니다"""
+    original = {}
+    for name, value in current.items():
+        settings = value["settings"]
+        # 명시적으로 지정되지 않은 설정은 None으로 복원해 기본값으로 되돌림
+        original[name] = {key: settings.get(key) for key in BULK_LOAD_SETTINGS}
+    return original
+
+
+@contextmanager
+def bulk_load_mode(
+    index_name,
+    force_merge=False,
+    max_num_segments=1,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    대량 적재 모드 컨텍스트 매니저
+
+    블록 안에서는 refresh_interval을 -1, 레플리카를 0으로 낮춰 적재
+    비용을 줄이고, 블록을 벗어나면(예외가 나도) 원래 설정을 복원한 뒤
+    refresh와 선택적 force merge를 수행합니다. refresh 전에 캐시된 검색이
+    남지 않도록 refresh(와 force merge) 뒤에 인덱스와 alias를 무효화합니다.
+
+    Parameters:
+        index_name (str): 대상 인덱스명 (alias면 연결된 모든 인덱스)
+        force_merge (bool): 적재 후 force merge 수행 여부
+        max_num_segments (int): force merge 시 샤드당 세그먼트 수
+        hosts (str or list): Elasticsearch 호스트
+        client (Elasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
+
+    Example:
+        with bulk_load_mode("my_nori"):
+            bulk_ingest("my_nori", "reviews.csv")
+    """
+    es = _resolve_client(client, hosts)
+    original = _original_settings(es.indices.get_settings(index=index_name, flat_settings=True))
+    targets = _write_targets(es, index_name)
+    es.indices.put_settings(index=index_name, body=BULK_LOAD_SETTINGS)
+    try:
+        yield es
+    finally:
+        for name, settings in original.items():
+            es.indices.put_settings(index=name, body=settings)
+        es.indices.refresh(index=index_name)
+        invalidate_index(targets)
+        if force_merge:
+            es.indices.forcemerge(index=index_name, max_num_segments=max_num_segments)
+            invalidate_index(targets)
+
+
+def _index_versions(es, alias):
+    """alias_vN 형식의 기존 인덱스를 버전 순으로 반환합니다"""
+    pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+    versions = []
+    for name in es.indices.get(index=f"{alias}_v*", allow_no_indices=True):
+        match = pattern.match(name)
+        if match:
+            versions.append((int(match.group(1)), name))
+    return [name for _, name in sorted(versions)]
+
+
+def reindex_with_alias(
+    alias,
+    load,
+    settings=None,
+    mappings=None,
+    warm_queries=None,
+    keep_old=1,
+    bulk_load=True,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    무중단 재색인 함수 (버전 인덱스 + alias 교체)
+
+    alias_vN 인덱스를 새로 만들어 적재하고 워밍한 뒤, 한 번의
+    update_aliases 요청으로 alias를 원자적으로 옮깁니다. 검색은 교체 직전까지
+    이전 버전을 사용하므로 매핑 변경이나 전체 재적재 중에도 중단되지 않습니다.
+
+    Parameters:
+        alias (str): 검색에 사용하는 alias명 (기존 동명 인덱스가 있으면 교체 시 삭제)
+        load (callable): 새 인덱스명을 받아 문서를 적재하는 함수
+                         (예: lambda index: bulk_ingest(index, "reviews.csv"))
+        settings (dict): 새 인덱스 설정
+        mappings (dict): 새 인덱스 매핑
+        warm_queries (list): 교체 전에 새 인덱스로 실행할 검색 본문 리스트
+        keep_old (int): 롤백용으로 남겨둘 이전 버전 수
+        bulk_load (bool): 적재 동안 bulk_load_mode 적용 여부
+        hosts (str or list): Elasticsearch 호스트
+        client (Elasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
+
+    Returns:
+        dict: 새 인덱스명, 이전 인덱스, 삭제된 인덱스, load 반환값
+    """
+    es = _resolve_client(client, hosts)
+    versions = _index_versions(es, alias)
+    next_version = int(versions[-1].rsplit("_v", 1)[1]) + 1 if versions else 1
+    new_index = f"{alias}_v{next_version}"
+
+    body = {}
+    if settings:
+        body["settings"] = settings
+    if mappings:
+        body["mappings"] = mappings
+    es.indices.create(index=new_index, body=body)
+
+    try:
+        if bulk_load:
+            with bulk_load_mode(new_index, client=es):
+                load_result = load(new_index)
+        else:
+            load_result = load(new_index)
+            es.indices.refresh(index=new_index)
+
+        # 교체 전에 캐시와 세그먼트를 데워 첫 검색의 지연을 줄임
+        for query in warm_queries or []:
+            es.search(index=new_index, body=query, request_cache=True)
+    except Exception:
+        # 적재에 실패하면 alias는 그대로 두고 만들던 인덱스만 정리
+        es.indices.delete(index=new_index)
+        raise
+
+    actions = []
+    previous = []
+    if es.indices.exists_alias(name=alias):
+        previous = list(es.indices.get_alias(name=alias))
+        actions.extend({"remove": {"index": name, "alias": alias}} for name in previous)
+    elif es.indices.exists(index=alias):
+        # 예전 create_index로 만든 동명 인덱스는 alias 추가와 함께 원자적으로 삭제
+        actions.append({"remove_index": {"index": alias}})
+    actions.append({"add": {"index": new_index, "alias": alias}})
+    es.indices.update_aliases(body={"actions": actions})
+    invalidate_index(alias)
+
+    stale = versions[:max(len(versions) - keep_old, 0)]
+    for name in stale:
+        es.indices.delete(index=name)
+        invalidate_index(name)
+
+    return {
+        "alias": alias,
+        "index": new_index,
+        "previous": previous,
+        "deleted": stale,
+        "load_result": load_result,
+    }
+
+
+def _pit_body(query, page_size, source, sort, max_hits):
+    """iter_search 페이지 요청 본문을 구성합니다 (pit와 search_after는 페이지마다 채움)"""
+    body = {
+        "size": page_size if max_hits is None else min(page_size, max_hits),
+        "sort": list(sort or []) + [{"_shard_doc": "asc"}],
+        "track_total_hits": False,
+    }
+    if query:
+        body["query"] = query
+    if source is not None:
+        body["_source"] = source
+    return body
+
+
+def iter_search(
+    index,
+    query=None,
+    page_size=1000,
+    source=None,
+    sort=None,
+    keep_alive="1m",
+    max_hits=None,
+    hosts="http://localhost:9200",
+    client=None
+):
+    """
+    검색 결과 스트리밍 제너레이터 (point-in-time + search_after)
+
+    from/size 페이지네이션은 10,000건을 넘길 수 없으므로, point-in-time으로
+    스냅샷을 고정하고 search_after로 다음 페이지를 이어 받습니다. 한 번에
+    page_size건만 메모리에 올리므로 결과 크기와 무관하게 메모리가 일정합니다.
+
+    Parameters:
+        index (str): 검색할 인덱스명 또는 alias
+        query (dict): 검색 쿼리 (없으면 전체 문서)
+        page_size (int): 요청 하나로 받을 문서 수
+        source (bool, list or dict): _source 필터 (예: ["title"], False)
+        sort (list): 정렬 조건 (마지막에 _shard_doc 타이브레이커가 추가됨)
+        keep_alive (str): point-in-time 유지 시간 (페이지 사이 최대 간격)
+        max_hits (int): 최대 반환 문서 수 (없으면 전체)
+        hosts (str or list): Elasticsearch 호스트
+        client (Elasticsearch): 사용할 클라이언트 (없으면 hosts의 공유 클라이언트 사용)
+
+    Yields:
+        dict: 검색 hit (_id, _source, sort 등)
+    """
+    es = _resolve_client(client, hosts)
+    pit_id = es.open_point_in_time(index=index, keep_alive=keep_alive)["id"]
+    body = _pit_body(query, page_size, source, sort, max_hits)
+
+    returned = 0
+    try:
+        while True:
+            body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+            response = es.search(body=body)
+            pit_id = response.get("pit_id", pit_id)
+            hits = response["hits"]["hits"]
+            for hit in hits:
+                yield hit
+                returned += 1
+                if max_hits is not None and returned >= max_hits:
+                    return
+            if len(hits) < body["size"]:
+                return
+            body["search_after"] = hits[-1]["sort"]
+    finally:
+        es.close_point_in_time(body={"id": pit_id})
 
 DEFAULT_SETTINGS = {
     "analysis": {
@@ -0,0 +1,373 @@
+"""
+lib/search.py 벤치마크
+
+analyze_morph, analyze_morph_batch, bulk_ingest, iter_search를 코퍼스 크기별로
+실행해 지연 시간 백분위수, 처리량, 클라이언트 CPU 시간을 측정하고 JSON으로
+저장합니다. 대상은 docker-compose의 Elasticsearch 또는 _analyze/_bulk/_search를
+흉내 내는 로컬 HTTP 스텁(오프라인용)입니다.
+
+사용 예:
+    # 로컬 스텁 (Elasticsearch 없이 실행)
+    python -m lib.search_bench --sizes 1000 10000 --output bench.json
+
+    # docker-compose Elasticsearch
+    python -m lib.search_bench --hosts http://localhost:9200 --corpus nsmc
+
+스텁은 별도 프로세스에서 실행되므로 CPU 시간에는 클라이언트 쪽 비용만 포함됩니다.
+스텁의 토큰화는 공백 단위이므로 스텁 결과는 클라이언트/전송 경로 비교용입니다.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from lib.search import (
+    DEFAULT_MAPPINGS,
+    DEFAULT_SETTINGS,
+    analyze_morph,
+    analyze_morph_batch,
+    bulk_ingest,
+    close_clients,
+    create_index,
+    get_client,
+    iter_search,
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NSMC_PATH = os.path.join(PROJECT_ROOT, "datasets", "text", "nsmc", "test_df.pkl")
+
+BENCH_INDEX = "search_bench"
+
+_WORDS = [
+    "영화", "정말", "재미있", "배우", "연기", "스토리", "감동", "최고", "별로",
+    "지루", "음악", "장면", "감독", "결말", "시간", "아깝", "추천", "다시",
+    "보고", "싶다", "한라산", "백두산", "데이터", "분석", "형태소", "검색",
+]
+
+
+def synthetic_corpus(size, seed=0):
+    """NSMC 리뷰 길이와 비슷한 임의 한국어 문장 리스트를 만듭니다"""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(_WORDS) for _ in range(rng.randint(3, 20)))
+        for _ in range(size)
+    ]
+
+
+def nsmc_corpus(size):
+    """NSMC 리뷰(datasets/text/nsmc)를 size개가 될 때까지 반복해 반환합니다"""
+    import pandas as pd
+
+    documents = [d for d in pd.read_pickle(NSMC_PATH)["document"] if isinstance(d, str)]
+    return [documents[i % len(documents)] for i in range(size)]
+
+
+# ---------------------------------------------------------------------------
+# 로컬 Elasticsearch 스텁
+# ---------------------------------------------------------------------------
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """_analyze/_bulk/_search/_pit 등 벤치마크에 필요한 API만 흉내 냅니다"""
+
+    # keep-alive 연결을 유지해야 클라이언트 풀링 효과가 측정에 반영됨
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 나눠 쓸 때 Nagle/지연 ACK로 40ms씩 지연되는 것을 방지
+    disable_nagle_algorithm = True
+    indices = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload=None):
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-Elastic-Product", "Elasticsearch")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _json(self):
+        raw = self._body()
+        return json.loads(raw) if raw else {}
+
+    def _parts(self):
+        return [p for p in urlparse(self.path).path.split("/") if p]
+
+    def do_HEAD(self):
+        parts = self._parts()
+        self._send(200 if parts and parts[0] in self.indices else 404)
+
+    def do_GET(self):
+        parts = self._parts()
+        if not parts:
+            return self._send(200, {
+                "name": "stub", "cluster_name": "search-bench-stub",
+                "version": {"number": "8.13.0"}, "tagline": "You Know, for Search",
+            })
+        return self.do_POST()
+
+    def do_PUT(self):
+        parts = self._parts()
+        if parts and parts[-1] == "_bulk":
+            return self._bulk(parts)
+        self._body()
+        self.indices[parts[0]] = []
+        self._send(200, {"acknowledged": True, "index": parts[0]})
+
+    def do_DELETE(self):
+        parts = self._parts()
+        self._body()
+        if parts[0] == "_pit":
+            return self._send(200, {"succeeded": True, "num_freed": 1})
+        self.indices.pop(parts[0], None)
+        self._send(200, {"acknowledged": True})
+
+    def do_POST(self):
+        parts = self._parts()
+        action = parts[-1] if parts else ""
+        if action == "_analyze":
+            return self._analyze()
+        if action == "_bulk":
+            return self._bulk(parts)
+        if action == "_search":
+            return self._search(parts)
+        if action == "_pit":
+            self._body()
+            return self._send(200, {"id": parts[0]})
+        if action == "_refresh":
+            self._body()
+            return self._send(200, {"_shards": {"total": 1, "successful": 1, "failed": 0}})
+        self._body()
+        self._send(404, {"error": f"stub does not support {self.path}", "status": 404})
+
+    def _analyze(self):
+        body = self._json()
+        texts = body["text"] if isinstance(body["text"], list) else [body["text"]]
+        tokens, offset, position = [], 0, 0
+        for text in texts:
+            for match in re.finditer(r"\w+", text):
+                tokens.append({
+                    "token": match.group(), "type": "word", "position": position,
+                    "start_offset": offset + match.start(),
+                    "end_offset": offset + match.end(),
+                })
+                position += 1
+            offset += len(text.encode("utf-16-le")) // 2 + 1
+        self._send(200, {"tokens": tokens})
+
+    def _bulk(self, parts):
+        lines = self._body().splitlines()
+        items = []
+        for i in range(0, len(lines) - 1, 2):
+            meta = json.loads(lines[i])["index"]
+            index = meta.get("_index") or parts[0]
+            self.indices.setdefault(index, []).append(json.loads(lines[i + 1]))
+            items.append({"index": {"_index": index, "status": 201, "result": "created"}})
+        self._send(200, {"took": 0, "errors": False, "items": items})
+
+    def _search(self, parts):
+        body = self._json()
+        index = body["pit"]["id"] if "pit" in body else parts[0]
+        docs = self.indices.get(index, [])
+        match = (body.get("query") or {}).get("match")
+        start = body.get("search_after", [0])[0]
+        size = body.get("size", 10)
+        hits = []
+        for i in range(start, len(docs)):
+            if len(hits) >= size:
+                break
+            if match:
+                field, text = next(iter(match.items()))
+                text = text["query"] if isinstance(text, dict) else text
+                if not any(word in str(docs[i].get(field, "")) for word in text.split()):
+                    continue
+            hits.append({"_index": index, "_id": str(i), "_source": docs[i], "sort": [i + 1]})
+        response = {"took": 0, "hits": {"hits": hits}}
+        if "pit" in body:
+            response["pit_id"] = index
+        self._send(200, response)
+
+
+def _serve_stub(port):
+    ThreadingHTTPServer(("127.0.0.1", port), _StubHandler).serve_forever()
+
+
+def start_stub(port=9299):
+    """스텁 서버를 별도 프로세스로 띄우고 (프로세스, 호스트 URL)을 반환합니다"""
+    process = multiprocessing.Process(target=_serve_stub, args=(port,), daemon=True)
+    process.start()
+    hosts = f"http://127.0.0.1:{port}"
+    for _ in range(50):
+        try:
+            get_client(hosts).info()
+            break
+        except Exception:
+            time.sleep(0.1)
+    return process, hosts
+
+
+# ---------------------------------------------------------------------------
+# 측정
+# ---------------------------------------------------------------------------
+
+def percentiles(samples):
+    """지연 시간 샘플(초)의 p50/p95/p99를 밀리초로 반환합니다"""
+    if not samples:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    ordered = sorted(samples)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {"p50_ms": rank(0.50), "p95_ms": rank(0.95), "p99_ms": rank(0.99)}
+
+
+class _Measure:
+    """with 블록의 벽시계 시간과 프로세스 CPU 시간을 잽니다"""
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+
+
+def _result(workload, size, items, measure, samples=()):
+    result = {
+        "workload": workload,
+        "size": size,
+        "items": items,
+        "wall_seconds": measure.wall,
+        "cpu_seconds": measure.cpu,
+        "throughput_per_sec": items / measure.wall if measure.wall > 0 else None,
+    }
+    result.update(percentiles(list(samples)))
+    return result
+
+
+def run_benchmarks(hosts, sizes, corpus="synthetic", analyze_calls=500,
+                   chunk_size=100, max_workers=4, page_size=1000):
+    """
+    코퍼스 크기별로 각 워크로드를 실행하고 결과 리스트를 반환합니다
+
+    Parameters:
+        hosts (str): Elasticsearch(또는 스텁) 호스트
+        sizes (list): 코퍼스 크기 리스트
+        corpus (str): 'synthetic' 또는 'nsmc'
+        analyze_calls (int): analyze_morph 단건 호출 횟수 상한
+        chunk_size (int): analyze_morph_batch 요청당 문장 수
+        max_workers (int): 배치 분석/색인 동시 요청 수
+        page_size (int): iter_search 페이지 크기
+
+    Returns:
+        list: 워크로드별 측정 결과
+    """
+    results = []
+    for size in sizes:
+        texts = nsmc_corpus(size) if corpus == "nsmc" else synthetic_corpus(size)
+
+        samples = []
+        calls = min(size, analyze_calls)
+        with _Measure() as measure:
+            for text in texts[:calls]:
+                started = time.perf_counter()
+                analyze_morph(text, tokenizer="nori_tokenizer", hosts=hosts)
+                samples.append(time.perf_counter() - started)
+        results.append(_result("analyze_morph", size, calls, measure, samples))
+
+        with _Measure() as measure:
+            for _ in analyze_morph_batch(texts, tokenizer="nori_tokenizer",
+                                         chunk_size=chunk_size,
+                                         max_workers=max_workers, hosts=hosts):
+                pass
+        results.append(_result("analyze_morph_batch", size, size, measure))
+
+        create_index(BENCH_INDEX, settings=DEFAULT_SETTINGS,
+                     mappings=DEFAULT_MAPPINGS, hosts=hosts)
+        docs = ({"title": text[:20], "content": text} for text in texts)
+        with _Measure() as measure:
+            stats = bulk_ingest(BENCH_INDEX, docs, max_workers=max_workers, hosts=hosts)
+        results.append(_result("bulk_ingest", size, stats["indexed"], measure))
+        get_client(hosts).indices.refresh(index=BENCH_INDEX)
+
+        samples = []
+        hits = 0
+        with _Measure() as measure:
+            started = time.perf_counter()
+            for _ in iter_search(BENCH_INDEX, page_size=page_size, hosts=hosts):
+                hits += 1
+                if hits % page_size == 1:
+                    # 페이지 첫 hit까지의 시간 = 페이지 요청 지연
+                    samples.append(time.perf_counter() - started)
+                started = time.perf_counter()
+        results.append(_result("iter_search", size, hits, measure, samples))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="lib/search.py 벤치마크")
+    parser.add_argument("--hosts", help="Elasticsearch 호스트 (없으면 로컬 스텁 사용)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--corpus", choices=["synthetic", "nsmc"], default="synthetic")
+    parser.add_argument("--analyze-calls", type=int, default=500)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--stub-port", type=int, default=9299)
+    parser.add_argument("--output", default="search_bench.json", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    stub = None
+    hosts = args.hosts
+    if hosts is None:
+        stub, hosts = start_stub(args.stub_port)
+    try:
+        results = run_benchmarks(
+            hosts, args.sizes, corpus=args.corpus, analyze_calls=args.analyze_calls,
+            chunk_size=args.chunk_size, max_workers=args.max_workers,
+            page_size=args.page_size,
+        )
+    finally:
+        close_clients()
+        if stub is not None:
+            stub.terminate()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "target": "stub" if stub is not None else hosts,
+            "corpus": args.corpus,
+            "sizes": args.sizes,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for r in results:
+        p50 = f"{r['p50_ms']:.2f}ms" if r["p50_ms"] is not None else "-"
+        print(f"{r['workload']:<20} size={r['size']:<8} "
+              f"{r['throughput_per_sec'] or 0:>10.1f}/s  p50={p50:<10} cpu={r['cpu_seconds']:.2f}s")
+    print(f"결과가 {args.output}에 저장되었습니다")
+
+
+if __name__ == "__main__":
+    main()